@@ -3,8 +3,53 @@
     MIT License. Copyright © 2025 Connor Varney, Kahu Jones
 """
 
+import glob
+import logging
+import os
+import tempfile
+from ripd._oracle import Topology
 
-# Ensure routers are stopped at the end of each scenario
+JOIN_TIMEOUT = 5  # Seconds for a stopped router's thread to exit
+
+
+def write_offset_configs(source, destination, offset):
+    """
+        Copy the router configuration files, shifting every port by offset.
+        The copies use Topology's default timers, which the example network
+        shares.
+    """
+    topology = Topology.from_config_files(
+        logging.getLogger(__name__),
+        glob.glob(os.path.join(source, '*.ini')))
+    topology.with_port_offset(offset).write_configs(destination)
+
+
+def before_all(context):
+    """
+        Read the settings of this test run from the environment:
+
+        - RIPD_PORT_OFFSET shifts every port in the configuration files, so
+          runs in parallel do not bind the same ports.
+        - RIPD_TRANSPORT selects the transport the routers use.
+    """
+    context.transport = os.environ.get('RIPD_TRANSPORT', 'udp')
+    context.config_directory = 'config'
+
+    offset = int(os.environ.get('RIPD_PORT_OFFSET', 0))
+    if offset:
+        context.offset_configs = tempfile.TemporaryDirectory()
+        context.config_directory = context.offset_configs.name
+        write_offset_configs('config', context.config_directory, offset)
+
+
+def after_all(context):
+    if hasattr(context, 'offset_configs'):
+        context.offset_configs.cleanup()
+
+
+# Ensure routers are stopped at the end of each scenario. A router closes
+# its ports as its thread exits, so once every thread has been joined the
+# next scenario can bind them again.
 def after_scenario(context, scenario):
     if hasattr(context, 'routers'):
         for router in context.routers.values():
@@ -12,4 +57,7 @@ def after_scenario(context, scenario):
 
     if hasattr(context, 'router_threads'):
         for thread in context.router_threads.values():
-            thread.join(timeout=5)
+            thread.join(timeout=JOIN_TIMEOUT)
+        assert not any(thread.is_alive()
+                       for thread in context.router_threads.values()), \
+            "A router did not stop, so its ports are still bound."
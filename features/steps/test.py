@@ -8,9 +8,33 @@
 
 from behave import *
 from ripd.ripd import RIPDaemon
+from ripd._oracle import Topology, ShortestPathOracle, ConvergenceDetector
+import os
 import time
 import threading
 
+STABLE_TIMEOUT = 60  # Seconds to wait for routing tables to stabilise
+JOIN_TIMEOUT = 5     # Seconds for a stopped router's thread to exit
+
+
+def config_path(context, n):
+    """
+        Configuration file of router n, with ports offset for this run.
+    """
+    return os.path.join(context.config_directory, f"{n}.ini")
+
+
+def start_router(context, n):
+    """
+        Start router n in a separate thread.
+    """
+    router = RIPDaemon(config_path(context, n), transport=context.transport)
+    context.routers[n] = router
+
+    thread = threading.Thread(target=router.start, daemon=True)
+    thread.start()
+    context.router_threads[n] = thread
+
 
 @given('no routers are running')
 def step_no_routers(context):
@@ -22,8 +46,11 @@ def step_no_routers(context):
             router._run = False
     if hasattr(context, 'router_threads'):
         for thread in context.router_threads.values():
-            thread.join(timeout=5)
-    time.sleep(2) # Allow port close to propogate
+            thread.join(timeout=JOIN_TIMEOUT)
+        # A router's ports are closed once its thread has exited
+        assert not any(thread.is_alive()
+                       for thread in context.router_threads.values()), \
+            "A router did not stop, so its ports are still bound."
 
 
 @given('router {n:d} is running')
@@ -45,13 +72,7 @@ def step_start_router(context, n):
     if not hasattr(context, 'router_threads'):
         context.router_threads = {}
 
-    router = RIPDaemon(f"config/{n}.ini")
-    context.routers[n] = router
-
-    # Now start it in a thread
-    thread = threading.Thread(target=router.start, daemon=True)
-    thread.start()
-    context.router_threads[n] = thread
+    start_router(context, n)
 
 
 @when('router {n:d} is killed')
@@ -66,7 +87,7 @@ def step_start_router(context, n):
 
     # Wait for the thread to finish
     if n in context.router_threads:
-        context.router_threads[n].join(timeout=5)
+        context.router_threads[n].join(timeout=JOIN_TIMEOUT)
 
 
 @given('the following routers have started')
@@ -80,14 +101,7 @@ def step_start_multiple_routers(context):
         context.router_threads = {}
 
     for row in context.table:
-        n = int(row['router'])
-        router = RIPDaemon(f"config/{n}.ini")
-        context.routers[n] = router
-
-        # Now start it in a thread
-        thread = threading.Thread(target=router.start, daemon=True)
-        thread.start()
-        context.router_threads[n] = thread
+        start_router(context, int(row['router']))
 
 
 @when('we wait for {n:d} seconds')
@@ -95,6 +109,75 @@ def step_wait(context, n):
     time.sleep(n)
 
 
+@when('the routing tables are stable for {n:d} seconds')
+def step_wait_stable(context, n):
+    """
+        Wait until no router's table has changed for n seconds, instead of
+        sleeping for a fixed time.
+    """
+    assert hasattr(context, 'routers')
+    deadline = time.time() + STABLE_TIMEOUT
+    while True:
+        # Wait on each table in turn, then confirm they are all still quiet
+        for router in context.routers.values():
+            remaining = max(0, deadline - time.time())
+            assert router._table.events.wait_for_quiet(n, remaining), \
+                f"Routing tables did not stabilise within {STABLE_TIMEOUT}s."
+        last_change = max(router._table.events.last_event_time
+                          for router in context.routers.values())
+        if time.time() - last_change >= n:
+            return
+
+
+def running_routers(context):
+    """
+        Routers whose threads are still running.
+    """
+    return {n: router for n, router in context.routers.items()
+            if context.router_threads[n].is_alive()}
+
+
+def shortest_path_oracle(context):
+    """
+        Oracle for the network formed by the running routers.
+    """
+    routers = running_routers(context)
+    topology = Topology.from_config_files(
+        routers[next(iter(routers))]._logger,
+        [config_path(context, n) for n in routers])
+    return ShortestPathOracle(topology)
+
+
+@when('the routing tables converge within {n:d} seconds')
+def step_wait_converged(context, n):
+    """
+        Wait until every running router's table matches the shortest paths.
+    """
+    detector = ConvergenceDetector(
+        shortest_path_oracle(context),
+        {m: router._table for m, router in running_routers(context).items()})
+    try:
+        assert detector.wait(n), \
+            "Routing tables did not converge:\n" + \
+            "\n".join(str(divergence)
+                      for divergence in detector.divergences())
+    finally:
+        detector.close()
+
+
+@then('the routing tables should match the shortest paths')
+def step_check_shortest_paths(context):
+    """
+        Check every running router's table against the shortest paths.
+    """
+    oracle = shortest_path_oracle(context)
+    divergences = []
+    for n, router in running_routers(context).items():
+        divergences += oracle.compare(n, router._table)
+    assert not divergences, \
+        "\n".join(str(divergence) for divergence in divergences)
+
+
 @then('the routing tables should contain')
 def step_check_routing_tables(context):
     """
@@ -7,7 +7,7 @@ Scenario: Router 2 is killed and router 1 and 3 garbage collect
         | 1      |
         | 2      |
         | 3      |
-    When we wait for 5 seconds
+    When the routing tables are stable for 3 seconds
     Then the routing tables should contain:
         | router | destination | metric |
         | 1      | 2           | 1      |
@@ -30,7 +30,7 @@ Scenario: Router 4 is killed, breaking paths between 3 and 5
         | 3      |
         | 4      |
         | 5      |
-    When we wait for 5 seconds
+    When the routing tables are stable for 3 seconds
     Then the routing tables should contain:
         | router | destination | metric |
         | 3      | 4           | 4      |
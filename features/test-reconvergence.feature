@@ -8,7 +8,7 @@ Scenario: Killing router 7 and verifying alternative paths remain
         | 5      |
         | 6      |
         | 7      |
-    When we wait for 5 seconds
+    When the routing tables are stable for 3 seconds
     Then the routing tables should contain:
         | router | destination | metric |
         | 4      | 5           | 2      |
@@ -46,7 +46,7 @@ Scenario: Killing router 7, allow reconvergence, start it again and check for re
         | 5      |
         | 6      |
         | 7      |
-    When we wait for 5 seconds
+    When the routing tables are stable for 3 seconds
     Then the routing tables should contain:
         | router | destination | metric |
         | 4      | 5           | 2      |
@@ -5,6 +5,7 @@
 
 from ripd.ripd import RIPDaemon
 import sys
+import signal
 import logging
 
 LOG_LEVEL = logging.INFO
@@ -17,4 +18,13 @@ if __name__ == "__main__":
 
     # Begin the RIPDaemon
     rip_daemon = RIPDaemon(sys.argv[1], log_level=LOG_LEVEL)
+
+    # Reload the configuration file in place on SIGHUP
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP,
+                      lambda signum, frame: rip_daemon.request_reload())
+
+    # Withdraw routes from peers before exiting on SIGTERM
+    signal.signal(signal.SIGTERM, lambda signum, frame: rip_daemon.stop())
+
     rip_daemon.start()
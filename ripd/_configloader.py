@@ -6,6 +6,8 @@
 
 import configparser
 import sys
+from ._structures import parse_destination
+from ._table import LOOP_PREVENTION_MODES
 
 
 class ConfigLoader:
@@ -44,7 +46,7 @@ class ConfigLoader:
 
         try:
             router_info['periodic_update_time'] = \
-                int(self._config['ROUTER']['periodic_update_time'])
+                float(self._config['ROUTER']['periodic_update_time'])
         except (KeyError, ValueError):
             self._logger.critical("Invalid or missing 'periodic_update_time'" +
                                   " in ROUTER section.")
@@ -52,19 +54,156 @@ class ConfigLoader:
 
         try:
             router_info['garbage_collection_time'] = \
-                int(self._config['ROUTER']['garbage_collection_time'])
+                float(self._config['ROUTER']['garbage_collection_time'])
         except (KeyError, ValueError):
             self._logger.critical("Invalid or missing 'garbage_collection_" +
                                   "time' in ROUTER section.")
             sys.exit(1)
 
         try:
-            router_info['timeout'] = int(self._config['ROUTER']['timeout'])
+            router_info['timeout'] = \
+                float(self._config['ROUTER']['timeout'])
         except (KeyError, ValueError):
             self._logger.critical("Invalid or missing 'timeout' in ROUTER" +
                                   " section.")
             sys.exit(1)
 
+        # Optional randomised jitter on the periodic update timer, as a
+        # fraction of periodic_update_time, and staggering of the updates
+        # to each peer across the interval
+        router_info['periodic_update_jitter'] = \
+            self._get_optional('ROUTER', 'periodic_update_jitter', float, 0.0)
+        if not 0 <= router_info['periodic_update_jitter'] < 1:
+            self._logger.critical("'periodic_update_jitter' must be at " +
+                                  "least 0 and less than 1.")
+            sys.exit(1)
+        router_info['stagger_updates'] = \
+            self._get_optional('ROUTER', 'stagger_updates', bool, False)
+
+        # Optional ceiling of an adaptive periodic update interval, which
+        # grows while the table is stable. Equal to periodic_update_time
+        # (the default) for a fixed interval.
+        router_info['max_periodic_update_time'] = self._get_optional(
+            'ROUTER', 'max_periodic_update_time', float,
+            router_info['periodic_update_time'])
+        if router_info['max_periodic_update_time'] < \
+                router_info['periodic_update_time']:
+            self._logger.critical("'max_periodic_update_time' must not be " +
+                                  "less than 'periodic_update_time'.")
+            sys.exit(1)
+
+        # Optional receive buffer size for every incoming port, overridden
+        # per port by the RECEIVE-BUFFERS section (port = size)
+        default_buffer = \
+            self._get_optional('ROUTER', 'receive_buffer_size', int, None)
+        router_info['receive_buffers'] = {
+            port: self._get_optional('RECEIVE-BUFFERS', str(port), int,
+                                     default_buffer)
+            for port in router_info['incoming_ports']}
+
+        # Optional per-peer rate limit on incoming packets (packets per
+        # second, 0 for no limit), and bound on the backlog of packets
+        # waiting to be processed
+        router_info['rate_limit'] = \
+            self._get_optional('ROUTER', 'rate_limit', float, 0.0)
+        router_info['rate_limit_burst'] = \
+            self._get_optional('ROUTER', 'rate_limit_burst', float,
+                               max(1.0, 2 * router_info['rate_limit']))
+        router_info['ingress_backlog'] = \
+            self._get_optional('ROUTER', 'ingress_backlog', int, 256)
+
+        # Optional transport between routers (see _transport)
+        router_info['transport'] = \
+            self._get_optional('ROUTER', 'transport', str, 'udp')
+
+        # Optional loop prevention mode (none, split_horizon or
+        # poisoned_reverse), and hold-down time in seconds
+        router_info['loop_prevention'] = self._get_optional(
+            'ROUTER', 'loop_prevention', str, 'poisoned_reverse')
+        if router_info['loop_prevention'] not in LOOP_PREVENTION_MODES:
+            self._logger.critical("Invalid 'loop_prevention' in ROUTER " +
+                                  "section.")
+            sys.exit(1)
+        router_info['hold_down'] = \
+            self._get_optional('ROUTER', 'hold_down', float, 0.0)
+
+        # Optional hellos sent to every peer at this interval in seconds (0
+        # for none), declaring a peer down after hello_multiplier of its
+        # intervals pass without a hello from it
+        router_info['hello_interval'] = \
+            self._get_optional('ROUTER', 'hello_interval', float, 0.0)
+        router_info['hello_multiplier'] = \
+            self._get_optional('ROUTER', 'hello_multiplier', int, 3)
+        if router_info['hello_interval'] < 0 or \
+                router_info['hello_multiplier'] < 1:
+            self._logger.critical("Invalid 'hello_interval' or " +
+                                  "'hello_multiplier' in ROUTER section.")
+            sys.exit(1)
+
+        # Optional route flap damping, with the penalty for each flap, the
+        # half-life of the penalty in seconds, the suppress and reuse
+        # thresholds, and the longest time a route stays suppressed
+        router_info['flap_damping'] = None
+        if self._get_optional('ROUTER', 'flap_damping', bool, False):
+            router_info['flap_damping'] = {
+                'penalty': self._get_optional(
+                    'ROUTER', 'damping_penalty', float, 1000.0),
+                'half_life': self._get_optional(
+                    'ROUTER', 'damping_half_life', float, 30.0),
+                'suppress': self._get_optional(
+                    'ROUTER', 'damping_suppress', float, 2000.0),
+                'reuse': self._get_optional(
+                    'ROUTER', 'damping_reuse', float, 750.0),
+                'max_suppress': self._get_optional(
+                    'ROUTER', 'damping_max_suppress', float, 120.0),
+            }
+            damping = router_info['flap_damping']
+            if damping['penalty'] <= 0 or damping['half_life'] <= 0 or \
+                    damping['max_suppress'] <= 0 or \
+                    not 0 < damping['reuse'] < damping['suppress']:
+                self._logger.critical("Invalid flap damping settings in " +
+                                      "ROUTER section: 'damping_penalty', " +
+                                      "'damping_half_life' and " +
+                                      "'damping_max_suppress' must be " +
+                                      "positive, and 'damping_reuse' " +
+                                      "positive and less than " +
+                                      "'damping_suppress'.")
+                sys.exit(1)
+
+        # Optional networks attached to this router, advertised alongside
+        # its router ID, as a comma separated list of CIDR prefixes
+        try:
+            networks = self._get_optional('ROUTER', 'networks', str, '')
+            router_info['networks'] = [parse_destination(network)
+                                       for network in networks.split(',')
+                                       if network.strip()]
+        except ValueError:
+            self._logger.critical("Invalid 'networks' in ROUTER section.")
+            sys.exit(1)
+
+        # Optional warm restart snapshot of the routing table
+        router_info['snapshot_file'] = \
+            self._get_optional('ROUTER', 'snapshot_file', str, None)
+        router_info['snapshot_interval'] = \
+            self._get_optional('ROUTER', 'snapshot_interval', int, 5)
+
+        # Optional threshold in seconds above which a timer firing late is
+        # logged as a warning (0 for no warnings)
+        router_info['timer_slip_warning'] = \
+            self._get_optional('ROUTER', 'timer_slip_warning', float, 1.0)
+        if router_info['timer_slip_warning'] < 0:
+            self._logger.critical("Invalid 'timer_slip_warning' in ROUTER " +
+                                  "section.")
+            sys.exit(1)
+
+        # Optional Unix domain socket path of the control socket
+        router_info['control_socket'] = \
+            self._get_optional('ROUTER', 'control_socket', str, None)
+
+        # Optional path of a memory mapped mirror of the routing table
+        router_info['mirror_file'] = \
+            self._get_optional('ROUTER', 'mirror_file', str, None)
+
         return router_info
 
     def get_peer_info(self):
@@ -72,7 +211,8 @@ class ConfigLoader:
             Get peer information from the configuration file.
 
             :returns: Dictionary of peers, each peer being a dict containing
-                        the port and metric.
+                        the port, metric, and whether to summarise updates
+                        sent to it.
         """
         peer_info = {}
         for section in self._config.sections():
@@ -81,6 +221,8 @@ class ConfigLoader:
                     peer = {}
                     peer['port'] = int(self._config[section]['port'])
                     peer['metric'] = int(self._config[section]['metric'])
+                    peer['summarise'] = self._config.getboolean(
+                        section, 'summarise', fallback=False)
                     peer_info[int(self._config[section]['router_id'])] = peer
                 except (KeyError, ValueError):
                     self._logger.critical("Invalid configuration for peer " +
@@ -88,3 +230,23 @@ class ConfigLoader:
                     sys.exit(1)
 
         return peer_info
+
+    def _get_optional(self, section: str, key: str, cast, default):
+        """
+            Read an optional value from the configuration file.
+
+            :param cast: Function used to convert the value, e.g. int.
+            :returns: The converted value, or default if it is missing.
+        """
+        try:
+            value = self._config[section][key]
+        except KeyError:
+            return default
+
+        try:
+            if cast is bool:
+                return self._config.getboolean(section, key)
+            return cast(value)
+        except ValueError:
+            self._logger.critical(f"Invalid '{key}' in {section} section.")
+            sys.exit(1)
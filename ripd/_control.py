@@ -0,0 +1,240 @@
+"""
+    RIPDaemon - local control socket. Serves JSON lines over a Unix domain
+    socket: each request is one JSON object on a line, answered by one JSON
+    object per line. Requests are {"command": ..., ...} with the commands:
+
+    - route: the entry for a destination (router ID, or CIDR prefix).
+    - lookup: the longest prefix match route for an IPv4 address.
+    - dump: every route, one line each, then {"ok": true, "count": n}.
+      Optional offset and limit select a page, in destination order.
+    - metrics: RIPDaemon.get_metrics().
+    - update: send a triggered update to every peer.
+    - clear: remove every route, and ask the peers for their tables.
+    - stop: stop the router gracefully, withdrawing its routes.
+
+    Failed requests are answered with {"ok": false, "error": ...}.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from ._structures import (parse_destination, destination_prefix,
+                          format_address)
+
+COMMAND_TIMEOUT = 5  # Seconds to wait for the daemon to run a command
+
+
+class ControlError(Exception):
+    """Exception raised for invalid control requests."""
+    def __init__(self, message="Invalid control request"):
+        super().__init__(message)
+
+
+def route_as_dict(entry):
+    """
+        :returns: JSON-serialisable form of a RouteEntry.
+    """
+    destination = entry.destination_id
+    return {'destination': destination if isinstance(destination, int)
+            else str(destination),
+            'next_hop': entry.next_hop_id,
+            'metric': entry.metric,
+            'age': round(max(0.0, time.time() - entry.timeout), 3),
+            'garbage_collection': entry.garbage_collection_timer,
+            'suppressed': entry.suppressed}
+
+
+def parse_route_destination(value):
+    """
+        Routing table key of a requested destination: an integer router ID,
+        or a destination in CIDR notation.
+
+        :raises: ControlError if the destination is invalid.
+    """
+    try:
+        if isinstance(value, int) or str(value).isdigit():
+            return int(value)
+        return parse_destination(str(value))
+    except ValueError:
+        raise ControlError(f"Invalid destination '{value}'")
+
+
+class ControlServer:
+    """
+        Control socket of a RIPDaemon. Each connection is served on its own
+        thread. Route queries read single entries, or an atomic copy of the
+        routing table, from that thread. Metrics, which walk the daemon's
+        live state, and commands that change the router are queued for the
+        daemon thread, which runs them from its main loop with run_pending.
+    """
+    def __init__(self, logger, path: str, daemon):
+        """
+            :param daemon: The RIPDaemon to serve.
+            :raises: OSError if the socket cannot be created.
+        """
+        self._logger = logger
+        self._path = path
+        self._daemon = daemon
+        self._commands = queue.Queue()
+
+        # Replace a socket left behind by a router that did not exit cleanly
+        if os.path.exists(path):
+            os.unlink(path)
+
+        control = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                control._serve(self.rfile, self.wfile)
+
+        self._server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        self._logger.info(f"Control socket listening on {path}.")
+
+    def close(self):
+        """
+            Stop serving, and remove the socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        try:
+            os.unlink(self._path)
+        except OSError:
+            pass
+
+    def run_pending(self):
+        """
+            Run the commands queued by connections. Called from the daemon
+            thread.
+        """
+        while True:
+            try:
+                command, done, result = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                result['value'] = command()
+            except Exception as e:
+                result['error'] = str(e)
+            done.set()
+
+    def _run_on_daemon(self, command):
+        """
+            Queue a command for the daemon thread, and wait for it to run.
+
+            :returns: The command's return value.
+            :raises: ControlError if it fails or the daemon does not run it.
+        """
+        done = threading.Event()
+        result = {}
+        self._commands.put((command, done, result))
+        if not done.wait(COMMAND_TIMEOUT):
+            raise ControlError("Timed out waiting for the router")
+        if 'error' in result:
+            raise ControlError(result['error'])
+        return result.get('value')
+
+    def _serve(self, rfile, wfile):
+        """
+            Answer requests from one connection until it closes.
+        """
+        for line in rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ControlError("Requests must be JSON objects")
+                for response in self._handle(request):
+                    wfile.write(json.dumps(response).encode() + b'\n')
+            except (ValueError, ControlError) as e:
+                wfile.write(json.dumps({'ok': False, 'error': str(e)})
+                            .encode() + b'\n')
+            except Exception as e:
+                # Keep the connection open whatever went wrong
+                self._logger.error(f"Control request failed: {e!r}")
+                wfile.write(json.dumps({'ok': False,
+                                        'error': 'Internal error'})
+                            .encode() + b'\n')
+            wfile.flush()
+
+    def _handle(self, request):
+        """
+            Answer one request.
+
+            :returns: Iterable of response objects.
+        """
+        command = request.get('command')
+        table = self._daemon._table
+
+        if command == 'route':
+            entry = table.routes.get(
+                parse_route_destination(request.get('destination')))
+            return [{'ok': True,
+                     'route': entry and route_as_dict(entry)}]
+
+        if command == 'lookup':
+            try:
+                address = parse_destination(str(request.get('address')))
+            except ValueError:
+                raise ControlError(
+                    f"Invalid address '{request.get('address')}'")
+            if not isinstance(address, int):
+                raise ControlError("Lookups take an address, not a prefix")
+            try:
+                entry = table.lookup(address)
+            except KeyError:  # Removed while it was being looked up
+                entry = None
+            return [{'ok': True, 'address': format_address(address),
+                     'route': entry and route_as_dict(entry)}]
+
+        if command == 'dump':
+            return self._dump(table, request.get('offset', 0),
+                              request.get('limit'))
+
+        if command == 'metrics':
+            return [{'ok': True, 'metrics':
+                     self._run_on_daemon(self._daemon.get_metrics)}]
+
+        if command == 'update':
+            self._run_on_daemon(self._daemon._trigger_update)
+            return [{'ok': True}]
+
+        if command == 'clear':
+            self._run_on_daemon(self._daemon._clear_table)
+            return [{'ok': True}]
+
+        if command == 'stop':
+            self._daemon.stop()
+            return [{'ok': True}]
+
+        raise ControlError(f"Unknown command '{command}'")
+
+    @staticmethod
+    def _dump(table, offset, limit):
+        """
+            Stream a page of the routing table, one route per line.
+        """
+        if not isinstance(offset, int) or offset < 0 or \
+                not (limit is None or isinstance(limit, int) and limit >= 0):
+            raise ControlError("Invalid offset or limit")
+
+        # Copying the table is atomic, so the dump is never torn by the
+        # daemon thread changing it
+        entries = list(table.routes.values())
+        if offset or limit is not None:
+            entries.sort(
+                key=lambda entry: destination_prefix(entry.destination_id))
+            end = None if limit is None else offset + limit
+            entries = entries[offset:end]
+
+        for entry in entries:
+            yield route_as_dict(entry)
+        yield {'ok': True, 'count': len(entries)}
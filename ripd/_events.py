@@ -0,0 +1,215 @@
+"""
+    RIPDaemon - route change events, published by the routing table to any
+    number of subscribers.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import asyncio
+import collections
+import threading
+import time
+
+EVENT_QUEUE_SIZE = 1024  # Default bound on queued events per subscriber
+
+
+class RouteEventTypes:
+    ADDED = 'added'
+    METRIC_CHANGED = 'metric_changed'
+    NEXT_HOP_CHANGED = 'next_hop_changed'
+    TIMED_OUT = 'timed_out'
+    GARBAGE_COLLECTED = 'garbage_collected'
+    REMOVED = 'removed'
+    SUPPRESSED = 'suppressed'  # Flap damping stopped advertising the route
+    REUSED = 'reused'          # Flap damping resumed advertising the route
+
+
+class RouteEvent:
+    """
+        A single change to a route in the routing table.
+    """
+    def __init__(self, event_type: str, destination_id: int,
+                 next_hop_id: int, metric: int,
+                 old_next_hop_id: int = None, old_metric: int = None,
+                 timestamp: float = None):
+        self.type = event_type
+        self.destination_id = destination_id
+        self.next_hop_id = next_hop_id
+        self.metric = metric
+        self.old_next_hop_id = old_next_hop_id
+        self.old_metric = old_metric
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def __str__(self):
+        """
+            String representation of the route event.
+        """
+        return f"RouteEvent(type={self.type}, " \
+               f"destination={self.destination_id}, " \
+               f"next_hop={self.next_hop_id}, metric={self.metric}, " \
+               f"timestamp={self.timestamp:.3f})"
+
+    def __repr__(self):
+        """
+            String representation of the route event.
+        """
+        return self.__str__()
+
+
+class RouteEventQueue:
+    """
+        Bounded, thread safe queue of route events. When full, the oldest
+        event is discarded so a slow consumer can never stall the daemon.
+    """
+    def __init__(self, maxsize: int = EVENT_QUEUE_SIZE):
+        self._events = collections.deque(maxlen=maxsize)
+        self._available = threading.Condition()
+        self.dropped = 0
+
+    def __call__(self, event):
+        """
+            Queue an event. Called by the publisher.
+        """
+        with self._available:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+            self._available.notify()
+
+    def __len__(self):
+        return len(self._events)
+
+    def get(self, timeout: float = None):
+        """
+            Remove and return the oldest queued event.
+
+            :param timeout: Seconds to wait for an event, or None to block.
+            :returns: RouteEvent, or None if the timeout expired.
+        """
+        with self._available:
+            if not self._available.wait_for(lambda: self._events, timeout):
+                return None
+            return self._events.popleft()
+
+    def get_nowait(self):
+        """
+            Remove and return the oldest queued event, or None if empty.
+        """
+        return self.get(timeout=0)
+
+
+class AsyncRouteEventIterator:
+    """
+        Async iterator over route events, fed from the daemon thread.
+    """
+    def __init__(self, loop, maxsize: int = EVENT_QUEUE_SIZE):
+        self._loop = loop
+        self._events = collections.deque(maxlen=maxsize)
+        self._available = asyncio.Event()
+        self.dropped = 0
+
+    def __call__(self, event):
+        """
+            Queue an event. Called by the publisher, from any thread.
+        """
+        self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(event)
+        self._available.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._events:
+            self._available.clear()
+            await self._available.wait()
+        return self._events.popleft()
+
+
+class RouteEventPublisher:
+    """
+        Delivers route events to subscribed callbacks, queues and async
+        iterators, and tracks when the table last changed.
+    """
+    def __init__(self, logger):
+        self._logger = logger
+        self._subscribers = []
+        self._changed = threading.Condition()
+        self.last_event_time = time.time()
+
+    def subscribe(self, callback):
+        """
+            Call callback(event) for every future event. Callbacks run on the
+            daemon thread, so must be quick and must not block.
+
+            :returns: The callback, for use with unsubscribe.
+        """
+        with self._changed:
+            # Copy on write, so publish never iterates a changing list
+            self._subscribers = self._subscribers + [callback]
+        return callback
+
+    def unsubscribe(self, subscriber):
+        """
+            Stop delivering events to a callback, queue or iterator.
+        """
+        with self._changed:
+            self._subscribers = [s for s in self._subscribers
+                                 if s is not subscriber]
+
+    def subscribe_queue(self, maxsize: int = EVENT_QUEUE_SIZE):
+        """
+            Subscribe a new bounded queue of events.
+
+            :returns: RouteEventQueue.
+        """
+        return self.subscribe(RouteEventQueue(maxsize))
+
+    def subscribe_async(self, maxsize: int = EVENT_QUEUE_SIZE):
+        """
+            Subscribe a new async iterator of events. Must be called from the
+            event loop that will consume the events.
+
+            :returns: AsyncRouteEventIterator.
+        """
+        loop = asyncio.get_event_loop()
+        return self.subscribe(AsyncRouteEventIterator(loop, maxsize))
+
+    def publish(self, event):
+        """
+            Deliver an event to every subscriber.
+        """
+        with self._changed:
+            self.last_event_time = event.timestamp
+            self._changed.notify_all()
+
+        for subscriber in self._subscribers:
+            try:
+                subscriber(event)
+            except Exception as e:
+                # A faulty subscriber must never take the daemon down
+                self._logger.error(f"Route event subscriber failed: {e}")
+
+    def wait_for_quiet(self, period: float, timeout: float = None):
+        """
+            Block until no events have been published for period seconds.
+
+            :param period: Length of the quiet period, in seconds.
+            :param timeout: Maximum seconds to wait, or None for no limit.
+            :returns: True if the table went quiet, False on timeout.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._changed:
+            while True:
+                now = time.time()
+                remaining = self.last_event_time + period - now
+                if remaining <= 0:
+                    return True
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    remaining = min(remaining, deadline - now)
+                self._changed.wait(remaining)
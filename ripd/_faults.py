@@ -0,0 +1,476 @@
+"""
+    RIPDaemon - fault injection. Scenarios schedule link failures, packet
+    loss, delay, jitter, reordering and partitions, which are applied by a
+    transport shim beneath the Interface.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+from ._oracle import Topology
+from ._transport import Transport
+
+# Scenario actions, and the arguments each takes after the link or groups
+ACTIONS = {
+    'down': 0,       # at 5: down 1-2
+    'up': 0,         # at 9: up 1-2
+    'loss': 1,       # at 0: loss 1-2 20%
+    'delay': None,   # at 0: delay 1>2 50ms [jitter 10ms]
+    'reorder': 1,    # at 0: reorder 1-2 10%
+    'clear': 0,      # at 20: clear 1-2
+    'partition': 0,  # at 12: partition 1,2,3 / 4,5
+    'heal': 0,       # at 30: heal
+}
+
+_LINE = re.compile(r'^at\s+(?P<time>[\d.]+)\s*s?\s*:\s*(?P<action>\w+)'
+                   r'\s*(?P<args>.*)$')
+_DURATION = re.compile(r'^(?P<value>[\d.]+)(?P<unit>ms|s)$')
+
+
+class FaultAction:
+    """
+        A single scheduled change to the network.
+    """
+    def __init__(self, at: float, action: str, links: list = None,
+                 value: float = None, jitter: float = 0.0,
+                 groups: list = None):
+        """
+            :param at: Scenario time of the action, in seconds.
+            :param links: List of directed (sender, receiver) router ID
+                          pairs the action applies to.
+            :param value: Loss or reorder probability, or delay in seconds.
+            :param jitter: Delay jitter in seconds.
+            :param groups: List of sets of router IDs, for partitions.
+        """
+        self.at = at
+        self.action = action
+        self.links = links or []
+        self.value = value
+        self.jitter = jitter
+        self.groups = groups or []
+
+    def __str__(self):
+        """
+            String representation of the action.
+        """
+        return f"FaultAction(at={self.at}, action={self.action}, " \
+               f"links={self.links}, value={self.value}, " \
+               f"jitter={self.jitter}, groups={self.groups})"
+
+    def __repr__(self):
+        """
+            String representation of the action.
+        """
+        return self.__str__()
+
+
+class Scenario:
+    """
+        Static helper functions for reading fault scenarios. A scenario has
+        one action per line, as "at <seconds>: <action> <arguments>", where
+        links are written "1-2" (both directions) or "1>2" (one direction),
+        and "#" starts a comment:
+
+            at 0: loss 1-2 20%
+            at 0: delay 2>3 50ms jitter 10ms
+            at 5: down 1-2
+            at 12: partition 1,2,3 / 4,5,6
+    """
+
+    @staticmethod
+    def load(path: str):
+        """
+            Read a scenario file.
+
+            :returns: List of FaultAction objects, in time order.
+            :raises: ScenarioError if the scenario is invalid.
+        """
+        with open(path) as scenario:
+            return Scenario.parse(scenario.read())
+
+    @staticmethod
+    def parse(text: str):
+        """
+            Parse the text of a scenario.
+
+            :returns: List of FaultAction objects, in time order.
+            :raises: ScenarioError if the scenario is invalid.
+        """
+        actions = []
+        for number, line in enumerate(text.splitlines(), start=1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            try:
+                actions.append(Scenario._parse_line(line))
+            except (ValueError, IndexError) as e:
+                raise ScenarioError(f"Line {number}: {e}")
+
+        # Keep the file order of actions at the same time
+        return sorted(actions, key=lambda action: action.at)
+
+    @staticmethod
+    def _parse_line(line):
+        """
+            Parse one action.
+        """
+        match = _LINE.match(line)
+        if match is None:
+            raise ValueError(f"Expected 'at <seconds>: <action>', got "
+                             f"'{line}'")
+        at = float(match['time'])
+        action = match['action'].lower()
+        args = match['args'].split()
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action '{action}'")
+
+        if action == 'heal':
+            return FaultAction(at, action)
+        if action == 'partition':
+            groups = [{int(router_id) for router_id in group.split(',')
+                       if router_id.strip()}
+                      for group in match['args'].split('/')]
+            if len(groups) < 2 or not all(groups):
+                raise ValueError("A partition needs two or more groups")
+            return FaultAction(at, action, groups=groups)
+
+        links = Scenario._parse_link(args[0])
+        args = args[1:]
+        if action == 'delay':
+            if len(args) not in (1, 3) or \
+                    (len(args) == 3 and args[1] != 'jitter'):
+                raise ValueError("Expected 'delay <link> <delay> "
+                                 "[jitter <jitter>]'")
+            jitter = Scenario._parse_duration(args[2]) if len(args) == 3 \
+                else 0.0
+            return FaultAction(at, action, links,
+                               Scenario._parse_duration(args[0]), jitter)
+
+        if len(args) != ACTIONS[action]:
+            raise ValueError(f"Wrong number of arguments for '{action}'")
+        value = Scenario._parse_percentage(args[0]) if args else None
+        return FaultAction(at, action, links, value)
+
+    @staticmethod
+    def _parse_link(text):
+        """
+            :returns: List of directed (sender, receiver) pairs of a link.
+        """
+        if '>' in text:
+            sender, receiver = text.split('>')
+            return [(int(sender), int(receiver))]
+        first, second = text.split('-')
+        return [(int(first), int(second)), (int(second), int(first))]
+
+    @staticmethod
+    def _parse_duration(text):
+        """
+            :returns: Duration in seconds, from e.g. "50ms" or "0.5s".
+        """
+        match = _DURATION.match(text)
+        if match is None:
+            raise ValueError(f"Invalid duration '{text}'")
+        value = float(match['value'])
+        return value / 1000 if match['unit'] == 'ms' else value
+
+    @staticmethod
+    def _parse_percentage(text):
+        """
+            :returns: Probability, from e.g. "20%".
+        """
+        value = float(text.rstrip('%')) / 100
+        if not 0 <= value <= 1:
+            raise ValueError(f"Invalid percentage '{text}'")
+        return value
+
+
+class LinkImpairment:
+    """
+        The impairments of one direction of a link.
+    """
+    def __init__(self):
+        self.down = False
+        self.loss = 0.0
+        self.delay = 0.0
+        self.jitter = 0.0
+        self.reorder = 0.0
+
+    def is_clear(self):
+        """
+            :returns: True if the link is unimpaired.
+        """
+        return not (self.down or self.loss or self.delay or self.jitter or
+                    self.reorder)
+
+
+class FaultInjector:
+    """
+        Applies fault actions to the packets sent between routers. Every
+        router's transport is wrapped with wrap(), and a scenario is played
+        with play(). Scenario times and delays are divided by speed, so a
+        scenario can run faster than real time alongside routers whose
+        timers have been shortened by the same factor.
+    """
+    def __init__(self, logger, port_owners: dict, speed: float = 1,
+                 seed=None):
+        """
+            :param port_owners: Dictionary of incoming port to the ID of the
+                                router listening on it.
+        """
+        self._logger = logger
+        self._port_owners = dict(port_owners)
+        self._speed = speed
+        self._random = random.Random(seed)
+
+        self._links = {}       # (sender, receiver) -> LinkImpairment
+        self._partition = []   # Sets of router IDs that can reach each other
+        self._lock = threading.Lock()
+        self.counters = {'sent': 0, 'dropped': 0, 'delayed': 0,
+                         'reordered': 0, 'send_errors': 0}
+
+        # Delayed packets, sent by a background thread when they are due.
+        # Each is sent through its FaultyTransport, which serialises the
+        # background thread's sends with the router's own.
+        self._delayed = []  # Heap of (due, sequence, transport, packet, port)
+        self._sequence = itertools.count()
+        self._delayed_available = threading.Condition(self._lock)
+        self._delay_thread = None
+
+        self._stopped = threading.Event()
+        self._player = None
+
+    def wrap(self, transport: Transport, router_id: int):
+        """
+            :returns: Transport that sends through the fault injector.
+        """
+        return FaultyTransport(transport, self, router_id)
+
+    def apply(self, action: FaultAction):
+        """
+            Apply a single fault action immediately.
+        """
+        self._logger.info(f"Fault injection: {action.action} " +
+                          f"{action.links or action.groups}")
+        with self._lock:
+            if action.action == 'partition':
+                self._partition = [set(group) for group in action.groups]
+            elif action.action == 'heal':
+                self._partition = []
+
+            for link in action.links:
+                impairment = self._links.setdefault(link, LinkImpairment())
+                if action.action in ('down', 'up'):
+                    impairment.down = action.action == 'down'
+                elif action.action == 'loss':
+                    impairment.loss = action.value
+                elif action.action == 'delay':
+                    impairment.delay = action.value / self._speed
+                    impairment.jitter = action.jitter / self._speed
+                elif action.action == 'reorder':
+                    impairment.reorder = action.value
+                elif action.action == 'clear':
+                    impairment = LinkImpairment()
+                    self._links[link] = impairment
+                if impairment.is_clear():
+                    del self._links[link]
+
+    def play(self, actions: list):
+        """
+            Apply the actions of a scenario at their scheduled times, in a
+            background thread, starting now.
+        """
+        def player():
+            start = time.time()
+            for action in actions:
+                due = start + action.at / self._speed
+                if self._stopped.wait(max(0, due - time.time())):
+                    return
+                self.apply(action)
+
+        self._player = threading.Thread(target=player, daemon=True)
+        self._player.start()
+
+    def wait(self, timeout: float = None):
+        """
+            Wait for the scenario being played to finish.
+
+            :returns: True if the scenario finished.
+        """
+        if self._player is not None:
+            self._player.join(timeout)
+            return not self._player.is_alive()
+        return True
+
+    def stop(self):
+        """
+            Stop playing the scenario, and discard delayed packets.
+        """
+        self._stopped.set()
+        with self._lock:
+            self._delayed.clear()
+            self._delayed_available.notify_all()
+
+    def _partitioned(self, sender_id, receiver_id):
+        """
+            :returns: True if a partition separates the two routers. Routers
+                      not named in the partition form one more group.
+        """
+        if not self._partition:
+            return False
+        sender_group = next((group for group in self._partition
+                             if sender_id in group), None)
+        receiver_group = next((group for group in self._partition
+                               if receiver_id in group), None)
+        return sender_group is not receiver_group
+
+    def send(self, transport, sender_id, packet, port):
+        """
+            Send a packet through a FaultyTransport, dropping or delaying it
+            according to the impairments of the link.
+        """
+        receiver_id = self._port_owners.get(port)
+        with self._lock:
+            impairment = self._links.get((sender_id, receiver_id))
+            if self._partitioned(sender_id, receiver_id) or \
+                    (impairment is not None and
+                     (impairment.down or
+                      self._random.random() < impairment.loss)):
+                self.counters['dropped'] += 1
+                return
+
+            delay = 0.0
+            if impairment is not None:
+                delay = max(0.0, impairment.delay + self._random.uniform(
+                    -impairment.jitter, impairment.jitter))
+                # Reordered packets are held back behind the packets after
+                # them
+                if self._random.random() < impairment.reorder:
+                    self.counters['reordered'] += 1
+                    delay += impairment.delay + impairment.jitter + \
+                        0.01 / self._speed
+
+            self.counters['sent'] += 1
+            if delay > 0:
+                self.counters['delayed'] += 1
+                heapq.heappush(self._delayed,
+                               (time.time() + delay, next(self._sequence),
+                                transport, bytes(packet), port))
+                self._start_delay_thread()
+                self._delayed_available.notify()
+                return
+
+        transport.deliver(packet, port)
+
+    def _start_delay_thread(self):
+        """
+            Start the thread sending delayed packets, if it is not running.
+            Called with the lock held.
+        """
+        if self._delay_thread is None:
+            self._delay_thread = threading.Thread(target=self._send_delayed,
+                                                  daemon=True)
+            self._delay_thread.start()
+
+    def _send_delayed(self):
+        """
+            Send delayed packets as they fall due.
+        """
+        while not self._stopped.is_set():
+            with self._lock:
+                while not self._delayed or self._delayed[0][0] > time.time():
+                    if self._stopped.is_set():
+                        return
+                    timeout = self._delayed[0][0] - time.time() \
+                        if self._delayed else None
+                    self._delayed_available.wait(timeout)
+                _, _, transport, packet, port = heapq.heappop(self._delayed)
+
+            try:
+                transport.deliver(packet, port)
+            except OSError as e:
+                self.counters['send_errors'] += 1
+                self._logger.debug(f"Delayed send to port {port} failed: " +
+                                   f"{e}.")
+
+    def impaired_topology(self, topology):
+        """
+            Copy a topology, leaving out the links that are down or
+            partitioned. A link is left out if either direction is down, so
+            the copy can be given to a ShortestPathOracle.
+        """
+        def usable(router_id, peer_id):
+            for link in ((router_id, peer_id), (peer_id, router_id)):
+                impairment = self._links.get(link)
+                if (impairment is not None and impairment.down) or \
+                        self._partitioned(*link):
+                    return False
+            return True
+
+        impaired = Topology()
+        with self._lock:
+            for router_id in topology.links:
+                impaired.add_router(
+                    router_id, topology.ports[router_id],
+                    {peer_id: {'metric': metric,
+                               'port': topology.peer_ports[router_id][peer_id]}
+                     for peer_id, metric in topology.links[router_id].items()
+                     if usable(router_id, peer_id)},
+                    topology.networks[router_id])
+        return impaired
+
+
+class FaultyTransport(Transport):
+    """
+        Transport shim that passes sent packets through a FaultInjector, and
+        everything else straight to the wrapped transport.
+    """
+    def __init__(self, transport: Transport, injector: FaultInjector,
+                 router_id: int):
+        self._transport = transport
+        self._injector = injector
+        self._router_id = router_id
+
+        # Delayed packets are sent from the injector's thread, so sends are
+        # serialised with each other and with close, as the wrapped
+        # transport is not thread safe
+        self._send_lock = threading.Lock()
+        self._closed = False
+
+    def bind(self, port, receive_buffer=None):
+        self._transport.bind(port, receive_buffer)
+
+    def unbind(self, port):
+        self._transport.unbind(port)
+
+    def send(self, packet, port):
+        self._injector.send(self, self._router_id, packet, port)
+
+    def deliver(self, packet, port):
+        """
+            Send a packet through the wrapped transport, now. Packets
+            delivered after the transport is closed are discarded.
+        """
+        with self._send_lock:
+            if not self._closed:
+                self._transport.send(packet, port)
+
+    def poll(self, timeout):
+        return self._transport.poll(timeout)
+
+    def close(self):
+        with self._send_lock:
+            self._closed = True
+            self._transport.close()
+
+    def port_stats(self):
+        return self._transport.port_stats()
+
+
+class ScenarioError(Exception):
+    """Exception raised for invalid fault scenarios."""
+    def __init__(self, message="Error occurred while reading the scenario"):
+        super().__init__(message)
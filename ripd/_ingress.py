@@ -0,0 +1,102 @@
+"""
+    RIPDaemon - ingress protection: per-peer rate limiting, and a bounded
+    backlog of received packets that sheds load under overload.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import collections
+import time
+from ._structures import HEADER_LENGTH
+
+
+class TokenBucket:
+    """
+        Token bucket rate limiter. Holds up to burst tokens, refilled at rate
+        tokens per second; each packet consumes one token.
+    """
+    def __init__(self, rate: float, burst: float):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated = time.time()
+
+    def consume(self, now: float = None):
+        """
+            Take a token, if one is available.
+
+            :returns: True if the packet is within the rate limit.
+        """
+        now = time.time() if now is None else now
+        self._tokens = min(self._burst,
+                           self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class IngressQueue:
+    """
+        Bounded backlog of received packets waiting to be processed. When
+        full, the oldest packet superseded by a newer packet in the backlog
+        is shed, so the newest state from every peer survives overload.
+    """
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._packets = collections.deque()  # (key, source, data)
+        self._keys = collections.Counter()   # Queued packets per key
+        self.shed = 0
+
+    def __len__(self):
+        return len(self._packets)
+
+    @staticmethod
+    def _key(source_router_id, data):
+        """
+            Packets with the same key carry the same part of an update: the
+            same sender, command, and first entry.
+        """
+        return (source_router_id, data[0],
+                bytes(data[HEADER_LENGTH + 4:HEADER_LENGTH + 8]))
+
+    def push(self, source_router_id: int, data):
+        """
+            Add a packet to the backlog, shedding another packet if full.
+        """
+        if len(self._packets) >= self._maxsize:
+            self._shed_one()
+
+        key = self._key(source_router_id, data)
+        self._packets.append((key, source_router_id, data))
+        self._keys[key] += 1
+
+    def _shed_one(self):
+        """
+            Drop the oldest superseded packet, or the oldest packet if none
+            has been superseded.
+        """
+        for i, (key, _, _) in enumerate(self._packets):
+            if self._keys[key] > 1:
+                del self._packets[i]
+                break
+        else:
+            key = self._packets.popleft()[0]
+
+        self._keys[key] -= 1
+        if not self._keys[key]:
+            del self._keys[key]
+        self.shed += 1
+
+    def pop(self):
+        """
+            Remove and return the oldest packet.
+
+            :returns: (source router ID, data) tuple.
+        """
+        key, source_router_id, data = self._packets.popleft()
+        self._keys[key] -= 1
+        if not self._keys[key]:
+            del self._keys[key]
+        return source_router_id, data
@@ -1,11 +1,12 @@
 """
-    RIPDaemon - UDP interface, for handling multiple outgoing / incoming ports.
+    RIPDaemon - network interface, for handling multiple outgoing / incoming
+    ports over a pluggable transport.
     MIT License. Copyright © 2025 Connor Varney, Kahu Jones
 """
 
-from socket import socket, AF_INET, SOCK_DGRAM, error
-import select
+from socket import error
 import sys
+from ._transport import create_transport
 
 POLL_TIMEOUT = 500  # Timeout on recieving incoming packets
 
@@ -19,52 +20,76 @@ class Interface:
     def __init__(self, logger,
                  incoming_ports: list,
                  bind_address="127.0.0.1",
+                 transport="udp",
+                 receive_buffers: dict = None,
                  ):
         """
         Initialize the Interface class.
+
+        :param transport: Name of the transport to use (see _transport), or
+                          a Transport instance.
+        :param receive_buffers: Dictionary of port to receive buffer size in
+                                bytes, for ports that should not use the
+                                default size.
         """
         # Store paramaters
         self._bind = bind_address
-        self._incoming_ports = incoming_ports
+        self._incoming_ports = list(incoming_ports)
+        self._receive_buffers = dict(receive_buffers or {})
+
+        # Packets queued for the next flush, and transmission counters
+        self._send_queue = []
+        self.counters = {'sent': 0, 'unreachable': 0, 'dropped': 0,
+                         'send_errors': 0}
 
         # Configure logging
         self._logger = logger
 
-        # Create sockets
-        self._incoming_sockets = []
-        self._bind_incoming_sockets()
+        # Create the transport
+        if isinstance(transport, str):
+            try:
+                transport = create_transport(transport, logger, bind_address)
+            except KeyError:
+                self._logger.critical(f"Unknown transport '{transport}'.")
+                sys.exit(1)
+            except error:
+                self._logger.critical("Transport creation failed")
+                sys.exit(1)
+        self._transport = transport
 
-        # Create a socket for outgoing packets
-        self._outgoing_socket = socket(AF_INET, SOCK_DGRAM)
+        # Bind incoming ports
+        self._bind_incoming_ports()
 
-    def _bind_incoming_sockets(self):
+    def _bind_incoming_ports(self):
         """
             Try bind to each input port from the configuration file, and
             to the bind address of this router.
         """
-        self._poller = select.poll()  # Create a polle
-        for port in self._incoming_ports:
-            # Create sockets
-            try:
-                self._logger.debug(f"Creating socket on port {port}")
-                self._incoming_sockets.append(socket(AF_INET, SOCK_DGRAM))
-                self._incoming_sockets[-1].setblocking(1)
-                self._incoming_sockets[-1].settimeout(1)
-                self._poller.register(
-                    self._incoming_sockets[-1],
-                    select.POLLIN
-                    )
-            except error:
-                self._logger.critical("Socket creation failed")
-                sys.exit(1)
+        for port in list(self._incoming_ports):
+            self.bind_port(port)
+
+    def bind_port(self, port, receive_buffer=None):
+        """
+            Bind an incoming port, and start polling it for incoming packets.
+
+            :param receive_buffer: Receive buffer size in bytes, defaulting
+                                   to the size given for this port when the
+                                   interface was created.
+            :raises: socket.error if the port cannot be bound.
+        """
+        if receive_buffer is not None:
+            self._receive_buffers[port] = receive_buffer
+        self._transport.bind(port, self._receive_buffers.get(port))
+        if port not in self._incoming_ports:
+            self._incoming_ports.append(port)
 
-            # These are servers - bind sockets to ports
-            # try:
-            self._logger.debug(f"Binding to {self._bind}:{port}")
-            self._incoming_sockets[-1].bind((self._bind, port))
-            # except error:
-            #     self._logger.critical("Socket binding failed")
-            #     sys.exit(1)
+    def unbind_port(self, port):
+        """
+            Stop polling an incoming port, and release it.
+        """
+        if port in self._incoming_ports:
+            self._transport.unbind(port)
+            self._incoming_ports.remove(port)
 
     def close_sockets(self):
         """
@@ -72,49 +97,82 @@ class Interface:
         """
         self._logger.debug("Closing sockets")
         try:
-            for sock in self._incoming_sockets:
-                sock.close()
-            self._outgoing_socket.close()
+            self._transport.close()
         except error:
             self._logger.critical("Failed to close sockets.")
             sys.exit(1)
 
     def unicast(self, packet, port):
         """
-            Transmit a packet to a single other interface.
+            Transmit a packet to a single other interface. Sends never block,
+            and a failed send is logged rather than stopping the router.
+
+            :returns: True if the packet was sent, False otherwise.
         """
         try:
-            # getsockname()[1] is the port
-            self._outgoing_socket.sendto(packet, (self._bind, port))
-        except error:
-            self._logger.critical("Socket send failed")
-            sys.exit(1)
+            self._transport.send(packet, port)
+        except error as e:
+            self._send_failed(port, e)
+            return False
 
-    def poll_incoming_ports(self):
+        self.counters['sent'] += 1
+        return True
+
+    def queue(self, packet, port):
         """
-            Poll all incoming ports for available UDP packets
-            To be called by scheduller
+            Queue a packet to be transmitted by the next flush.
+        """
+        self._send_queue.append((packet, port))
 
-            :returns: List of tuples containing the socket and the data
+    def flush(self):
         """
-        incoming_events = self._poller.poll(POLL_TIMEOUT)
-        recieved_packets = []
+            Transmit every queued packet in one pass.
 
-        for event_socket, event in incoming_events:
-            # Stop if no events  we have received an event
-            if not (event and select.POLLIN):
-                continue
+            :returns: Number of packets that could not be sent.
+        """
+        packets, self._send_queue = self._send_queue, []
+        failures = self._transport.send_batch(packets)
+        for port, e in failures:
+            self._send_failed(port, e)
 
-            # Check each of our registered sockets for a match
-            for registered_socket in self._incoming_sockets:
-                # If this isn't the socket we received data on, continue
-                if event_socket != registered_socket.fileno():
-                    continue
+        self.counters['sent'] += len(packets) - len(failures)
+        return len(failures)
 
-                # Otherwise, get data from the socket and return it
-                self._logger.debug('Recieved packet on port' +
-                                   f' {registered_socket.getsockname()[1]}')
-                # likely need to change this 4096, and include the src port
-                recieved_packets.append(registered_socket.recvfrom(512))
+    def _send_failed(self, port, e):
+        """
+            Count and log a packet that could not be sent.
+        """
+        if isinstance(e, ConnectionRefusedError):
+            # ICMP port unreachable, reported by a connected socket
+            self.counters['unreachable'] += 1
+            self._logger.debug(f"Peer on port {port} is unreachable.")
+        elif isinstance(e, BlockingIOError):
+            # The send buffer is full; drop rather than stall the router
+            self.counters['dropped'] += 1
+            self._logger.warning("Send buffer full, dropped packet to " +
+                                 f"port {port}.")
+        else:
+            self.counters['send_errors'] += 1
+            self._logger.error(f"Send to port {port} failed: {e}.")
+
+    def get_stats(self):
+        """
+            Transmission counters, and receive statistics for each port:
+            datagrams received, truncated datagrams dropped, datagrams the
+            kernel dropped on a full receive buffer (None where the platform
+            cannot report them), and the receive buffer size.
+
+            :returns: Dictionary of statistics.
+        """
+        return {'transmit': dict(self.counters),
+                'ports': self._transport.port_stats()}
 
-        return recieved_packets
+    def poll_incoming_ports(self, timeout=POLL_TIMEOUT):
+        """
+            Poll all incoming ports for available packets
+            To be called by scheduller
+
+            :param timeout: Maximum time to wait, in milliseconds.
+            :returns: List of tuples containing the data and the address
+        """
+        return self._transport.poll(timeout)
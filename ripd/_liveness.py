@@ -0,0 +1,69 @@
+"""
+    RIPDaemon - neighbour liveness detection from hello packets, in the style
+    of BFD. Every hello carries the sender's hello interval, and a peer is
+    declared down once a number of its intervals pass without a hello.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import time
+
+
+class NeighbourLiveness:
+    """
+        Tracks the hellos received from each peer. Only peers that have sent
+        a hello are tracked, so peers that do not send hellos are never
+        declared down.
+    """
+    def __init__(self, multiplier: int):
+        """
+            :param multiplier: Hello intervals without a hello before a peer
+                               is declared down.
+        """
+        self._multiplier = multiplier
+        self._deadlines = {}  # Router ID -> time it is declared down
+        self.down = set()     # Router IDs of peers declared down
+
+    def set_multiplier(self, multiplier: int):
+        self._multiplier = multiplier
+
+    def heard(self, router_id: int, interval: float, now: float = None):
+        """
+            Record a hello from a peer.
+
+            :param interval: The peer's hello interval, in seconds.
+            :returns: True if the peer had been declared down.
+        """
+        now = time.time() if now is None else now
+        came_up = router_id in self.down
+        self._deadlines[router_id] = now + interval * self._multiplier
+        self.down.discard(router_id)
+        return came_up
+
+    def expired(self, now: float = None):
+        """
+            Declare down the peers whose hellos have stopped.
+
+            :returns: List of the router IDs of peers newly declared down.
+        """
+        now = time.time() if now is None else now
+        expired = [router_id for router_id, deadline
+                   in self._deadlines.items()
+                   if deadline <= now and router_id not in self.down]
+        self.down.update(expired)
+        return expired
+
+    def next_deadline(self):
+        """
+            :returns: The earliest time a peer could be declared down, or
+                      None if no peer is up.
+        """
+        return min((deadline for router_id, deadline
+                    in self._deadlines.items()
+                    if router_id not in self.down), default=None)
+
+    def forget(self, router_id: int):
+        """
+            Stop tracking a peer, such as one removed by a reload.
+        """
+        self._deadlines.pop(router_id, None)
+        self.down.discard(router_id)
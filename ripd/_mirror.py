@@ -0,0 +1,299 @@
+"""
+    RIPDaemon - routing table mirror in a memory mapped file, so other
+    processes can read the routes without asking the daemon. The file is a
+    header followed by fixed size route records, guarded by a sequence lock:
+    the writer makes the sequence number odd while it changes the file, and
+    even again once it is done, so a reader knows its copy is consistent if
+    the sequence number was even and unchanged across the copy.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import collections
+import mmap
+import os
+import struct
+import time
+from ._structures import destination_key, destination_prefix
+
+MIRROR_MAGIC = b'RIPM'
+MIRROR_VERSION = 1
+MIRROR_CAPACITY = 1024  # Initial route records, doubled when full
+
+# Magic, version, superseded flag, router ID, sequence number, record
+# capacity, records in use (including free records below the highest
+# used), time of the last write. Little endian, with the sequence number
+# 8 byte aligned.
+MIRROR_HEADER = struct.Struct('<4sBBHQIId')
+MIRROR_SEQUENCE = struct.Struct('<Q')
+SEQUENCE_OFFSET = 8
+SUPERSEDED_OFFSET = 5
+
+# Flags, prefix length, next hop, destination address, metric, time the
+# record was last written
+MIRROR_RECORD = struct.Struct('<BBHIB7xd')
+FLAG_IN_USE = 1
+FLAG_GARBAGE_COLLECTION = 2
+FLAG_SUPPRESSED = 4
+
+# A route read from a mirror
+MirrorRoute = collections.namedtuple(
+    'MirrorRoute', ['destination', 'next_hop', 'metric',
+                    'garbage_collection', 'suppressed', 'updated'])
+
+# A consistent copy of a mirror. Routes are keyed by destination, as in
+# RouteTable.routes.
+MirrorSnapshot = collections.namedtuple(
+    'MirrorSnapshot', ['router_id', 'sequence', 'updated', 'routes'])
+
+
+class TableMirror:
+    """
+        Mirrors a RouteTable into a memory mapped file. Changes are noted
+        from the table's events, which only costs a set insertion, and
+        written by flush, which the daemon calls once per main loop
+        iteration, so every change made in an iteration appears at once.
+    """
+    def __init__(self, logger, path: str, table, router_id: int,
+                 capacity: int = MIRROR_CAPACITY):
+        """
+            :param path: Path of the mirror file, replaced if it exists.
+            :param capacity: Initial number of route records.
+            :raises: OSError if the file cannot be created.
+        """
+        self._logger = logger
+        self._path = path
+        self._table = table
+        self._router_id = router_id
+        self._slots = {}  # Destination -> record index
+        self._free = []   # Indices of records no longer in use
+        self._used = 0
+        self._sequence = 0
+        self._view = None
+        self._dirty = set()
+
+        self._create(capacity)
+        self._subscription = table.events.subscribe(
+            lambda event: self._dirty.add(event.destination_id))
+
+    def flush(self):
+        """
+            Write the routes that have changed since the last flush.
+
+            :returns: Number of routes written or removed.
+        """
+        if not self._dirty:
+            return 0
+        added = sum(destination not in self._slots
+                    and destination in self._table.routes
+                    for destination in self._dirty)
+        if len(self._slots) + added > self._capacity:
+            count = len(self._dirty)
+            self._create(2 * self._capacity)
+            return count
+
+        now = time.time()
+        self._begin_write()
+        for destination in self._dirty:
+            entry = self._table.routes.get(destination)
+            if entry is not None:
+                slot = self._slots.get(destination)
+                if slot is None:
+                    slot = self._allocate(destination)
+                self._write_record(slot, entry, now)
+            elif destination in self._slots:
+                slot = self._slots.pop(destination)
+                MIRROR_RECORD.pack_into(self._view, self._offset(slot),
+                                        0, 0, 0, 0, 0, now)
+                self._free.append(slot)
+        self._end_write(now)
+
+        count = len(self._dirty)
+        self._dirty.clear()
+        return count
+
+    def close(self):
+        """
+            Stop mirroring, and remove the file. Readers see the mirror as
+            superseded.
+        """
+        self._table.events.unsubscribe(self._subscription)
+        self._view[SUPERSEDED_OFFSET] = 1
+        self._view.close()
+        try:
+            os.unlink(self._path)
+        except OSError:
+            pass
+
+    def _create(self, capacity: int):
+        """
+            Write every route to a new file with room for capacity records,
+            and atomically replace the previous file with it. Readers of
+            the previous file see it as superseded, and reopen the path.
+        """
+        capacity = max(capacity, len(self._table.routes))
+        self._capacity = capacity
+        size = MIRROR_HEADER.size + capacity * MIRROR_RECORD.size
+        temp_path = f"{self._path}.tmp"
+        with open(temp_path, 'w+b') as mirror:
+            mirror.truncate(size)
+            view = mmap.mmap(mirror.fileno(), size)
+
+        now = time.time()
+        self._slots = {}
+        self._free = []
+        self._used = 0
+        previous, self._view = self._view, view
+        for entry in self._table.routes.values():
+            self._write_record(self._allocate(entry.destination_id),
+                               entry, now)
+        self._sequence += 2
+        self._write_header(now)
+        os.replace(temp_path, self._path)
+        self._dirty.clear()
+
+        if previous is not None:
+            previous[SUPERSEDED_OFFSET] = 1
+            previous.close()
+            self._logger.debug(f"Mirror grown to {capacity} routes.")
+
+    def _allocate(self, destination):
+        """
+            :returns: Index of a free record for a destination.
+        """
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = self._used
+            self._used += 1
+        self._slots[destination] = slot
+        return slot
+
+    def _write_record(self, slot: int, entry, now: float):
+        address, length = destination_prefix(entry.destination_id)
+        flags = FLAG_IN_USE
+        if entry.garbage_collection_timer:
+            flags |= FLAG_GARBAGE_COLLECTION
+        if entry.suppressed:
+            flags |= FLAG_SUPPRESSED
+        MIRROR_RECORD.pack_into(self._view, self._offset(slot), flags,
+                                length, entry.next_hop_id, address,
+                                entry.metric, now)
+
+    def _write_header(self, now: float):
+        MIRROR_HEADER.pack_into(self._view, 0, MIRROR_MAGIC, MIRROR_VERSION,
+                                0, self._router_id, self._sequence,
+                                self._capacity, self._used, now)
+
+    @staticmethod
+    def _offset(slot: int):
+        return MIRROR_HEADER.size + slot * MIRROR_RECORD.size
+
+    def _begin_write(self):
+        self._sequence += 1
+        MIRROR_SEQUENCE.pack_into(self._view, SEQUENCE_OFFSET,
+                                  self._sequence)
+
+    def _end_write(self, now: float):
+        self._write_header(now)
+        self._sequence += 1
+        MIRROR_SEQUENCE.pack_into(self._view, SEQUENCE_OFFSET,
+                                  self._sequence)
+
+
+class TableMirrorReader:
+    """
+        Reads a routing table mirror written by another process, without
+        any communication with it.
+    """
+    def __init__(self, path: str):
+        """
+            :raises: MirrorError if the mirror does not exist or is invalid.
+        """
+        self._path = path
+        self._view = None
+        self._open()
+
+    def read(self, timeout: float = 1.0):
+        """
+            Read a consistent copy of the mirror, retrying while the writer
+            is changing it.
+
+            :param timeout: Seconds to keep retrying before giving up.
+            :returns: MirrorSnapshot.
+            :raises: MirrorError if the mirror was removed, or no consistent
+                     copy could be read in time.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._view[SUPERSEDED_OFFSET]:
+                self._open()
+
+            before, = MIRROR_SEQUENCE.unpack_from(self._view,
+                                                  SEQUENCE_OFFSET)
+            if not before % 2:
+                _, _, _, router_id, _, capacity, used, updated = \
+                    MIRROR_HEADER.unpack_from(self._view, 0)
+                end = MIRROR_HEADER.size + \
+                    min(used, capacity) * MIRROR_RECORD.size
+                records = self._view[MIRROR_HEADER.size:end]
+                after, = MIRROR_SEQUENCE.unpack_from(self._view,
+                                                     SEQUENCE_OFFSET)
+                if before == after and not self._view[SUPERSEDED_OFFSET]:
+                    return MirrorSnapshot(router_id, before, updated,
+                                          self._decode(records))
+
+            if time.monotonic() >= deadline:
+                raise MirrorError("Timed out waiting for a consistent read")
+            time.sleep(0)  # Let the writer finish
+
+    def close(self):
+        if self._view is not None:
+            self._view.close()
+            self._view = None
+
+    def _open(self):
+        """
+            Map the current mirror file, replacing any previous mapping.
+        """
+        self.close()
+        try:
+            with open(self._path, 'rb') as mirror:
+                view = mmap.mmap(mirror.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            raise MirrorError(f"No routing table mirror at {self._path}")
+
+        try:
+            magic, version, _, _, _, capacity, _, _ = \
+                MIRROR_HEADER.unpack_from(view, 0)
+        except struct.error:
+            view.close()
+            raise MirrorError("Unable to read mirror header")
+        size = MIRROR_HEADER.size + capacity * MIRROR_RECORD.size
+        if magic != MIRROR_MAGIC or version != MIRROR_VERSION or \
+                len(view) < size:
+            view.close()
+            raise MirrorError("Unrecognised mirror format")
+        self._view = view
+
+    @staticmethod
+    def _decode(records: bytes):
+        """
+            :returns: Dictionary of the routes in use in a copy of the
+                      route records, by destination.
+        """
+        routes = {}
+        for flags, length, next_hop, address, metric, updated \
+                in MIRROR_RECORD.iter_unpack(records):
+            if flags & FLAG_IN_USE:
+                destination = destination_key(address, length)
+                routes[destination] = MirrorRoute(
+                    destination, next_hop, metric,
+                    bool(flags & FLAG_GARBAGE_COLLECTION),
+                    bool(flags & FLAG_SUPPRESSED), updated)
+        return routes
+
+
+class MirrorError(Exception):
+    """Exception raised for unreadable routing table mirrors."""
+    def __init__(self, message="Error occurred while reading the mirror"):
+        super().__init__(message)
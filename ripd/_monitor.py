@@ -0,0 +1,141 @@
+"""
+    RIPDaemon - main loop instrumentation. Records how late each timer fires
+    compared to when it was scheduled, how long each loop iteration spends
+    working between polls, and the longest stalls, warning when a timer
+    slips by more than a threshold.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import heapq
+import threading
+import time
+
+STALL_HISTORY = 10     # Longest iterations remembered
+WARNING_INTERVAL = 10  # Seconds between warnings about the same timer
+
+
+class TimerStats:
+    """
+        Slippage of one named timer.
+    """
+    def __init__(self):
+        self.fired = 0
+        self.late = 0  # Firings slipping beyond the warning threshold
+        self.total_slip = 0.0
+        self.max_slip = 0.0
+        self.last_slip = 0.0
+
+    def as_dict(self):
+        return {'fired': self.fired, 'late': self.late,
+                'mean_slip': self.total_slip / self.fired
+                if self.fired else 0.0,
+                'max_slip': self.max_slip, 'last_slip': self.last_slip}
+
+
+class LoopMonitor:
+    """
+        Instrumentation of the daemon's main loop. The daemon reports each
+        timer it fires with fired, and brackets its poll for packets with
+        iteration_finished and iteration_started, so an iteration's duration
+        is the time spent working rather than waiting. Safe to read with
+        get_stats from another thread.
+    """
+    def __init__(self, logger, slip_warning: float):
+        """
+            :param slip_warning: Slippage in seconds above which a timer is
+                                 logged as late, or 0 for no warnings.
+        """
+        self._logger = logger
+        self._slip_warning = slip_warning
+        self._lock = threading.Lock()
+        self._timers = {}         # Timer name -> TimerStats
+        self._last_warning = {}   # Timer name -> time of the last warning
+
+        # Work done in the current iteration, and totals of past ones
+        self._iteration_start = None
+        self._iteration_timers = set()
+        self._iterations = 0
+        self._total_iteration = 0.0
+        self._max_iteration = 0.0
+        self._stalls = []  # Min heap of (duration, end time, timer names)
+
+    def set_slip_warning(self, slip_warning: float):
+        self._slip_warning = slip_warning
+
+    def fired(self, name: str, scheduled: float, now: float = None):
+        """
+            Record a timer firing.
+
+            :param scheduled: Time the timer was due, from time.time().
+            :returns: The slippage, in seconds.
+        """
+        now = time.time() if now is None else now
+        slip = max(0.0, now - scheduled)
+        late = self._slip_warning and slip > self._slip_warning
+        with self._lock:
+            stats = self._timers.get(name)
+            if stats is None:
+                stats = self._timers[name] = TimerStats()
+            stats.fired += 1
+            stats.total_slip += slip
+            stats.max_slip = max(stats.max_slip, slip)
+            stats.last_slip = slip
+            stats.late += bool(late)
+        self._iteration_timers.add(name)
+
+        # Warn about each timer at most once per WARNING_INTERVAL, so an
+        # overloaded router is not slowed further by its own logging
+        if late and now - self._last_warning.get(name, 0) >= \
+                WARNING_INTERVAL:
+            self._last_warning[name] = now
+            self._logger.warning(f"Timer '{name}' fired {slip:.3f}s late " +
+                                 f"({stats.late} late of {stats.fired}); " +
+                                 "the router may be overloaded.")
+        return slip
+
+    def iteration_started(self, now: float = None):
+        """
+            Mark the start of work, after waiting for packets.
+        """
+        self._iteration_start = time.monotonic() if now is None else now
+
+    def iteration_finished(self, now: float = None):
+        """
+            Mark the end of work, before waiting for packets again.
+        """
+        if self._iteration_start is None:
+            return
+        now = time.monotonic() if now is None else now
+        duration = now - self._iteration_start
+        self._iteration_start = None
+        timers = tuple(sorted(self._iteration_timers))
+        self._iteration_timers.clear()
+
+        with self._lock:
+            self._iterations += 1
+            self._total_iteration += duration
+            self._max_iteration = max(self._max_iteration, duration)
+            stall = (duration, time.time(), timers)
+            if len(self._stalls) < STALL_HISTORY:
+                heapq.heappush(self._stalls, stall)
+            elif duration > self._stalls[0][0]:
+                heapq.heapreplace(self._stalls, stall)
+
+    def get_stats(self):
+        """
+            :returns: Dictionary of timer slippage and iteration durations,
+                      in seconds. Stalls are the longest iterations, longest
+                      first, with the timers that fired during each.
+        """
+        with self._lock:
+            return {
+                'timers': {name: stats.as_dict()
+                           for name, stats in self._timers.items()},
+                'iterations': self._iterations,
+                'mean_iteration': self._total_iteration / self._iterations
+                if self._iterations else 0.0,
+                'max_iteration': self._max_iteration,
+                'stalls': [{'duration': duration, 'time': end,
+                            'timers': list(timers)}
+                           for duration, end, timers
+                           in sorted(self._stalls, reverse=True)]}
@@ -0,0 +1,495 @@
+"""
+    RIPDaemon - reference shortest path oracle, topology generator and live
+    convergence detector.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import configparser
+import heapq
+import os
+import random
+import threading
+import time
+from ._configloader import ConfigLoader
+
+try:
+    import numpy
+except ImportError:  # Optional, only used to vectorise large topologies
+    numpy = None
+
+INFINITY = 16  # RIP metric for an unreachable destination
+
+
+class Topology:
+    """
+        A network of routers, as described by their configuration files.
+    """
+    def __init__(self):
+        self.links = {}       # Router ID -> {peer ID: metric}, as configured
+        self.ports = {}       # Router ID -> list of incoming ports
+        self.peer_ports = {}  # Router ID -> {peer ID: port of that peer}
+        self.networks = {}    # Router ID -> list of attached networks
+
+    def add_router(self, router_id: int, incoming_ports: list,
+                   peers: dict, networks: list = ()):
+        """
+            Add a router to the topology.
+
+            :param peers: Dictionary of peers, in the format returned by
+                          ConfigLoader.get_peer_info.
+            :param networks: Destinations attached to the router.
+        """
+        self.networks[router_id] = list(networks)
+        self.ports[router_id] = list(incoming_ports)
+        self.links[router_id] = {peer_id: info['metric']
+                                 for peer_id, info in peers.items()}
+        self.peer_ports[router_id] = {peer_id: info['port']
+                                      for peer_id, info in peers.items()}
+
+    @classmethod
+    def from_config_files(cls, logger, paths):
+        """
+            Build a topology from a set of router configuration files.
+        """
+        topology = cls()
+        for path in paths:
+            config_loader = ConfigLoader(logger, path)
+            router_info = config_loader.get_router_info()
+            topology.add_router(router_info['router_id'],
+                                router_info['incoming_ports'],
+                                config_loader.get_peer_info(),
+                                router_info['networks'])
+        return topology
+
+    @classmethod
+    def generate(cls, routers: int, degree: int = 3, max_metric: int = 3,
+                 seed=None, base_port: int = 20000):
+        """
+            Generate a random connected topology with symmetric link metrics.
+
+            :param routers: Number of routers, with IDs 1 to routers.
+            :param degree: Average number of peers per router.
+            :param max_metric: Link metrics are chosen from 1 to max_metric.
+            :param base_port: First incoming port to allocate.
+        """
+        rng = random.Random(seed)
+        links = {router_id: {} for router_id in range(1, routers + 1)}
+
+        def connect(a, b):
+            links[a][b] = links[b][a] = rng.randint(1, max_metric)
+
+        # A random spanning tree keeps the network connected...
+        for router_id in range(2, routers + 1):
+            connect(router_id, rng.randint(1, router_id - 1))
+
+        # ...then add random links up to the requested average degree
+        target_links = min(routers * degree // 2,
+                           routers * (routers - 1) // 2)
+        added_links = routers - 1
+        while added_links < target_links:
+            a, b = rng.sample(range(1, routers + 1), 2)
+            if b not in links[a]:
+                connect(a, b)
+                added_links += 1
+
+        # Allocate one incoming port per link end
+        topology = cls()
+        port = base_port
+        link_ports = {}
+        for router_id in links:
+            for peer_id in links[router_id]:
+                link_ports[(router_id, peer_id)] = port
+                port += 1
+
+        for router_id, peers in links.items():
+            topology.add_router(
+                router_id,
+                [link_ports[(router_id, peer_id)] for peer_id in peers],
+                {peer_id: {'metric': metric,
+                           'port': link_ports[(peer_id, router_id)]}
+                 for peer_id, metric in peers.items()})
+
+        return topology
+
+    def with_port_offset(self, offset: int):
+        """
+            Copy the topology, moving every port by offset.
+        """
+        topology = Topology()
+        for router_id in self.links:
+            topology.add_router(
+                router_id,
+                [port + offset for port in self.ports[router_id]],
+                {peer_id: {'metric': metric,
+                           'port': self.peer_ports[router_id][peer_id] +
+                           offset}
+                 for peer_id, metric in self.links[router_id].items()},
+                self.networks[router_id])
+        return topology
+
+    def write_configs(self, directory: str, periodic_update_time: int = 2,
+                      timeout: int = 6, garbage_collection_time: int = 3,
+                      **options):
+        """
+            Write a configuration file for every router in the topology.
+
+            :param options: Additional settings for the ROUTER section.
+            :returns: Dictionary of router ID to configuration file path.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        for router_id in sorted(self.links):
+            config = configparser.ConfigParser()
+            config['ROUTER'] = {
+                'id': router_id,
+                'incoming_ports': ', '.join(
+                    str(port) for port in self.ports[router_id]),
+                'periodic_update_time': periodic_update_time,
+                'timeout': timeout,
+                'garbage_collection_time': garbage_collection_time,
+            }
+            if self.networks[router_id]:
+                config['ROUTER']['networks'] = ', '.join(
+                    str(network) for network in self.networks[router_id])
+            config['ROUTER'].update({key: str(value)
+                                     for key, value in options.items()})
+            for i, (peer_id, metric) in \
+                    enumerate(sorted(self.links[router_id].items())):
+                config[f'PEER-{i + 1}'] = {
+                    'port': self.peer_ports[router_id][peer_id],
+                    'metric': metric,
+                    'router_id': peer_id,
+                }
+
+            paths[router_id] = os.path.join(directory, f'{router_id}.ini')
+            with open(paths[router_id], 'w') as config_file:
+                config.write(config_file)
+
+        return paths
+
+    def neighbours(self, router_id: int):
+        """
+            Peers a router actually learns routes from: a link is only usable
+            if both ends are configured with each other.
+
+            :returns: Dictionary of peer ID to link metric.
+        """
+        return {peer_id: metric
+                for peer_id, metric in self.links[router_id].items()
+                if router_id in self.links.get(peer_id, {})}
+
+    def subset(self, router_ids):
+        """
+            Copy the topology, keeping only the given routers.
+        """
+        topology = Topology()
+        for router_id in router_ids:
+            topology.add_router(
+                router_id, self.ports[router_id],
+                {peer_id: {'metric': metric,
+                           'port': self.peer_ports[router_id][peer_id]}
+                 for peer_id, metric in self.links[router_id].items()
+                 if peer_id in router_ids},
+                self.networks[router_id])
+        return topology
+
+
+class ShortestPathOracle:
+    """
+        Computes the converged routing table of every router in a topology,
+        with the same semantics as RouteTable: metrics are capped at 16
+        (unreachable), and an advertisement to a peer poisons every route
+        whose next hop is that peer.
+    """
+    def __init__(self, topology: Topology, method: str = 'auto'):
+        """
+            :param method: 'dijkstra', 'floyd-warshall' (requires numpy), or
+                           'auto' to use Floyd-Warshall when numpy is
+                           available.
+        """
+        self._topology = topology
+        self._routers = sorted(topology.links)
+        self._neighbours = {router_id: topology.neighbours(router_id)
+                            for router_id in self._routers}
+
+        if method == 'auto':
+            method = 'dijkstra' if numpy is None else 'floyd-warshall'
+        if method == 'floyd-warshall':
+            if numpy is None:
+                raise ImportError("Floyd-Warshall requires numpy")
+            self._distances = self._floyd_warshall()
+        elif method == 'dijkstra':
+            self._distances = {router_id: self._dijkstra(router_id)
+                               for router_id in self._routers}
+        else:
+            raise ValueError(f"Unknown method {method}")
+
+        self.tables = {router_id: self._table(router_id)
+                       for router_id in self._routers}
+
+    def _dijkstra(self, source_id):
+        """
+            Distances from one router to every reachable router.
+        """
+        distances = {source_id: 0}
+        heap = [(0, source_id)]
+        while heap:
+            distance, router_id = heapq.heappop(heap)
+            if distance > distances[router_id]:
+                continue
+            for peer_id, metric in self._neighbours[router_id].items():
+                new_distance = distance + metric
+                if new_distance < min(distances.get(peer_id, INFINITY),
+                                      INFINITY):
+                    distances[peer_id] = new_distance
+                    heapq.heappush(heap, (new_distance, peer_id))
+        return distances
+
+    def _floyd_warshall(self):
+        """
+            Distances between every pair of routers, vectorised with numpy.
+        """
+        index = {router_id: i for i, router_id in enumerate(self._routers)}
+        size = len(self._routers)
+        matrix = numpy.full((size, size), INFINITY, dtype=numpy.int32)
+        numpy.fill_diagonal(matrix, 0)
+        for router_id, peers in self._neighbours.items():
+            for peer_id, metric in peers.items():
+                matrix[index[router_id], index[peer_id]] = \
+                    min(metric, INFINITY)
+
+        for k in range(size):
+            numpy.minimum(matrix, matrix[:, k, None] + matrix[None, k, :],
+                          out=matrix)
+        numpy.minimum(matrix, INFINITY, out=matrix)
+
+        distances = {}
+        for router_id, row in zip(self._routers, matrix.tolist()):
+            distances[router_id] = {self._routers[i]: distance
+                                    for i, distance in enumerate(row)
+                                    if distance < INFINITY}
+        return distances
+
+    def _table(self, router_id):
+        """
+            Expected routing table of a router.
+
+            :returns: Dictionary of destination to (metric, set of next hops
+                      on a shortest path).
+        """
+        table = {}
+        for destination_id, distance in self._distances[router_id].items():
+            if destination_id == router_id:
+                continue
+            next_hops = {peer_id for peer_id, metric
+                         in self._neighbours[router_id].items()
+                         if metric + self._distances[peer_id].get(
+                             destination_id, INFINITY) == distance}
+            table[destination_id] = (distance, next_hops)
+
+        # Attached networks are reached through the nearest router they
+        # are attached to
+        attached = self._topology.networks
+        for network in {network for router in self._routers
+                        for network in attached[router]}:
+            if network in attached[router_id]:
+                continue
+
+            def distance_from(source_id):
+                return min([self._distances[source_id].get(origin_id,
+                                                           INFINITY)
+                            for origin_id in self._routers
+                            if network in attached[origin_id]])
+
+            distance = distance_from(router_id)
+            if distance >= INFINITY:
+                continue
+            next_hops = {peer_id for peer_id, metric
+                         in self._neighbours[router_id].items()
+                         if metric + distance_from(peer_id) == distance}
+            table[network] = (distance, next_hops)
+        return table
+
+    def expected_metric(self, router_id: int, destination_id: int):
+        """
+            :returns: Converged metric from a router to a destination, or 16
+                      if it is unreachable.
+        """
+        return self.tables[router_id].get(destination_id, (INFINITY,))[0]
+
+    def expected_advertisement(self, router_id: int, peer_id: int,
+                               next_hops: dict = None):
+        """
+            Expected metrics in a converged update from a router to a peer,
+            as built by RouteTable.get_packet.
+
+            :param next_hops: Next hop chosen by the router for each
+                              destination. Defaults to the lowest ID of the
+                              shortest path next hops.
+            :returns: Dictionary of destination to advertised metric.
+        """
+        advertisement = {router_id: 0}
+        advertisement.update((network, 0) for network
+                             in self._topology.networks[router_id])
+        for destination_id, (metric, hops) in self.tables[router_id].items():
+            next_hop_id = min(hops) if next_hops is None \
+                else next_hops.get(destination_id)
+            advertisement[destination_id] = \
+                INFINITY if next_hop_id == peer_id else metric
+        return advertisement
+
+    def compare(self, router_id: int, table):
+        """
+            Compare a live routing table with the expected table.
+
+            :param table: RouteTable of the router.
+            :returns: List of Divergence objects, empty if the table matches.
+        """
+        divergences = []
+        expected = self.tables[router_id]
+        routes = dict(table.routes)
+
+        for destination_id in set(expected) | set(routes):
+            divergence = self._compare_entry(router_id, destination_id,
+                                             routes.get(destination_id))
+            if divergence is not None:
+                divergences.append(divergence)
+
+        return divergences
+
+    def _compare_entry(self, router_id, destination_id, entry):
+        """
+            Compare one live route with the expected route.
+
+            :returns: Divergence, or None if the route is as expected.
+        """
+        expected_metric, next_hops = \
+            self.tables[router_id].get(destination_id, (INFINITY, set()))
+        actual_metric = INFINITY if entry is None else entry.metric
+
+        if actual_metric != expected_metric:
+            return Divergence(router_id, destination_id, expected_metric,
+                              actual_metric, "metric")
+        if entry is not None and actual_metric < INFINITY and \
+                entry.next_hop_id not in next_hops:
+            return Divergence(router_id, destination_id, expected_metric,
+                              actual_metric, "next hop")
+        return None
+
+
+class Divergence:
+    """
+        A live route that differs from the expected converged route.
+    """
+    def __init__(self, router_id, destination_id, expected_metric,
+                 actual_metric, reason):
+        self.router_id = router_id
+        self.destination_id = destination_id
+        self.expected_metric = expected_metric
+        self.actual_metric = actual_metric
+        self.reason = reason
+
+    def __str__(self):
+        """
+            String representation of the divergence.
+        """
+        return f"Router {self.router_id} route to {self.destination_id}: " \
+               f"expected metric {self.expected_metric}, got " \
+               f"{self.actual_metric} ({self.reason})"
+
+    def __repr__(self):
+        """
+            String representation of the divergence.
+        """
+        return self.__str__()
+
+
+class ConvergenceDetector:
+    """
+        Watches the route events of live routing tables, and records the
+        moment they all match the oracle.
+    """
+    def __init__(self, oracle: ShortestPathOracle, tables: dict):
+        """
+            :param tables: Dictionary of router ID to RouteTable.
+        """
+        self._oracle = oracle
+        self._tables = tables
+        self._converged = threading.Condition()
+        self.converged_at = None
+        self.started_at = time.time()
+        self._divergent = set()  # (Router ID, destination) pairs
+
+        # Subscribe first, so no change is missed while taking stock
+        self._subscriptions = [
+            (table, table.events.subscribe(self._callback(router_id)))
+            for router_id, table in tables.items()]
+
+        with self._converged:
+            for router_id, table in tables.items():
+                for divergence in oracle.compare(router_id, table):
+                    self._divergent.add((router_id,
+                                         divergence.destination_id))
+            if not self._divergent:
+                self.converged_at = self.started_at
+
+    def close(self):
+        """
+            Stop watching the routing tables.
+        """
+        for table, callback in self._subscriptions:
+            table.events.unsubscribe(callback)
+        self._subscriptions = []
+
+    def _callback(self, router_id):
+        """
+            Route event callback for the table of one router.
+        """
+        def on_event(event):
+            entry = self._tables[router_id].routes.get(event.destination_id)
+            divergence = self._oracle._compare_entry(
+                router_id, event.destination_id, entry)
+
+            with self._converged:
+                key = (router_id, event.destination_id)
+                if divergence is None:
+                    self._divergent.discard(key)
+                else:
+                    self._divergent.add(key)
+
+                if self._divergent:
+                    self.converged_at = None
+                elif self.converged_at is None:
+                    self.converged_at = event.timestamp
+                    self._converged.notify_all()
+
+        return on_event
+
+    @property
+    def convergence_time(self):
+        """
+            Seconds from the detector starting to the tables converging, or
+            None if they have not converged.
+        """
+        if self.converged_at is None:
+            return None
+        return max(0, self.converged_at - self.started_at)
+
+    def wait(self, timeout: float = None):
+        """
+            Block until the tables match the oracle.
+
+            :returns: True if converged, False on timeout.
+        """
+        with self._converged:
+            return self._converged.wait_for(
+                lambda: self.converged_at is not None, timeout)
+
+    def divergences(self):
+        """
+            :returns: List of every Divergence across all tables.
+        """
+        divergences = []
+        for router_id, table in self._tables.items():
+            divergences += self._oracle.compare(router_id, table)
+        return divergences
@@ -0,0 +1,114 @@
+"""
+    RIPDaemon - compact binary snapshots of the routing table, for warm
+    restarts.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import mmap
+import os
+import struct
+import time
+from ._structures import destination_key, destination_prefix
+
+SNAPSHOT_MAGIC = b'RIPS'
+SNAPSHOT_VERSION = 2
+
+# Magic, version, router ID, entry count, time of snapshot
+HEADER = struct.Struct('!4sBHId')
+
+# Destination address, prefix length, next hop, metric, garbage collection
+# flag, timeout
+RECORD = struct.Struct('!IBHBBd')
+
+# Version 1 records, before prefixes: destination router ID, next hop,
+# metric, garbage collection flag, timeout
+RECORD_V1 = struct.Struct('!IHBBd')
+
+
+class TableSnapshot:
+    """
+        Static helper functions for saving and loading routing table
+        snapshots. Snapshots are written through a memory map to a temporary
+        file, then atomically renamed over the previous snapshot.
+    """
+
+    @staticmethod
+    def save(path: str, router_id: int, routes):
+        """
+            Write a snapshot of the routing table.
+
+            :param path: Path of the snapshot file.
+            :param router_id: ID of the router the table belongs to.
+            :param routes: Iterable of RouteEntry objects.
+        """
+        routes = list(routes)
+        size = HEADER.size + len(routes) * RECORD.size
+        temp_path = f"{path}.tmp"
+
+        with open(temp_path, 'w+b') as snapshot:
+            snapshot.truncate(size)
+            with mmap.mmap(snapshot.fileno(), size) as view:
+                HEADER.pack_into(view, 0, SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                 router_id, len(routes), time.time())
+                offset = HEADER.size
+                for entry in routes:
+                    address, length = destination_prefix(entry.destination_id)
+                    RECORD.pack_into(view, offset, address, length,
+                                     entry.next_hop_id, entry.metric,
+                                     entry.garbage_collection_timer,
+                                     entry.timeout)
+                    offset += RECORD.size
+                view.flush()
+
+        # Replace the previous snapshot in a single step, so a crash
+        # mid-write never leaves a partial snapshot behind
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def load(path: str, router_id: int):
+        """
+            Read a snapshot of the routing table, in the current or the
+            previous version of the format.
+
+            :param path: Path of the snapshot file.
+            :param router_id: ID of the router loading the snapshot.
+            :returns: List of (destination, next hop, metric, garbage
+                      collection flag, timeout) tuples.
+            :raises: SnapshotError if the snapshot is invalid, or belongs to
+                     a different router.
+        """
+        with open(path, 'rb') as snapshot:
+            try:
+                view = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file
+                raise SnapshotError("Snapshot is empty")
+
+        with view:
+            try:
+                magic, version, snapshot_router_id, count, _saved_at = \
+                    HEADER.unpack_from(view, 0)
+            except struct.error:
+                raise SnapshotError("Unable to read snapshot header")
+
+            if magic != SNAPSHOT_MAGIC or version not in (1, 2):
+                raise SnapshotError("Unrecognised snapshot format")
+            if snapshot_router_id != router_id:
+                raise SnapshotError("Snapshot belongs to router " +
+                                    f"{snapshot_router_id}")
+            record = RECORD if version == SNAPSHOT_VERSION else RECORD_V1
+            if len(view) != HEADER.size + count * record.size:
+                raise SnapshotError("Invalid snapshot length")
+
+            records = [record.unpack_from(view, HEADER.size + i * record.size)
+                       for i in range(count)]
+
+        if version == 1:
+            return records
+        return [(destination_key(address, length), *rest)
+                for address, length, *rest in records]
+
+
+class SnapshotError(Exception):
+    """Exception raised for invalid routing table snapshots."""
+    def __init__(self, message="Error occurred while reading the snapshot"):
+        super().__init__(message)
@@ -3,15 +3,94 @@
     MIT License. Copyright © 2025 Connor Varney, Kahu Jones
 """
 
+import collections
+import math
+
 HEADER_LENGTH = 4
 ENTRY_LENGTH = 20
+MAX_ENTRIES = 25  # Most entries in one packet, keeping it within 512 bytes
 ADDRESS_FAMILY = 2
+PARAMETER_FAMILY = 0xFFFE  # Address family of entries carrying parameters
+WHOLE_TABLE_FAMILY = 0  # Address family of a request for the whole table
 VERSION = 2
 
 
+class Prefix(collections.namedtuple('Prefix', ['address', 'length'])):
+    """
+        An IPv4 network destination, address / prefix length. Host routes
+        (/32), including routes to routers, are keyed by the plain integer
+        address instead; see destination_key.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{format_address(self.address)}/{self.length}"
+
+
+def parse_destination(text: str):
+    """
+        Parse a destination in CIDR notation, e.g. 10.1.0.0/16.
+
+        :returns: Routing table key for the destination.
+        :raises: ValueError if the destination is invalid.
+    """
+    address, _, length = text.strip().partition('/')
+    length = int(length) if length else 32
+    octets = [int(octet) for octet in address.split('.')]
+    if len(octets) != 4 or not all(0 <= o <= 255 for o in octets) \
+            or not 1 <= length <= 32:
+        raise ValueError(f"Invalid destination '{text}'")
+    address = int.from_bytes(bytes(octets), 'big')
+    return destination_key(address, length)
+
+
+def destination_key(address: int, length: int = 32):
+    """
+        Routing table key for a destination: the integer address of a host
+        route, otherwise a Prefix with its host bits cleared.
+    """
+    if length == 32:
+        return address
+    return Prefix(address & mask_of_length(length), length)
+
+
+def destination_prefix(destination):
+    """
+        :returns: (address, length) of a routing table key.
+    """
+    if isinstance(destination, Prefix):
+        return destination
+    return destination, 32
+
+
+def mask_of_length(length: int):
+    """
+        :returns: Netmask of a prefix length, as an integer.
+    """
+    return ((1 << length) - 1) << (32 - length)
+
+
+def format_address(address: int):
+    """
+        :returns: Dotted quad form of an integer IPv4 address.
+    """
+    return '.'.join(str(octet) for octet in address.to_bytes(4, 'big'))
+
+
 class PacketCommands:
     REQUEST = 1
     RESPONSE = 2
+    HELLO = 128  # Neighbour keepalive, outside the RIP command range
+
+
+class Parameters:
+    """
+        Parameters a router can carry in a RIP response, as entries with
+        address family PARAMETER_FAMILY, the parameter in the address field
+        and its value in the metric field.
+    """
+    UPDATE_INTERVAL = 1  # Longest time between the sender's updates, ms
+    HELLO_INTERVAL = 2   # Time between the sender's hellos, milliseconds
 
 
 class RIPPacket:
@@ -48,6 +127,33 @@ class RIPPacket:
 
         return packet
 
+    @staticmethod
+    def request(router_id: int, entries: list = None):
+        """
+            Construct a RIP request.
+
+            :param entries: RIPEntry elements for the destinations whose
+                            routes are wanted, or None for the whole table.
+            :returns: Bytearray of the constructed RIP packet.
+        """
+        if entries is None:
+            entries = [RIPEntry(0, 16, afi=WHOLE_TABLE_FAMILY)]
+        return RIPPacket.construct(PacketCommands.REQUEST, router_id,
+                                   entries)
+
+    @staticmethod
+    def hello(router_id: int, interval: float):
+        """
+            Construct a hello, carrying the sender's hello interval.
+
+            :param interval: Time between hellos, in seconds.
+            :returns: Bytearray of the constructed packet.
+        """
+        return RIPPacket.construct(
+            PacketCommands.HELLO, router_id,
+            [RIPEntry.parameter(Parameters.HELLO_INTERVAL,
+                                math.ceil(interval * 1000))])
+
     @staticmethod
     def parse(packet):
         """
@@ -72,44 +178,98 @@ class RIPPacket:
             raise PacketVersionError("Invalid RIP version in packet")
 
         # Verify we've received a valid command
-        if command not in [PacketCommands.REQUEST, PacketCommands.RESPONSE]:
+        if command not in [PacketCommands.REQUEST, PacketCommands.RESPONSE,
+                           PacketCommands.HELLO]:
             raise PacketCommandError("Invalid RIP command in packet")
 
-        # If the command is a request, return an empty list. The
-        # response to this request will be handled upstream.
-        if command == PacketCommands.REQUEST:
-            raise PacketCommandError  # Requests not used for this assignment
-            return PacketCommands.REQUEST, router_id, []
-
-        # Parse the entries
+        # Parse the entries. Requests list the destinations wanted, and the
+        # response to a request is handled upstream.
         entries = []
         for i in range(4, len(packet), ENTRY_LENGTH):
-            try:
-                id = int.from_bytes(packet[i + 4:i + 8], 'big')
-                metric = int.from_bytes(packet[i + 16:i + 20], 'big')
-            except IndexError:
+            if i + ENTRY_LENGTH > len(packet):
                 raise PacketParseError("Invalid packet length")
-            entries.append(RIPEntry(id, metric))
+            afi = int.from_bytes(packet[i:i + 2], 'big')
+            id = int.from_bytes(packet[i + 4:i + 8], 'big')
+            mask = int.from_bytes(packet[i + 8:i + 12], 'big')
+            metric = int.from_bytes(packet[i + 16:i + 20], 'big')
+            entry = RIPEntry(id, metric, afi, mask)
+            if afi != PARAMETER_FAMILY and entry.length is None:
+                raise PacketParseError("Invalid subnet mask in packet")
+            entries.append(entry)
 
-        return PacketCommands.RESPONSE, router_id, entries
+        return command, router_id, entries
 
 
 class RIPEntry:
     """
-        Basic structure for a RIP entry.
+        Basic structure for a RIP entry. A subnet mask of 0 marks a host
+        route, as sent by routers that only advertise router IDs, so a
+        default route (0.0.0.0/0) cannot be carried.
     """
-    def __init__(self, id, metric, afi=ADDRESS_FAMILY):
+    def __init__(self, id, metric, afi=ADDRESS_FAMILY, mask=0):
         """
             Initialize a RIP entry.
         """
         self.id = id
         self.metric = metric
         self.afi = afi
+        self.mask = mask
+
+    @classmethod
+    def for_destination(cls, destination, metric):
+        """
+            Build the entry advertising a routing table key.
+        """
+        address, length = destination_prefix(destination)
+        mask = 0 if length == 32 else mask_of_length(length)
+        return cls(address, metric, mask=mask)
+
+    @classmethod
+    def parameter(cls, parameter, value):
+        """
+            Build an entry carrying a parameter (see Parameters).
+        """
+        return cls(parameter, value, afi=PARAMETER_FAMILY)
+
+    @property
+    def is_parameter(self):
+        """
+            True if the entry carries a parameter rather than a route.
+        """
+        return self.afi == PARAMETER_FAMILY
+
+    @property
+    def is_whole_table(self):
+        """
+            True if the entry of a request asks for the whole table.
+        """
+        return self.afi == WHOLE_TABLE_FAMILY and self.metric == 16
+
+    @property
+    def length(self):
+        """
+            Prefix length of the entry, or None if the mask is not a valid
+            netmask.
+        """
+        if self.mask == 0:
+            return 32
+        length = bin(self.mask).count('1')
+        return length if self.mask == mask_of_length(length) else None
+
+    @property
+    def destination(self):
+        """
+            Routing table key of the destination the entry advertises.
+        """
+        return destination_key(self.id, self.length)
 
     def __str__(self):
         """
             String representation of the RIP entry.
         """
+        if self.mask:
+            return f"RIPEntry(prefix={self.destination}, " \
+                   f"metric={self.metric}, afi={self.afi})"
         return f"RIPEntry(id={self.id}, metric={self.metric}, " \
                f"afi={self.afi})"
 
@@ -130,7 +290,8 @@ class RIPEntry:
         packet[2] = 0
         packet[3] = 0
         packet[4:8] = self.id.to_bytes(4, 'big')
-        packet[8:16] = bytes([0] * 8)
+        packet[8:12] = self.mask.to_bytes(4, 'big')
+        packet[12:16] = bytes([0] * 4)
         packet[16:20] = self.metric.to_bytes(4, 'big')
 
         return packet
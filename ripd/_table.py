@@ -4,15 +4,26 @@
     MIT License. Copyright © 2025 Connor Varney, Kahu Jones
 """
 
+import collections
 import time
 from tabulate import tabulate
-from ._structures import RIPEntry, RIPPacket
+from ._structures import (RIPEntry, RIPPacket, MAX_ENTRIES, Prefix,
+                          destination_key, destination_prefix,
+                          mask_of_length)
+from ._events import RouteEvent, RouteEventPublisher, RouteEventTypes
+from ._trie import PrefixTrie
+
+# Ways of stopping a route being advertised back to the peer it was
+# learned from: not at all, by leaving it out (simple split horizon), or by
+# advertising it as unreachable (split horizon with poisoned reverse)
+LOOP_PREVENTION_MODES = ('none', 'split_horizon', 'poisoned_reverse')
 
 
 class RouteEntry:
     """
         Represents a single entry in the routing table.
-        Stores the destination address, next hop, metric, and timeout.
+        Stores the destination address, next hop, metric, and timeout. The
+        destination is a router ID (or other host address), or a Prefix.
     """
     def __init__(self, destination_id: int, next_hop_id: int,
                  metric: int, timeout: int,
@@ -22,6 +33,19 @@ class RouteEntry:
         self.metric = metric
         self.timeout = timeout
         self.garbage_collection_timer = garbage_collection_timer
+        # Set on routes restored from a snapshot, which are used for
+        # forwarding but not advertised until their next hop confirms them
+        self.revalidate = False
+
+        # Flap damping state: penalty as of penalty_time, and whether the
+        # route is suppressed
+        self.penalty = 0.0
+        self.penalty_time = 0.0
+        self.suppressed = False
+
+        # Time until which updates from other next hops are ignored, after
+        # the route became unreachable
+        self.hold_down_until = 0.0
 
     def as_list(self):
         """
@@ -29,34 +53,65 @@ class RouteEntry:
         """
         timeout = max(0, int(time.time() - self.timeout))
 
-        return [self.destination_id, self.next_hop_id,
-                self.metric, timeout]
+        destination = str(self.destination_id) \
+            if isinstance(self.destination_id, Prefix) \
+            else self.destination_id
+        return [destination, self.next_hop_id, self.metric, timeout]
 
     def as_packet(self):
         """
             Convert the RouteEntry to a RipEntry for packet transmission.
         """
-        return RIPEntry(
-            id=self.destination_id,
-            metric=self.metric
-        )
+        return RIPEntry.for_destination(self.destination_id, self.metric)
 
 
 class RouteTable:
     """
         Represents the full routing table.
         Contains a list of RouteEntry objects.
-        Handles adding, removing, and retrieving routes.
+        Handles adding, removing, and retrieving routes, and publishes a
+        RouteEvent through self.events for every change. Valid routes are
+        also indexed by prefix, for longest prefix match lookups.
     """
     def __init__(self, logger,
                  router_id: int, timeout: int = 30,
-                 garbage_collection_time: int = 120):
+                 garbage_collection_time: int = 120,
+                 networks: list = ()):
+        """
+            :param networks: Destinations (prefixes or host addresses)
+                             directly attached to this router, advertised
+                             with metric 0.
+        """
         self._timeout = timeout
         self._garbage_collection_time = garbage_collection_time + timeout
+        self._peer_timeouts = {}  # Next hop ID -> lengthened route timeout
         self._router_id = router_id
+        self._networks = list(networks)
         self.routes = {}  # Dict of RouteEntry instances
+        self._index = PrefixTrie()  # Prefix -> destination of valid routes
+        self._by_next_hop = {}  # Next hop ID -> set of destinations
+
+        # Summary prefixes last advertised to each peer, and summaries
+        # since withdrawn, which are poisoned until the peer forgets them
+        self._summaries = {}
+        self._withdrawn_summaries = {}
+
+        # Flap damping settings (None when disabled), and the damping state
+        # of flapping routes that have been removed from the table, so a
+        # route cannot escape its penalty by being garbage collected
+        self._damping = None
+        self._flap_history = {}  # Destination -> (penalty, time, suppressed)
+        self._suppressed = set()  # Destinations of suppressed routes
+
+        # Loop prevention mode, and hold-down time in seconds (0 for none)
+        self._loop_prevention = 'poisoned_reverse'
+        self._hold_down = 0
+
+        # Optional LoopMonitor, told how late route timers fire
+        self._monitor = None
 
         self._logger = logger
+        self.events = RouteEventPublisher(logger)
         self._logger.debug("Routing table initialized.")
 
     def __str__(self):
@@ -69,7 +124,8 @@ class RouteTable:
             entries.append(entry.as_list())
 
             # Based on the timeout time, calculate the garbage collection time
-            garbage_timer = int(time.time() - entry.timeout - self._timeout)
+            garbage_timer = int(time.time() - entry.timeout -
+                                self._timeout_of(entry))
             garbage_timer = max(0, garbage_timer)  # Ensure positive numbers
             entries[-1].append(garbage_timer)
 
@@ -81,14 +137,98 @@ class RouteTable:
     def add_route(self, destination_id, next_hop_id, metric,
                   timeout=None, garbage_collection_timer=False):
         """
-            Add a new route to the routing table.
+            Add a new route to the routing table, replacing any existing
+            route to the same destination.
         """
         timeout = time.time() if timeout is None else timeout
         entry = RouteEntry(destination_id, next_hop_id, metric,
                            timeout, garbage_collection_timer)
+        previous = self.routes.get(destination_id)
         self.routes[destination_id] = entry
+        if previous is not None:
+            self._unindex_next_hop(previous)
+        self._by_next_hop.setdefault(next_hop_id, set()).add(destination_id)
+
+        # Damping state belongs to the destination, whatever the path
+        state = self._flap_history.pop(destination_id, None)
+        if previous is not None:
+            state = (previous.penalty, previous.penalty_time,
+                     previous.suppressed)
+        if state is not None:
+            entry.penalty, entry.penalty_time, entry.suppressed = state
+            if entry.suppressed:
+                self._suppressed.add(destination_id)
 
-    def remove_route(self, destination_id):
+        # Publish the change, if there was one
+        if previous is None:
+            self._publish(RouteEventTypes.ADDED, entry)
+        elif previous.next_hop_id != next_hop_id:
+            self._publish(RouteEventTypes.NEXT_HOP_CHANGED, entry, previous)
+        elif previous.metric != metric:
+            self._publish(RouteEventTypes.METRIC_CHANGED, entry, previous)
+
+    def update_route(self, destination_id, metric):
+        """
+            Update the metric of an existing route in place, refreshing its
+            timeout. A metric of 16 starts the garbage collection timer,
+            unless the route is already unreachable.
+        """
+        entry = self.routes[destination_id]
+        old_metric = entry.metric
+
+        # Any update from the next hop confirms a restored route, even one
+        # withdrawing it, which is then advertised as unreachable
+        entry.revalidate = False
+
+        if metric >= 16:
+            # If the metric is already 16, ignore this as to not restart
+            # the garbage collection timer
+            if old_metric == 16:
+                return
+
+            # Otherwise, set the timeout of the entry to trigger the garbage
+            # collection timer
+            entry.timeout = time.time() - self._timeout_of(entry)
+        else:
+            # A valid metric uses the normal timeout, and cancels any
+            # garbage collection in progress
+            entry.timeout = time.time()
+            entry.garbage_collection_timer = False
+
+        entry.metric = metric
+        if metric != old_metric:
+            self._publish(RouteEventTypes.METRIC_CHANGED, entry,
+                          old_metric=old_metric)
+
+    def refresh_routes(self, next_hop_id, destination_ids):
+        """
+            Refresh the timeout of the given routes, where they are still
+            valid routes through next_hop_id. Used when a peer repeats an
+            update that has already been applied.
+        """
+        now = time.time()
+        for destination_id in destination_ids:
+            entry = self.routes.get(destination_id)
+            if entry is not None and entry.next_hop_id == next_hop_id \
+                    and entry.metric < 16:
+                entry.timeout = now
+                entry.revalidate = False
+
+    def restore_route(self, destination_id, next_hop_id, metric,
+                      grace: float):
+        """
+            Add a route restored from a snapshot. The route is used for
+            forwarding, but marked for revalidation and left out of
+            advertisements until its next hop confirms it. Unless confirmed,
+            it times out grace seconds from now, however old it was when
+            the snapshot was taken.
+        """
+        self.add_route(destination_id, next_hop_id, metric,
+                       time.time() - self.peer_timeout(next_hop_id) + grace)
+        self.routes[destination_id].revalidate = True
+
+    def remove_route(self, destination_id,
+                     event_type=RouteEventTypes.REMOVED):
         """
             Remove a route from the routing table.
             If the route does not exist, do nothing.
@@ -97,18 +237,45 @@ class RouteTable:
         """
         # Find the entry with the matching destination and remove it
         try:
-            self.routes.pop(destination_id)
-            return True
+            entry = self.routes.pop(destination_id)
         except KeyError:
             self._logger.debug(f"Requested deletion of {destination_id}," +
                                " but route does not exist.")
             return False
 
+        self._unindex_next_hop(entry)
+        self._suppressed.discard(destination_id)
+        if entry.penalty:
+            self._flap_history[destination_id] = \
+                (entry.penalty, entry.penalty_time, entry.suppressed)
+
+        self._publish(event_type, entry)
+        return True
+
+    def _unindex_next_hop(self, entry):
+        """
+            Remove an entry from the index of destinations by next hop.
+        """
+        destinations = self._by_next_hop[entry.next_hop_id]
+        destinations.discard(entry.destination_id)
+        if not destinations:
+            del self._by_next_hop[entry.next_hop_id]
+
+    def routes_via(self, next_hop_id):
+        """
+            Routes through a next hop, valid or not.
+
+            :returns: List of RouteEntry objects.
+        """
+        return [self.routes[destination_id] for destination_id
+                in self._by_next_hop.get(next_hop_id, ())]
+
     def remove_all(self):
         """
             Remove all routes from the routing table.
         """
-        self.routes.clear()
+        for destination_id in list(self.routes):
+            self.remove_route(destination_id)
 
     def get_entry(self, destination_id):
         """
@@ -122,61 +289,511 @@ class RouteTable:
                                " but route does not exist.")
             return
 
+    def lookup(self, address: int):
+        """
+            Longest prefix match: the valid route used to forward traffic to
+            an address.
+
+            :returns: RouteEntry, or None if no valid route covers address.
+        """
+        destination_id = self._index.lookup(address)
+        return None if destination_id is None \
+            else self.routes[destination_id]
+
+    def set_networks(self, networks):
+        """
+            Change the destinations directly attached to this router.
+        """
+        self._networks = list(networks)
+
     def get_packet(self, destination_router_id):
         """
             Convert the routing table to a RipPacket for transmission.
             Returns a RipPacket object containing all routes.
         """
-        # Always include a route to this router with metric 0
+        # Create and return the packet
+        return RIPPacket.construct(
+            command=2, router_id=self._router_id,
+            entries=self._get_entries(destination_router_id))
+
+    def get_packets(self, destination_router_id, summarise=False,
+                    parameters=()):
+        """
+            Convert the routing table to RipPackets for transmission, each
+            holding at most MAX_ENTRIES entries so it fits in one datagram.
+
+            :param summarise: Merge adjacent destinations with the same
+                              advertised metric into summary prefixes.
+            :param parameters: Parameter entries to carry in every packet.
+            :returns: List of RipPacket objects containing all routes.
+        """
+        entries = self._get_entries(destination_router_id)
+        if summarise:
+            entries = self._get_summary_entries(destination_router_id,
+                                                entries)
+        parameters = list(parameters)
+        routes = MAX_ENTRIES - len(parameters)
+        return [RIPPacket.construct(command=2, router_id=self._router_id,
+                                    entries=parameters +
+                                    entries[i:i + routes])
+                for i in range(0, len(entries), routes)]
+
+    def get_withdrawal_packets(self):
+        """
+            Convert the routing table to RipPackets advertising every
+            destination, including this router and its networks, as
+            unreachable. Sent to every peer on a graceful shutdown.
+
+            :returns: List of RipPacket objects containing all routes.
+        """
+        destinations = [self._router_id, *self._networks, *self.routes]
+        entries = [RIPEntry.for_destination(destination, 16)
+                   for destination in destinations]
+        return [RIPPacket.construct(command=2, router_id=self._router_id,
+                                    entries=entries[i:i + MAX_ENTRIES])
+                for i in range(0, len(entries), MAX_ENTRIES)]
+
+    def get_metric(self, destination_id):
+        """
+            Metric this router would advertise for a destination, ignoring
+            loop prevention: 0 for itself and its networks, and 16 for
+            destinations it has no valid route to.
+        """
+        if destination_id == self._router_id or \
+                destination_id in self._networks:
+            return 0
+        entry = self.routes.get(destination_id)
+        if entry is None or entry.suppressed or entry.revalidate:
+            return 16
+        return entry.metric
+
+    def _get_entries(self, destination_router_id):
+        """
+            Build the RIPEntry objects to advertise to a peer.
+        """
+        # Always include a route to this router and its networks with
+        # metric 0
         entries_to_transmit = [RIPEntry(id=self._router_id, metric=0)]
+        entries_to_transmit += [RIPEntry.for_destination(network, 0)
+                                for network in self._networks]
 
-        # Append remaining entries, poisoning the metric where appropriate
+        # Append remaining entries, applying the loop prevention mode to
+        # routes through the peer, and withdrawing suppressed routes.
+        # Restored routes are not advertised until they are confirmed.
         for entry in self.routes.values():
+            if entry.revalidate:
+                continue
+            metric = 16 if entry.suppressed else entry.metric
             if entry.next_hop_id == destination_router_id:
-                metric = 16
+                if self._loop_prevention == 'split_horizon':
+                    continue
+                if self._loop_prevention == 'poisoned_reverse':
+                    metric = 16
+
+            entries_to_transmit.append(
+                RIPEntry.for_destination(entry.destination_id, metric))
+
+        return entries_to_transmit
+
+    def _get_summary_entries(self, destination_router_id, entries):
+        """
+            Summarise the entries advertised to a peer. Summaries advertised
+            before that no longer apply are advertised with metric 16 until
+            the peer would have garbage collected them.
+        """
+        metrics = {destination_prefix(entry.destination): entry.metric
+                   for entry in entries}
+        summarised = self.summarise(metrics)
+        summaries = set(summarised) - set(metrics)
+
+        now = time.time()
+        withdrawn = self._withdrawn_summaries.setdefault(
+            destination_router_id, {})
+        for prefix in self._summaries.get(destination_router_id, set()) - \
+                summaries:
+            withdrawn[prefix] = now + self._garbage_collection_time
+        for prefix, expires in list(withdrawn.items()):
+            if prefix in summarised or expires <= now:
+                del withdrawn[prefix]
             else:
-                metric = entry.metric
+                summarised[prefix] = 16
+        self._summaries[destination_router_id] = summaries
 
-            entries_to_transmit.append(RIPEntry(id=entry.destination_id,
-                                                metric=metric))
+        return [RIPEntry.for_destination(destination_key(*prefix), metric)
+                for prefix, metric in sorted(summarised.items())]
 
-        # Create and return the packet
-        return RIPPacket.construct(command=2, router_id=self._router_id,
-                                   entries=entries_to_transmit)
+    @staticmethod
+    def summarise(metrics):
+        """
+            Losslessly summarise advertised routes: two sibling prefixes with
+            the same metric are replaced by their parent prefix, and a prefix
+            with the same metric as the nearest prefix covering it is
+            dropped. A longest prefix
+            match on the result gives the same metric for every address.
+
+            :param metrics: Dictionary of (address, prefix length) to metric.
+            :returns: Summarised dictionary in the same format.
+        """
+        levels = collections.defaultdict(dict)  # Length -> {address: metric}
+        for (address, length), metric in metrics.items():
+            levels[length][address] = metric
+
+        # Merge from the longest prefixes up, stopping at /1 since a default
+        # route cannot be advertised
+        for length in range(32, 1, -1):
+            level, parents = levels[length], levels[length - 1]
+            for address in sorted(level):
+                if address not in level:
+                    continue  # Already merged with its sibling
+                metric = level[address]
+                parent = address & mask_of_length(length - 1)
+                sibling = address ^ (1 << (32 - length))
+
+                if parent not in parents and level.get(sibling) == metric:
+                    del level[address], level[sibling]
+                    parents[parent] = metric
+
+        # Drop prefixes with the same metric as the nearest prefix covering
+        # them, which a longest prefix match falls back to
+        summarised = {}
+        for length, level in levels.items():
+            for address, metric in level.items():
+                covering = None
+                for cover in range(length - 1, 0, -1):
+                    covering = levels.get(cover, {}).get(
+                        address & mask_of_length(cover))
+                    if covering is not None:
+                        break
+                if covering != metric:
+                    summarised[(address, length)] = metric
+        return summarised
+
+    def process_response(self, source_router_id, link_metric, entries):
+        """
+            Apply the entries of a RIP response to the routing table.
+
+            :param source_router_id: ID of the peer that sent the response.
+            :param link_metric: Metric of the link to that peer.
+            :param entries: List of RIPEntry objects from the response.
+            :returns: True if the outcome depended only on the entries and
+                      the table, so applying the same entries again leaves
+                      the table unchanged until it next changes. False if
+                      any entry's outcome also depended on the time, such
+                      as a route ignored while it is held down.
+        """
+        cacheable = True
+        for entry in entries:
+            if entry.is_parameter:
+                continue
+            destination_id = entry.destination
+
+            # Ignore the entry if it is for this router or its networks
+            if destination_id == self._router_id or \
+                    destination_id in self._networks:
+                continue
+
+            # Calculate the metric of this entry
+            new_metric = min(entry.metric + link_metric, 16)
+            current = self.routes.get(destination_id)
+
+            if current is None:
+                if new_metric < 16:
+                    # New route, not in table yet and it's valid
+                    self.add_route(destination_id=destination_id,
+                                   next_hop_id=source_router_id,
+                                   metric=new_metric)
+
+            elif current.next_hop_id == source_router_id:
+                # This is an update from the same next hop — must always
+                # accept changes
+                self.update_route(destination_id, new_metric)
+
+            elif new_metric < current.metric:
+                # Better route (lower metric) from a different next hop,
+                # unless the route is unreachable and held down. A route
+                # its next hop has restored is no longer held down.
+                if current.metric >= 16 and \
+                        time.time() < current.hold_down_until:
+                    cacheable = False
+                    continue
+                self.add_route(destination_id=destination_id,
+                               next_hop_id=source_router_id,
+                               metric=new_metric)
+
+        return cacheable
+
+    def set_timers(self, timeout, garbage_collection_time):
+        """
+            Change the route timeout and garbage collection time in place.
+        """
+        self._timeout = timeout
+        self._garbage_collection_time = garbage_collection_time + timeout
+
+    def set_peer_timeout(self, next_hop_id, timeout=None):
+        """
+            Lengthen the timeout of routes through a next hop, for a peer
+            that has advertised a longer update interval than ours.
+
+            :param timeout: Route timeout in seconds, or None to use the
+                            normal timeout again.
+        """
+        if timeout is None or timeout <= self._timeout:
+            self._peer_timeouts.pop(next_hop_id, None)
+        else:
+            self._peer_timeouts[next_hop_id] = timeout
+
+    def peer_timeout(self, next_hop_id):
+        """
+            Route timeout of routes through a next hop, in seconds.
+        """
+        return self._peer_timeouts.get(next_hop_id, self._timeout)
+
+    def _timeout_of(self, entry):
+        """
+            Route timeout of an entry, which depends on its next hop.
+        """
+        return self.peer_timeout(entry.next_hop_id)
+
+    def set_monitor(self, monitor):
+        """
+            Report the slippage of route timeouts and garbage collection to
+            a LoopMonitor, or to nothing if monitor is None.
+        """
+        self._monitor = monitor
+
+    def set_loop_prevention(self, mode: str, hold_down: float = 0):
+        """
+            Change how routes are advertised to the peer they were learned
+            from, and the hold-down time.
+
+            :param mode: One of LOOP_PREVENTION_MODES.
+            :param hold_down: Seconds after a route becomes unreachable
+                              during which routes to the same destination
+                              from other next hops are ignored, while it
+                              stays unreachable, or 0.
+            :raises: ValueError if the mode is unknown.
+        """
+        if mode not in LOOP_PREVENTION_MODES:
+            raise ValueError(f"Unknown loop prevention mode '{mode}'")
+        self._loop_prevention = mode
+        self._hold_down = hold_down
+
+    def set_damping(self, penalty=1000, half_life=30, suppress=2000,
+                    reuse=750, max_suppress=120):
+        """
+            Enable route flap damping. Each time a valid route becomes
+            unreachable it gains penalty, and each change of metric or next
+            hop gains half of it. The penalty decays exponentially, and while
+            it is above suppress the route is advertised as unreachable and
+            not used for forwarding, until it decays below reuse.
+
+            :param half_life: Seconds for the penalty to halve.
+            :param max_suppress: Most seconds a route can stay suppressed
+                                 after its last flap.
+        """
+        self._damping = {'penalty': penalty, 'half_life': half_life,
+                         'suppress': suppress, 'reuse': reuse,
+                         'ceiling': reuse * 2 ** (max_suppress / half_life)}
+
+    def disable_damping(self):
+        """
+            Disable route flap damping, reusing every suppressed route.
+        """
+        self._damping = None
+        self._flap_history.clear()
+        self._suppressed.clear()
+        for entry in list(self.routes.values()):
+            entry.penalty = 0.0
+            if entry.suppressed:
+                entry.suppressed = False
+                self._publish(RouteEventTypes.REUSED, entry)
+
+    def _decay_penalty(self, penalty, penalty_time, now):
+        """
+            :returns: Penalty decayed from penalty_time to now.
+        """
+        return penalty * 0.5 ** ((now - penalty_time) /
+                                 self._damping['half_life'])
+
+    def _penalise(self, entry, penalty):
+        """
+            Add a flap penalty to a route, suppressing it if the penalty is
+            over the suppress threshold.
+        """
+        now = time.time()
+        entry.penalty = min(
+            self._decay_penalty(entry.penalty, entry.penalty_time, now) +
+            penalty, self._damping['ceiling'])
+        entry.penalty_time = now
+
+        if not entry.suppressed and \
+                entry.penalty >= self._damping['suppress']:
+            self._logger.info(f"Route to {entry.destination_id} is " +
+                              "flapping, suppressing it.")
+            entry.suppressed = True
+            self._suppressed.add(entry.destination_id)
+            self._publish(RouteEventTypes.SUPPRESSED, entry)
+
+    def _reuse_routes(self):
+        """
+            Reuse suppressed routes whose penalty has decayed below the
+            reuse threshold, and forget the penalties of removed routes that
+            have decayed away. Only suppressed routes are checked, as the
+            penalties of other routes are decayed when they next flap.
+
+            :returns: True if any route was reused.
+        """
+        now = time.time()
+        reuse = self._damping['reuse']
+        reused = False
+
+        for destination_id in list(self._suppressed):
+            entry = self.routes[destination_id]
+            if self._decay_penalty(entry.penalty, entry.penalty_time,
+                                   now) < reuse:
+                self._logger.info(f"Route to {destination_id} is " +
+                                  "stable, reusing it.")
+                entry.suppressed = False
+                self._suppressed.discard(destination_id)
+                self._publish(RouteEventTypes.REUSED, entry)
+                reused = True
+
+        for destination_id, (penalty, penalty_time, suppressed) in \
+                list(self._flap_history.items()):
+            if self._decay_penalty(penalty, penalty_time, now) < reuse / 2:
+                del self._flap_history[destination_id]
+
+        return reused
+
+    def adjust_next_hop_metric(self, next_hop_id, delta):
+        """
+            Add delta to the metric of every valid route through a next hop,
+            after the metric of the link to it has changed. Routes that reach
+            16 become unreachable and start garbage collection.
+
+            :returns: Number of routes changed.
+        """
+        changed = 0
+        for entry in self.routes_via(next_hop_id):
+            if entry.metric >= 16:
+                continue
+
+            metric = min(entry.metric + delta, 16)
+            if metric >= 16:
+                self.update_route(entry.destination_id, 16)
+            else:
+                old_metric = entry.metric
+                entry.metric = metric
+                self._publish(RouteEventTypes.METRIC_CHANGED, entry,
+                              old_metric=old_metric)
+            changed += 1
+
+        return changed
+
+    def invalidate_next_hop(self, next_hop_id):
+        """
+            Mark every valid route through a next hop as unreachable, and
+            start garbage collection for them.
+
+            :returns: Number of routes invalidated.
+        """
+        invalidated = 0
+        for entry in self.routes_via(next_hop_id):
+            if entry.metric < 16:
+                self.update_route(entry.destination_id, 16)
+                invalidated += 1
+
+        return invalidated
 
     def check_for_timeouts(self):
         """
             Check for timed out entries in the routing table.
-            Remove any entries that have timed out.
+            Remove any entries that have timed out, and reuse damped routes
+            that have stopped flapping.
 
-            :returns: True if entries have timed out, false otherwise
+            :returns: True if entries have timed out or been reused, false
+                      otherwise
         """
         # Check each entry for timeouts
         to_remove = []
         timed_out = False
+        now = time.time()
         for router_id, entry in self.routes.items():
+            timeout = self._timeout_of(entry)
+
             # If the entry has been in garbage collection for too long,
             # remove it from the table
-            if time.time() - entry.timeout > self._garbage_collection_time:
+            collect_at = entry.timeout + \
+                self._garbage_collection_time - self._timeout + timeout
+            if now > collect_at:
                 self._logger.debug("Garbage collection for router " +
                                    f"{router_id} expired, deleting entry.")
                 to_remove.append(router_id)
+                if self._monitor is not None:
+                    self._monitor.fired('garbage_collection', collect_at, now)
 
             # If the entry has timed out, start garbage collection timer
             # and set metric to 16
-            if time.time() - entry.timeout >= self._timeout:
+            if now - entry.timeout >= timeout:
                 if entry.garbage_collection_timer:
                     # If the entry is already in garbage collection, ignore
                     continue
 
                 self._logger.debug(f"Entry for router {router_id} timed out.")
-                self.routes[router_id].metric = 16
-                self.routes[router_id].garbage_collection_timer = True
-                timed_out = True
+                if self._monitor is not None:
+                    self._monitor.fired('route_timeout',
+                                        entry.timeout + timeout, now)
+                old_metric = entry.metric
+                entry.metric = 16
+                entry.garbage_collection_timer = True
+                self._publish(RouteEventTypes.TIMED_OUT, entry,
+                              old_metric=old_metric)
+
+                # Suppressed routes are already advertised as unreachable
+                timed_out = timed_out or not entry.suppressed
 
         # Remove any entries that have reached garbage collection time
         for router_id in to_remove:
-            self.remove_route(router_id)
+            self.remove_route(router_id, RouteEventTypes.GARBAGE_COLLECTED)
+
+        # Reuse damped routes that have settled
+        if self._damping is not None and self._reuse_routes():
+            timed_out = True
 
-        # Return true if a triggered update is required for timed out entries
+        # Return true if a triggered update is required for timed out or
+        # reused entries
         return timed_out
+
+    def _publish(self, event_type, entry, previous=None, old_metric=None):
+        """
+            Publish a RouteEvent describing a change to entry, after
+            updating the prefix index. A route that has become unreachable
+            is held down, and changes that are flaps are penalised when flap
+            damping is enabled.
+        """
+        address, length = destination_prefix(entry.destination_id)
+        if entry.metric < 16 and not entry.suppressed and event_type not in \
+                (RouteEventTypes.REMOVED, RouteEventTypes.GARBAGE_COLLECTED):
+            self._index.insert(address, length, entry.destination_id)
+        else:
+            self._index.remove(address, length)
+
+        if previous is not None:
+            old_metric = previous.metric
+        old_next_hop_id = None if previous is None else previous.next_hop_id
+        self.events.publish(RouteEvent(event_type, entry.destination_id,
+                                       entry.next_hop_id, entry.metric,
+                                       old_next_hop_id, old_metric))
+
+        if old_metric is None or old_metric >= 16 or event_type not in \
+                (RouteEventTypes.METRIC_CHANGED, RouteEventTypes.TIMED_OUT,
+                 RouteEventTypes.NEXT_HOP_CHANGED):
+            return
+        if entry.metric >= 16 and self._hold_down:
+            entry.hold_down_until = time.time() + self._hold_down
+        if self._damping is None:
+            return
+        if entry.metric >= 16:
+            self._penalise(entry, self._damping['penalty'])
+        else:
+            self._penalise(entry, self._damping['penalty'] / 2)
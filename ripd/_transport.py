@@ -0,0 +1,525 @@
+"""
+    RIPDaemon - transports carrying packets between routers. The interface
+    sends and receives through one of these backends:
+
+    - udp: loopback UDP sockets, one per port (the default).
+    - inprocess: queues, for routers running in the same process.
+    - shm: shared memory ring buffers, for routers in different processes on
+      the same host.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+from socket import (socket, AF_INET, SOCK_DGRAM, SOL_SOCKET, SO_RCVBUF,
+                    MSG_TRUNC, CMSG_SPACE, error)
+import abc
+import collections
+import fcntl
+import os
+import select
+import socket as socket_module
+import struct
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import shared_memory, resource_tracker
+
+RECEIVE_SIZE = 512  # Bytes read per incoming datagram
+RING_CAPACITY = 1 << 20  # Bytes of packet data per shared memory ring
+
+# Socket option adding the socket's kernel drop counter to every received
+# datagram. Linux only, and not exported by every Python build.
+SO_RXQ_OVFL = getattr(socket_module, 'SO_RXQ_OVFL',
+                      40 if sys.platform.startswith('linux') else None)
+DROP_COUNTER = struct.Struct('=I')
+
+
+class Transport(abc.ABC):
+    """
+        Base class for transports. Ports identify the endpoints of each
+        router, as in the configuration files.
+    """
+    @abc.abstractmethod
+    def bind(self, port: int, receive_buffer: int = None):
+        """
+            Start receiving packets sent to a port.
+
+            :param receive_buffer: Bytes of buffering for packets waiting to
+                                   be read, or None for the default.
+            :raises: OSError if the port cannot be bound.
+        """
+
+    @abc.abstractmethod
+    def unbind(self, port: int):
+        """
+            Stop receiving packets sent to a port.
+        """
+
+    @abc.abstractmethod
+    def send(self, packet, port: int):
+        """
+            Send a packet to a port. Packets to unbound ports are dropped.
+
+            :raises: OSError if the packet cannot be sent.
+        """
+
+    def send_batch(self, packets):
+        """
+            Send a batch of packets in one pass. A failed packet does not
+            stop the rest of the batch.
+
+            :param packets: List of (packet, port) tuples.
+            :returns: List of (port, OSError) tuples for failed packets.
+        """
+        failures = []
+        for packet, port in packets:
+            try:
+                self.send(packet, port)
+            except OSError as e:
+                failures.append((port, e))
+        return failures
+
+    @abc.abstractmethod
+    def poll(self, timeout: int):
+        """
+            Wait for incoming packets.
+
+            :param timeout: Maximum time to wait, in milliseconds.
+            :returns: List of (data, address) tuples.
+        """
+
+    @abc.abstractmethod
+    def close(self):
+        """
+            Unbind every port and release all resources.
+        """
+
+    def port_stats(self):
+        """
+            Receive statistics of each bound port.
+
+            :returns: Dictionary of port to a dictionary of counters.
+        """
+        return {}
+
+
+class UdpTransport(Transport):
+    """
+        Transport over UDP sockets, one per incoming port. Outgoing packets
+        use one non-blocking socket connected to each peer port, which skips
+        the per-send destination lookup and reports ICMP port unreachable
+        errors as ConnectionRefusedError.
+    """
+    def __init__(self, logger, bind_address: str = "127.0.0.1"):
+        self._logger = logger
+        self._bind = bind_address
+        self._poller = select.poll()
+        self._incoming_sockets = {}  # File descriptor -> socket
+        self._outgoing_sockets = {}  # Peer port -> connected socket
+        self._stats = {}             # Port -> receive counters
+
+    def bind(self, port, receive_buffer=None):
+        # Create the socket
+        self._logger.debug(f"Creating socket on port {port}")
+        incoming_socket = socket(AF_INET, SOCK_DGRAM)
+        incoming_socket.setblocking(1)
+        incoming_socket.settimeout(1)
+        if receive_buffer:
+            incoming_socket.setsockopt(SOL_SOCKET, SO_RCVBUF, receive_buffer)
+
+        # Ask the kernel to report datagrams dropped on a full buffer
+        drop_counting = False
+        if SO_RXQ_OVFL is not None:
+            try:
+                incoming_socket.setsockopt(SOL_SOCKET, SO_RXQ_OVFL, 1)
+                drop_counting = True
+            except error:
+                pass
+
+        # These are servers - bind sockets to ports
+        try:
+            self._logger.debug(f"Binding to {self._bind}:{port}")
+            incoming_socket.bind((self._bind, port))
+        except error:
+            incoming_socket.close()
+            raise
+
+        self._poller.register(incoming_socket, select.POLLIN)
+        self._incoming_sockets[incoming_socket.fileno()] = incoming_socket
+        self._stats[port] = {
+            'received': 0, 'truncated': 0,
+            'kernel_drops': 0 if drop_counting else None,
+            'receive_buffer': incoming_socket.getsockopt(SOL_SOCKET,
+                                                         SO_RCVBUF)}
+
+    def unbind(self, port):
+        for fd, incoming_socket in self._incoming_sockets.items():
+            if incoming_socket.getsockname()[1] != port:
+                continue
+
+            self._logger.debug(f"Unbinding from {self._bind}:{port}")
+            self._poller.unregister(incoming_socket)
+            incoming_socket.close()
+            del self._incoming_sockets[fd]
+            del self._stats[port]
+            return
+
+    def send(self, packet, port):
+        outgoing_socket = self._outgoing_sockets.get(port)
+        if outgoing_socket is None:
+            outgoing_socket = socket(AF_INET, SOCK_DGRAM)
+            try:
+                outgoing_socket.setblocking(0)
+                outgoing_socket.connect((self._bind, port))
+            except OSError:
+                outgoing_socket.close()
+                raise
+            self._outgoing_sockets[port] = outgoing_socket
+
+        outgoing_socket.send(packet)
+
+    def poll(self, timeout):
+        received_packets = []
+        for fd, event in self._poller.poll(timeout):
+            # Skip anything other than data to read
+            if not (event & select.POLLIN):
+                continue
+
+            incoming_socket = self._incoming_sockets.get(fd)
+            if incoming_socket is None:
+                continue
+
+            port = incoming_socket.getsockname()[1]
+            self._logger.debug(f'Recieved packet on port {port}')
+            packet = self._receive(incoming_socket, self._stats[port])
+            if packet is not None:
+                received_packets.append(packet)
+
+        return received_packets
+
+    def _receive(self, incoming_socket, stats):
+        """
+            Read one datagram, counting truncated datagrams and datagrams
+            the kernel dropped because the receive buffer was full.
+
+            :returns: (data, address) tuple, or None if it was truncated.
+        """
+        data, ancillary, flags, address = incoming_socket.recvmsg(
+            RECEIVE_SIZE, CMSG_SPACE(DROP_COUNTER.size))
+        stats['received'] += 1
+
+        for level, kind, value in ancillary:
+            if level == SOL_SOCKET and kind == SO_RXQ_OVFL:
+                drops, = DROP_COUNTER.unpack(value[:DROP_COUNTER.size])
+                if drops != stats['kernel_drops']:
+                    self._logger.warning(
+                        f"Kernel dropped {drops - stats['kernel_drops']} " +
+                        f"packets on port {incoming_socket.getsockname()[1]}" +
+                        ", receive buffer full.")
+                    stats['kernel_drops'] = drops
+
+        # Datagrams larger than RECEIVE_SIZE cannot be valid RIP packets
+        if flags & MSG_TRUNC:
+            stats['truncated'] += 1
+            self._logger.warning("Dropped truncated datagram on port " +
+                                 f"{incoming_socket.getsockname()[1]}.")
+            return None
+
+        return data, address
+
+    def port_stats(self):
+        return {port: dict(stats) for port, stats in self._stats.items()}
+
+    def close(self):
+        for incoming_socket in self._incoming_sockets.values():
+            incoming_socket.close()
+        self._incoming_sockets.clear()
+        self._stats.clear()
+        for outgoing_socket in self._outgoing_sockets.values():
+            outgoing_socket.close()
+        self._outgoing_sockets.clear()
+
+
+class InProcessHub:
+    """
+        Registry of the in-process transports bound to each port.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ports = {}  # Port -> InProcessTransport
+
+    def register(self, port, transport):
+        with self._lock:
+            if port in self._ports:
+                raise OSError(f"Port {port} is already bound")
+            self._ports[port] = transport
+
+    def unregister(self, port, transport):
+        with self._lock:
+            if self._ports.get(port) is transport:
+                del self._ports[port]
+
+    def lookup(self, port):
+        return self._ports.get(port)
+
+
+DEFAULT_HUB = InProcessHub()
+
+
+class InProcessTransport(Transport):
+    """
+        Transport between routers in the same process, handing packets over
+        through queues instead of the kernel network stack.
+    """
+    def __init__(self, logger, bind_address: str = "127.0.0.1",
+                 hub: InProcessHub = DEFAULT_HUB):
+        self._logger = logger
+        self._bind = bind_address
+        self._hub = hub
+        self._ports = set()
+        self._inbox = collections.deque()
+        self._available = threading.Condition()
+
+    def bind(self, port, receive_buffer=None):
+        self._hub.register(port, self)
+        self._ports.add(port)
+
+    def unbind(self, port):
+        self._hub.unregister(port, self)
+        self._ports.discard(port)
+
+    def send(self, packet, port):
+        receiver = self._hub.lookup(port)
+        if receiver is not None:
+            receiver._deliver(bytes(packet), port)
+
+    def _deliver(self, packet, port):
+        with self._available:
+            self._inbox.append((packet, (self._bind, port)))
+            self._available.notify()
+
+    def poll(self, timeout):
+        with self._available:
+            self._available.wait_for(lambda: self._inbox, timeout / 1000)
+            received_packets = list(self._inbox)
+            self._inbox.clear()
+        return received_packets
+
+    def close(self):
+        for port in list(self._ports):
+            self.unbind(port)
+
+
+# Shared memory ring layout: write position (only moved by senders), read
+# position (only moved by the receiver), and a closed flag. Positions count
+# bytes written / read in total; each record is a 4 byte length followed by
+# the packet, and WRAP marks a skip to the start of the ring.
+RING_HEADER = struct.Struct('=QQI')
+POSITION = struct.Struct('=Q')
+HEAD_OFFSET = 0
+TAIL_OFFSET = 8
+CLOSED = struct.Struct('=I')
+CLOSED_OFFSET = 16
+RECORD_LENGTH = struct.Struct('=I')
+WRAP = 0xFFFFFFFF
+
+# Ports whose rings are owned by this process, and registered with its
+# resource tracker
+_owned_rings = set()
+
+
+class SharedMemoryTransport(Transport):
+    """
+        Transport between routers on the same host, through one shared memory
+        ring buffer per incoming port. The receiving router owns the ring;
+        senders serialise their writes with a lock file.
+    """
+    def __init__(self, logger, bind_address: str = "127.0.0.1",
+                 capacity: int = RING_CAPACITY):
+        self._logger = logger
+        self._bind = bind_address
+        self._capacity = capacity
+        self._rings = {}    # Port -> (SharedMemory, owner lock) we receive on
+        self._targets = {}  # Port -> (SharedMemory, lock file) we send to
+
+    @staticmethod
+    def _name(port):
+        return f"ripd-{port}"
+
+    @staticmethod
+    def _lock_path(port, role):
+        return os.path.join(tempfile.gettempdir(), f"ripd-{port}.{role}")
+
+    def bind(self, port, receive_buffer=None):
+        # The owner holds a lock on the port for as long as it is bound, so
+        # a ring without a locked owner was left behind by a crashed router
+        owner_lock = open(self._lock_path(port, 'owner'), 'a')
+        try:
+            fcntl.flock(owner_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            owner_lock.close()
+            raise OSError(f"Port {port} is already bound")
+
+        size = RING_HEADER.size + (receive_buffer or self._capacity)
+        try:
+            ring = shared_memory.SharedMemory(self._name(port), create=True,
+                                              size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(self._name(port))
+            CLOSED.pack_into(stale.buf, CLOSED_OFFSET, 1)
+            stale.close()
+            stale.unlink()
+            ring = shared_memory.SharedMemory(self._name(port), create=True,
+                                              size=size)
+
+        RING_HEADER.pack_into(ring.buf, 0, 0, 0, 0)
+        self._rings[port] = (ring, owner_lock)
+        _owned_rings.add(port)
+
+    def unbind(self, port):
+        if port not in self._rings:
+            return
+        ring, owner_lock = self._rings.pop(port)
+
+        # Tell senders the ring is gone, so they reattach to its successor
+        CLOSED.pack_into(ring.buf, CLOSED_OFFSET, 1)
+        ring.close()
+        ring.unlink()
+        _owned_rings.discard(port)
+        owner_lock.close()
+
+    def _attach(self, port):
+        """
+            Attach to the ring of a port we send to.
+
+            :returns: (SharedMemory, lock file), or None if it is not bound.
+        """
+        target = self._targets.get(port)
+        if target is not None:
+            closed, = CLOSED.unpack_from(target[0].buf, CLOSED_OFFSET)
+            if not closed:
+                return target
+            self._detach(port)
+
+        try:
+            ring = shared_memory.SharedMemory(self._name(port))
+        except FileNotFoundError:
+            return None
+
+        # Only the owner may unlink the ring when its process exits. The
+        # resource tracker knows POSIX shared memory by its full name.
+        if port not in _owned_rings:
+            tracked = f"/{ring.name}" if os.name == 'posix' else ring.name
+            resource_tracker.unregister(tracked, 'shared_memory')
+        lock_file = open(self._lock_path(port, 'senders'), 'a')
+        self._targets[port] = (ring, lock_file)
+        return self._targets[port]
+
+    def _detach(self, port):
+        ring, lock_file = self._targets.pop(port)
+        ring.close()
+        lock_file.close()
+
+    def send(self, packet, port):
+        target = self._attach(port)
+        if target is None:
+            return  # Nobody is listening, drop it like UDP would
+        ring, lock_file = target
+        buffer = ring.buf
+        capacity = len(buffer) - RING_HEADER.size
+        record_length = RECORD_LENGTH.size + len(packet)
+
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            head, tail, closed = RING_HEADER.unpack_from(buffer, 0)
+            offset = head % capacity
+
+            # Records never wrap, so skip to the start if this one won't fit
+            skip = 0
+            if capacity - offset < record_length:
+                skip = capacity - offset
+
+            if closed or head + skip + record_length - tail > capacity:
+                return  # Ring full, drop the packet like a full socket buffer
+
+            if skip:
+                if skip >= RECORD_LENGTH.size:
+                    RECORD_LENGTH.pack_into(
+                        buffer, RING_HEADER.size + offset, WRAP)
+                offset = 0
+
+            start = RING_HEADER.size + offset
+            RECORD_LENGTH.pack_into(buffer, start, len(packet))
+            buffer[start + RECORD_LENGTH.size:start + record_length] = packet
+
+            # Publish the record only after it has been written
+            POSITION.pack_into(buffer, HEAD_OFFSET,
+                               head + skip + record_length)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self, port, ring):
+        """
+            Read every complete record from a ring.
+        """
+        buffer = ring.buf
+        capacity = len(buffer) - RING_HEADER.size
+        head, tail, _ = RING_HEADER.unpack_from(buffer, 0)
+        received_packets = []
+
+        while tail < head:
+            offset = tail % capacity
+            if capacity - offset < RECORD_LENGTH.size:
+                tail += capacity - offset
+                continue
+            length, = RECORD_LENGTH.unpack_from(buffer,
+                                                RING_HEADER.size + offset)
+            if length == WRAP:
+                tail += capacity - offset
+                continue
+
+            start = RING_HEADER.size + offset + RECORD_LENGTH.size
+            received_packets.append((bytes(buffer[start:start + length]),
+                                     (self._bind, port)))
+            tail += RECORD_LENGTH.size + length
+
+        # Only the receiver moves the read position
+        POSITION.pack_into(buffer, TAIL_OFFSET, tail)
+        return received_packets
+
+    def poll(self, timeout):
+        deadline = time.monotonic() + timeout / 1000
+        delay = 0.0005
+        while True:
+            received_packets = []
+            for port, (ring, _) in self._rings.items():
+                received_packets += self._read(port, ring)
+
+            # Shared memory cannot be polled, so back off between checks
+            remaining = deadline - time.monotonic()
+            if received_packets or remaining <= 0:
+                return received_packets
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.005)
+
+    def close(self):
+        for port in list(self._rings):
+            self.unbind(port)
+        for port in list(self._targets):
+            self._detach(port)
+
+
+TRANSPORTS = {
+    'udp': UdpTransport,
+    'inprocess': InProcessTransport,
+    'shm': SharedMemoryTransport,
+}
+
+
+def create_transport(name: str, logger, bind_address: str = "127.0.0.1"):
+    """
+        Create a transport by name.
+
+        :raises: KeyError if there is no transport with that name.
+    """
+    return TRANSPORTS[name](logger, bind_address)
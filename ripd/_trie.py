@@ -0,0 +1,186 @@
+"""
+    RIPDaemon - compressed binary (Patricia) trie over IPv4 prefixes, for
+    longest prefix match lookups.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+from ._structures import mask_of_length as prefix_mask
+
+ADDRESS_BITS = 32
+_EMPTY = object()  # Value of nodes that only join two branches
+
+
+class _Node:
+    """
+        A node in the trie. Each node stores its whole prefix, so a lookup
+        skips straight over runs of bits with no branches.
+    """
+    __slots__ = ('address', 'length', 'value', 'children')
+
+    def __init__(self, address, length, value=_EMPTY):
+        self.address = address
+        self.length = length
+        self.value = value
+        self.children = [None, None]
+
+
+class PrefixTrie:
+    """
+        Maps IPv4 prefixes to values. Lookups, insertions and removals visit
+        at most one node per bit of the prefix, and usually far fewer.
+    """
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, prefix):
+        return self.get(*prefix, default=_EMPTY) is not _EMPTY
+
+    @staticmethod
+    def _bit(address, index):
+        """
+            :returns: Bit index of address, counting from the most
+                      significant bit.
+        """
+        return (address >> (ADDRESS_BITS - 1 - index)) & 1
+
+    @staticmethod
+    def _common_length(address, length, node):
+        """
+            :returns: Length of the prefix shared by address / length and
+                      the prefix of node.
+        """
+        differing = ADDRESS_BITS - (address ^ node.address).bit_length()
+        return min(length, node.length, differing)
+
+    def insert(self, address: int, length: int, value):
+        """
+            Add a prefix to the trie, replacing the value of an existing
+            prefix. Host bits of address are ignored.
+        """
+        address &= prefix_mask(length)
+        parent, branch, node = None, 0, self._root
+
+        while node is not None:
+            common = self._common_length(address, length, node)
+            if common == node.length == length:
+                if node.value is _EMPTY:
+                    self._size += 1
+                node.value = value
+                return
+            if common < node.length:
+                break  # The new prefix splits this node's prefix
+            parent, branch = node, self._bit(address, node.length)
+            node = node.children[branch]
+
+        new = _Node(address, length, value)
+        self._size += 1
+        if node is not None and common == length:
+            # The new prefix covers the node
+            new.children[self._bit(node.address, length)] = node
+        elif node is not None:
+            # The prefixes diverge, join them under a new branch node
+            joined = _Node(address & prefix_mask(common), common)
+            joined.children[self._bit(address, common)] = new
+            joined.children[self._bit(node.address, common)] = node
+            new = joined
+        self._replace(parent, branch, new)
+
+    def remove(self, address: int, length: int):
+        """
+            Remove a prefix from the trie.
+
+            :returns: True if the prefix was removed, False if it was not in
+                      the trie.
+        """
+        address &= prefix_mask(length)
+        grandparent, parent_branch = None, 0
+        parent, branch, node = None, 0, self._root
+
+        while node is not None and node.length <= length:
+            if self._common_length(address, length, node) < node.length:
+                return False
+            if node.length == length:
+                break
+            grandparent, parent_branch = parent, branch
+            parent, branch = node, self._bit(address, node.length)
+            node = node.children[branch]
+        else:
+            return False
+
+        if node.value is _EMPTY:
+            return False
+        node.value = _EMPTY
+        self._size -= 1
+
+        # Collapse nodes left with fewer than two branches and no value
+        children = [child for child in node.children if child is not None]
+        if len(children) == 2:
+            return True
+        self._replace(parent, branch, children[0] if children else None)
+
+        if not children and parent is not None and parent.value is _EMPTY:
+            sibling = parent.children[1 - branch]
+            self._replace(grandparent, parent_branch, sibling)
+        return True
+
+    def _replace(self, parent, branch, node):
+        """
+            Point the given branch of parent, or the root, at node.
+        """
+        if parent is None:
+            self._root = node
+        else:
+            parent.children[branch] = node
+
+    def get(self, address: int, length: int, default=None):
+        """
+            :returns: Value of the exact prefix, or default.
+        """
+        address &= prefix_mask(length)
+        node = self._root
+        while node is not None and node.length <= length:
+            if self._common_length(address, length, node) < node.length:
+                break
+            if node.length == length:
+                return default if node.value is _EMPTY else node.value
+            node = node.children[self._bit(address, node.length)]
+        return default
+
+    def lookup(self, address: int, default=None):
+        """
+            Longest prefix match.
+
+            :returns: Value of the longest prefix containing address, or
+                      default.
+        """
+        best = default
+        node = self._root
+        while node is not None:
+            length = node.length
+            if length and (address ^ node.address) >> \
+                    (ADDRESS_BITS - length):
+                break
+            if node.value is not _EMPTY:
+                best = node.value
+            if length == ADDRESS_BITS:
+                break
+            node = node.children[(address >> (ADDRESS_BITS - 1 - length))
+                                 & 1]
+        return best
+
+    def items(self):
+        """
+            :returns: Generator of ((address, length), value) tuples, in
+                      address order.
+        """
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if node.value is not _EMPTY:
+                yield (node.address, node.length), node.value
+            stack.extend(child for child in reversed(node.children)
+                         if child is not None)
@@ -3,32 +3,48 @@
     MIT License. Copyright © 2025 Connor Varney, Kahu Jones
 """
 
+import hashlib
 import logging
+import math
 import traceback
 import time
 import os
+import random
 from ._configloader import ConfigLoader
-from ._structures import (RIPPacket, PacketVersionError, PacketCommandError,
-                          PacketParseError)
-from ._interface import Interface
+from ._structures import (RIPPacket, RIPEntry, PacketCommands, Parameters,
+                          PacketVersionError, PacketCommandError,
+                          PacketParseError, HEADER_LENGTH)
+from ._interface import Interface, POLL_TIMEOUT
 from ._table import RouteTable
+from ._snapshot import TableSnapshot, SnapshotError
+from ._ingress import TokenBucket, IngressQueue
+from ._liveness import NeighbourLiveness
+from ._control import ControlServer
+from ._monitor import LoopMonitor
+from ._mirror import TableMirror
 
 LOG_LEVEL = logging.DEBUG
 TABLE_PRINT_PERIOD = 0.5  # Seconds
+INGRESS_BATCH = 64  # Most packets processed per main loop iteration
+PAYLOAD_CACHE_SIZE = 64  # Most remembered payloads per peer
 
 
 class RIPDaemon:
-    def __init__(self, config_file: str, log_level: int = LOG_LEVEL):
+    def __init__(self, config_file: str, log_level: int = LOG_LEVEL,
+                 transport=None):
         """
             Initialize the RIP Daemon.
 
             :param config_file: Path to the configuration file.
             :param log_level: Log level for the RIP Daemon.
+            :param transport: Transport name or instance, overriding the
+                              configuration file.
         """
         # Start the logger and load the configuration file
         self._log_level = log_level
         self._logger = self._setup_logger(log_level)
         self._logger.debug("Loading configuration file.")
+        self._config_file = config_file
         self._config_loader = ConfigLoader(self._logger, config_file)
 
         # Load router config
@@ -38,17 +54,83 @@ class RIPDaemon:
         self._periodic_update_time = router_info['periodic_update_time']
         self._garbage_collection_time = router_info['garbage_collection_time']
         self._timeout = router_info['timeout']
+        self._periodic_update_jitter = router_info['periodic_update_jitter']
+        self._max_periodic_update_time = \
+            router_info['max_periodic_update_time']
+        self._stagger_updates = router_info['stagger_updates']
+        self._receive_buffers = router_info['receive_buffers']
+        self._rate_limit = router_info['rate_limit']
+        self._rate_limit_burst = router_info['rate_limit_burst']
+        self._transport = transport or router_info['transport']
+        self._snapshot_file = router_info['snapshot_file']
+        self._snapshot_interval = router_info['snapshot_interval']
+        self._networks = router_info['networks']
+        self._control_socket = router_info['control_socket']
+        self._mirror_file = router_info['mirror_file']
 
         # Load peer config
         self._peer_info = self._config_loader.get_peer_info()
 
         # Initialise routing table
         self._table = RouteTable(self._logger, self._id,
-                                 self._timeout, self._garbage_collection_time)
+                                 self._timeout, self._garbage_collection_time,
+                                 self._networks)
+        self._set_damping(router_info['flap_damping'])
+        self._table.set_loop_prevention(router_info['loop_prevention'],
+                                        router_info['hold_down'])
+
+        # Slippage of timers, including the table's route timers, and the
+        # time spent in each main loop iteration
+        self._monitor = LoopMonitor(self._logger,
+                                    router_info['timer_slip_warning'])
+        self._table.set_monitor(self._monitor)
+
+        # Ingress protection: per-peer rate limiters, and a bounded backlog
+        # of packets waiting to be processed
+        self._rate_limiters = {}
+        self._backlog = IngressQueue(router_info['ingress_backlog'])
+        self._ingress_counters = {'malformed': 0, 'unknown_peer': 0,
+                                  'rate_limited': 0, 'fast_path': 0,
+                                  'processed': 0}
+
+        # Digests of the last payloads fully processed from each peer, and
+        # the destinations they carried. Any change to the table could
+        # change how a payload is applied, so it clears the cache.
+        self._payload_cache = {}
+        self._table.events.subscribe(
+            lambda event: self._payload_cache.clear())
+
+        # Times of the next periodic update, and of the next update to each
+        # peer when staggered. Any change to the table brings a lengthened
+        # adaptive interval back down.
+        self._next_periodic_update = time.time()
+        self._next_peer_update = {}
+        self._table.events.subscribe(self._shorten_update_interval)
+
+        # Interface, control socket and table mirror, created when the
+        # daemon starts
+        self._interface = None
+        self._control = None
+        self._mirror = None
+
+        # Time each peer was last heard from, to notice peers reappearing
+        self._peer_last_heard = {}
 
-        # Flag for integration tests to cleanly exit
+        # Hellos sent to peers, and the liveness of peers sending them
+        self._hello_interval = router_info['hello_interval']
+        self._liveness = NeighbourLiveness(router_info['hello_multiplier'])
+        self._next_hello = time.time()
+
+        # Flag for integration tests to cleanly exit, without telling
+        # peers, as if the router had crashed
         self._run = True
 
+        # Flag set by stop to exit gracefully, withdrawing every route
+        self._stop_requested = False
+
+        # Flag set by SIGHUP / request_reload to reload the config file
+        self._reload_requested = False
+
     def _setup_logger(self, log_level: int):
         """
             Setup logger for the RIP Daemon.
@@ -57,11 +139,14 @@ class RIPDaemon:
         """
         logger = logging.getLogger(__name__)
         logger.setLevel(log_level)
-        ch = logging.StreamHandler()
-        ch.setLevel(log_level)
-        formatter = logging.Formatter('%(levelname)s - %(message)s')
-        ch.setFormatter(formatter)
-        logger.addHandler(ch)
+
+        # Routers sharing a process share one handler, so messages are not
+        # repeated once per router
+        if not logger.handlers:
+            ch = logging.StreamHandler()
+            formatter = logging.Formatter('%(levelname)s - %(message)s')
+            ch.setFormatter(formatter)
+            logger.addHandler(ch)
 
         return logger
 
@@ -72,27 +157,75 @@ class RIPDaemon:
         self._logger.info("Starting RIP Daemon.")
 
         # Initialise interface
-        self._interface = Interface(self._logger, self._ports)
+        self._interface = Interface(self._logger, self._ports,
+                                    transport=self._transport,
+                                    receive_buffers=self._receive_buffers)
 
-        # Set up periodic update timer and table print timer
+        # Preload the table from the last snapshot, if there is one
+        if self._snapshot_file:
+            self._load_snapshot()
+
+        # Set up periodic update timers, table print and snapshot timers
         self._next_periodic_update = time.time()
+        self._next_peer_update = self._stagger_schedule()
         self._next_table_print = time.time()
+        self._next_snapshot = time.time() + self._snapshot_interval
+
+        # Ask every peer for its table, rather than waiting for its next
+        # periodic update
+        self._send_requests(self._peer_info)
+
+        # Mirror the table for other processes, if configured
+        if self._mirror_file:
+            try:
+                self._mirror = TableMirror(self._logger, self._mirror_file,
+                                           self._table, self._id)
+            except OSError as e:
+                self._logger.error("Could not create table mirror " +
+                                   f"{self._mirror_file}: {e}")
+
+        # Serve the control socket, if configured
+        if self._control_socket:
+            try:
+                self._control = ControlServer(self._logger,
+                                              self._control_socket, self)
+            except OSError as e:
+                self._logger.error("Could not open control socket " +
+                                   f"{self._control_socket}: {e}")
 
         # Main loop
         try:
             self._logger.info('RIP Daemon started.')
 
             # Main loop
-            while self._run:
+            while self._run and not self._stop_requested:
+                # Apply a requested configuration reload
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self._reload_config()
+
                 # Process incoming data
                 self._process_incoming_data()
 
+                # Run commands from the control socket
+                if self._control:
+                    self._control.run_pending()
+
+                # Send hellos, and fail over from peers that stopped sending
+                if self._hello_interval:
+                    self._check_liveness()
+
                 # Send periodic updates
-                if time.time() >= self._next_periodic_update:
+                if self._stagger_updates:
+                    self._staggered_update()
+                elif time.time() >= self._next_periodic_update:
+                    self._monitor.fired('periodic_update',
+                                        self._next_periodic_update)
                     self._periodic_update()
 
                 # Periodically print table
                 if time.time() >= self._next_table_print:
+                    self._monitor.fired('table_print', self._next_table_print)
                     if self._log_level == logging.INFO:
                         os.system('clear')
                     self._logger.info(f"Routing Table for Router {self._id}:" +
@@ -109,104 +242,611 @@ class RIPDaemon:
                                        "sending triggered update.")
                     self._periodic_update()
 
+                # Periodically snapshot the table for warm restarts
+                if self._snapshot_file and \
+                        time.time() >= self._next_snapshot:
+                    self._monitor.fired('snapshot', self._next_snapshot)
+                    self._save_snapshot()
+
+                # Publish this iteration's changes to the table mirror
+                if self._mirror:
+                    self._mirror.flush()
+
         except KeyboardInterrupt:
             self._logger.info("Exiting RIP Daemon.")
+            self._stop_requested = True
 
         except Exception:
             self._logger.error("An error occurred:\n%s",
                                traceback.format_exc())
 
         finally:
+            if self._snapshot_file:
+                self._save_snapshot()
+            if self._stop_requested:
+                self._withdraw_routes()
             self._logger.debug("Closing sockets.")
+            if self._control:
+                self._control.close()
+                self._control = None
+            if self._mirror:
+                self._mirror.close()
+                self._mirror = None
             self._interface.close_sockets()
 
+    def get_metrics(self):
+        """
+            Operational metrics of the running router.
+
+            :returns: Dictionary of metrics.
+        """
+        routes = list(self._table.routes.values())
+        return {'router_id': self._id,
+                'routes': len(routes),
+                'suppressed_routes': sum(entry.suppressed
+                                         for entry in routes),
+                'interface': None if self._interface is None
+                else self._interface.get_stats(),
+                'ingress': self.get_ingress_metrics(),
+                'down_peers': sorted(self._liveness.down),
+                'loop': self._monitor.get_stats()}
+
+    def get_ingress_metrics(self):
+        """
+            Ingress counters, and the length of the backlog. Unlike
+            get_metrics, this only copies counters, so it can be called from
+            other threads while the router is running.
+
+            :returns: Dictionary of counters.
+        """
+        ingress = dict(self._ingress_counters)
+        ingress['shed'] = self._backlog.shed
+        ingress['backlog'] = len(self._backlog)
+        return ingress
+
+    def stop(self):
+        """
+            Ask the daemon to stop gracefully. Before closing its sockets,
+            it advertises every route and itself as unreachable, so peers
+            reconverge straight away instead of timing its routes out. Safe
+            to call from a signal handler or another thread.
+        """
+        self._stop_requested = True
+
+    def request_reload(self):
+        """
+            Ask the daemon to reload its configuration file. Safe to call
+            from a signal handler or another thread; the reload is applied
+            by the main loop.
+        """
+        self._reload_requested = True
+
+    def _reload_config(self):
+        """
+            Reload the configuration file, and apply the differences to the
+            running router without restarting its sockets or table.
+        """
+        self._logger.info("Reloading configuration file.")
+        try:
+            config_loader = ConfigLoader(self._logger, self._config_file)
+            router_info = config_loader.get_router_info()
+            peer_info = config_loader.get_peer_info()
+        except SystemExit:
+            self._logger.error("Invalid configuration, keeping the " +
+                               "running configuration.")
+            return
+
+        if router_info['router_id'] != self._id:
+            self._logger.error("The router ID cannot be changed without a " +
+                               "restart, keeping the running configuration.")
+            return
+
+        # Bind or unbind only the ports that have changed
+        for port in set(self._ports) - set(router_info['incoming_ports']):
+            self._interface.unbind_port(port)
+        for port in set(router_info['incoming_ports']) - set(self._ports):
+            try:
+                self._interface.bind_port(
+                    port, router_info['receive_buffers'][port])
+            except OSError as e:
+                self._logger.error(f"Failed to bind port {port}: {e}.")
+        self._ports = router_info['incoming_ports']
+
+        # Routes through removed peers become unreachable, and routes
+        # through peers with a new link metric are re-derived
+        changed = 0
+        for router_id, info in self._peer_info.items():
+            if router_id not in peer_info:
+                self._logger.info(f"Removed peer {router_id}.")
+                changed += self._table.invalidate_next_hop(router_id)
+                self._table.set_peer_timeout(router_id, None)
+                self._liveness.forget(router_id)
+            elif peer_info[router_id]['metric'] != info['metric']:
+                self._logger.info(f"Metric to peer {router_id} changed.")
+                delta = peer_info[router_id]['metric'] - info['metric']
+                changed += self._table.adjust_next_hop_metric(router_id,
+                                                              delta)
+        added = set(peer_info) - set(self._peer_info)
+        self._peer_info = peer_info
+
+        # Advertise a changed set of attached networks straight away
+        if router_info['networks'] != self._networks:
+            self._logger.info("Attached networks changed.")
+            self._networks = router_info['networks']
+            self._table.set_networks(self._networks)
+            changed += 1
+
+        # Retune timers
+        self._timeout = router_info['timeout']
+        self._garbage_collection_time = router_info['garbage_collection_time']
+        self._table.set_timers(self._timeout, self._garbage_collection_time)
+        self._periodic_update_time = router_info['periodic_update_time']
+        self._periodic_update_jitter = router_info['periodic_update_jitter']
+        self._max_periodic_update_time = \
+            router_info['max_periodic_update_time']
+        self._stagger_updates = router_info['stagger_updates']
+        self._next_periodic_update = min(
+            self._next_periodic_update,
+            time.time() + self._periodic_update_time)
+        self._next_peer_update = {
+            router_id: min(next_update,
+                           time.time() + self._periodic_update_time)
+            for router_id, next_update in self._next_peer_update.items()
+            if router_id in peer_info}
+        self._snapshot_file = router_info['snapshot_file']
+        self._snapshot_interval = router_info['snapshot_interval']
+        self._hello_interval = router_info['hello_interval']
+        self._monitor.set_slip_warning(router_info['timer_slip_warning'])
+        if self._hello_interval:
+            self._liveness.set_multiplier(router_info['hello_multiplier'])
+        else:
+            self._liveness = NeighbourLiveness(router_info['hello_multiplier'])
+        self._next_hello = min(self._next_hello,
+                               time.time() + self._hello_interval)
+
+        self._set_damping(router_info['flap_damping'])
+        self._table.set_loop_prevention(router_info['loop_prevention'],
+                                        router_info['hold_down'])
+
+        # Cached payloads were applied with the old link metrics
+        self._payload_cache.clear()
+
+        # Retune rate limits
+        self._rate_limit = router_info['rate_limit']
+        self._rate_limit_burst = router_info['rate_limit_burst']
+        self._rate_limiters.clear()
+
+        self._config_loader = config_loader
+        self._logger.info("Configuration reloaded.")
+
+        # Let neighbours know about changed routes, and new peers about us,
+        # and ask new peers for their tables
+        if changed or added:
+            self._periodic_update()
+        if added:
+            self._send_requests(added)
+
+    def _set_damping(self, damping):
+        """
+            Apply the flap damping settings from the configuration file.
+        """
+        if damping is None:
+            self._table.disable_damping()
+        else:
+            self._table.set_damping(**damping)
+
+    def _load_snapshot(self):
+        """
+            Preload the routing table from the snapshot file. Restored routes
+            are used for forwarding, but not advertised until their next hop
+            confirms them, and expire after a grace period if it does not.
+        """
+        try:
+            records = TableSnapshot.load(self._snapshot_file, self._id)
+        except FileNotFoundError:
+            self._logger.info("No routing table snapshot, starting cold.")
+            return
+        except (OSError, SnapshotError) as e:
+            self._logger.error(f"Failed to load routing table snapshot: {e}.")
+            return
+
+        # Peers answer the request sent on start straight away, so a route
+        # they do not confirm within two update intervals is gone
+        grace = min(self._timeout, 2 * self._periodic_update_time)
+        restored = 0
+        for destination_id, next_hop_id, metric, garbage, _ in records:
+            # Skip unreachable routes, and routes through removed peers
+            if garbage or metric >= 16 or next_hop_id not in self._peer_info:
+                continue
+            self._table.restore_route(destination_id, next_hop_id, metric,
+                                      grace)
+            restored += 1
+
+        self._logger.info(f"Restored {restored} routes from snapshot.")
+
+    def _save_snapshot(self):
+        """
+            Write a snapshot of the routing table to the snapshot file.
+        """
+        try:
+            TableSnapshot.save(self._snapshot_file, self._id,
+                               self._table.routes.values())
+        except OSError as e:
+            self._logger.error(f"Failed to save routing table snapshot: {e}.")
+
+        self._next_snapshot = time.time() + self._snapshot_interval
+
+    def _update_interval(self):
+        """
+            Time until the next periodic update, randomly offset by up to
+            periodic_update_jitter of the interval, so routers started
+            together do not stay synchronised.
+        """
+        jitter = self._periodic_update_jitter
+        return self._adaptive_update_time() * \
+            (1 + random.uniform(-jitter, jitter))
+
+    def _adaptive_update_time(self):
+        """
+            Periodic update interval before jitter. When adaptive (with
+            max_periodic_update_time above periodic_update_time), it is half
+            the time the table has been stable, within those bounds, so it
+            grows by half with each update while nothing changes.
+        """
+        stable = time.time() - self._table.events.last_event_time
+        return min(self._max_periodic_update_time,
+                   max(self._periodic_update_time, stable / 2))
+
+    def _shorten_update_interval(self, event):
+        """
+            Bring every update due after one normal interval forward, as
+            the table has just changed.
+        """
+        if self._max_periodic_update_time <= self._periodic_update_time:
+            return
+        soon = time.time() + self._periodic_update_time
+        self._next_periodic_update = min(self._next_periodic_update, soon)
+        for router_id, next_update in self._next_peer_update.items():
+            self._next_peer_update[router_id] = min(next_update, soon)
+
+    def _update_parameters(self, router_id):
+        """
+            Parameter entries to send with an update to a peer. With an
+            adaptive interval, they tell the peer the longest time until its
+            next update, so it can lengthen its route timeout to match.
+
+            The interval, with the largest jitter, is rounded up to a whole
+            number of periodic_update_time. It only changes in those steps,
+            so repeated updates stay identical and take the receiving peer's
+            fast path.
+        """
+        if self._max_periodic_update_time <= self._periodic_update_time:
+            return []
+        interval = self._adaptive_update_time() * \
+            (1 + self._periodic_update_jitter)
+        steps = math.ceil(round(interval / self._periodic_update_time, 6))
+        return [RIPEntry.parameter(
+            Parameters.UPDATE_INTERVAL,
+            math.ceil(steps * self._periodic_update_time * 1000))]
+
+    def _apply_parameters(self, router_id, entries):
+        """
+            Apply the parameters a peer sent with its routes. Routes
+            through a peer that advertises a longer update interval than
+            ours time out proportionally later.
+        """
+        interval = None
+        for entry in entries:
+            if entry.is_parameter and \
+                    entry.id == Parameters.UPDATE_INTERVAL:
+                interval = entry.metric / 1000
+        self._table.set_peer_timeout(
+            router_id, None if interval is None else
+            interval * self._timeout / self._periodic_update_time)
+
+    def _stagger_schedule(self):
+        """
+            Spread the first update to each peer evenly across one interval.
+
+            :returns: Dictionary of peer ID to time of its next update.
+        """
+        now = time.time()
+        spacing = self._periodic_update_time / max(1, len(self._peer_info))
+        return {router_id: now + i * spacing
+                for i, router_id in enumerate(sorted(self._peer_info))}
+
+    def _send_updates(self, router_ids):
+        """
+            Queue an update for each of the given peers, then send them in
+            one pass.
+        """
+        for router_id in router_ids:
+            peer = self._peer_info[router_id]
+            for packet in self._table.get_packets(
+                    router_id, summarise=peer.get('summarise', False),
+                    parameters=self._update_parameters(router_id)):
+                self._interface.queue(packet, peer['port'])
+        self._interface.flush()
+
+    def _withdraw_routes(self):
+        """
+            Send every peer a final update withdrawing all routes.
+        """
+        self._logger.info("Withdrawing routes from peers.")
+        packets = self._table.get_withdrawal_packets()
+        for peer in self._peer_info.values():
+            for packet in packets:
+                self._interface.queue(packet, peer['port'])
+        self._interface.flush()
+
+    def _send_requests(self, router_ids):
+        """
+            Ask each of the given peers for its whole table.
+        """
+        if not router_ids:
+            return
+        self._logger.debug(f"Requesting tables from peers {router_ids}.")
+        packet = RIPPacket.request(self._id)
+        for router_id in router_ids:
+            self._interface.queue(packet, self._peer_info[router_id]['port'])
+        self._interface.flush()
+
+    def _answer_request(self, router_id, entries):
+        """
+            Answer a request from a peer straight away, with a response to
+            that peer alone. A request for the whole table is answered with
+            a full update. A request for particular destinations is answered
+            with the metric of each, without loop prevention, as it is a
+            query rather than routing.
+        """
+        if len(entries) == 1 and entries[0].is_whole_table:
+            self._logger.debug(f"Answering table request from {router_id}.")
+            self._send_updates([router_id])
+            return
+
+        reply = [RIPEntry.for_destination(
+                     entry.destination,
+                     self._table.get_metric(entry.destination))
+                 for entry in entries if not entry.is_parameter]
+        if reply:
+            self._interface.queue(
+                RIPPacket.construct(PacketCommands.RESPONSE, self._id, reply),
+                self._peer_info[router_id]['port'])
+            self._interface.flush()
+
+    def _trigger_update(self):
+        """
+            Send a triggered update to all peers, leaving the periodic
+            update schedule alone.
+        """
+        self._logger.debug("Sending triggered update.")
+        self._send_updates(self._peer_info)
+
+    def _clear_table(self):
+        """
+            Remove every route, and ask every peer for its table again.
+        """
+        self._logger.info("Clearing routing table.")
+        self._table.remove_all()
+        self._send_requests(self._peer_info)
+
     def _periodic_update(self):
         """
             Send periodic updates to all peers.
         """
         self._logger.debug("Sending periodic update.")
 
-        # Send periodic updates to all peers
-        for router_id, info in self._peer_info.items():
-            packet = self._table.get_packet(router_id)
-            self._interface.unicast(packet, info['port'])
+        # Reset periodic update time, before advertising it
+        self._next_periodic_update = time.time() + self._update_interval()
+        self._send_updates(self._peer_info)
+
+    def _staggered_update(self):
+        """
+            Send periodic updates to the peers whose staggered update is due.
+        """
+        now = time.time()
+
+        # Peers added by a reload start at a random point in the interval
+        for router_id in self._peer_info:
+            if router_id not in self._next_peer_update:
+                self._next_peer_update[router_id] = \
+                    now + random.uniform(0, self._periodic_update_time)
+
+        due = [router_id for router_id in self._peer_info
+               if now >= self._next_peer_update[router_id]]
+        if not due:
+            return
 
-        # Reset periodic update time
-        self._next_periodic_update = time.time() + self._periodic_update_time
+        self._logger.debug(f"Sending periodic update to peers {due}.")
+        for router_id in due:
+            self._monitor.fired('peer_update',
+                                self._next_peer_update[router_id], now)
+            self._next_peer_update[router_id] = now + self._update_interval()
+        self._send_updates(due)
+
+    def _check_liveness(self):
+        """
+            Send hellos when due, and invalidate every route through a peer
+            whose hellos have stopped, sending a triggered update if any
+            routes changed.
+        """
+        now = time.time()
+        if now >= self._next_hello:
+            self._monitor.fired('hello', self._next_hello, now)
+            packet = RIPPacket.hello(self._id, self._hello_interval)
+            for peer in self._peer_info.values():
+                self._interface.queue(packet, peer['port'])
+            self._interface.flush()
+            self._next_hello = now + self._hello_interval
+
+        invalidated = 0
+        for router_id in self._liveness.expired(now):
+            self._logger.warning(f"Peer {router_id} stopped sending hellos, " +
+                                 "invalidating its routes.")
+            invalidated += self._table.invalidate_next_hop(router_id)
+        if invalidated:
+            self._periodic_update()
+
+    def _receive_hello(self, router_id, packet_data):
+        """
+            Record a hello from a peer. A peer coming back up is asked for
+            its whole table.
+        """
+        if not self._hello_interval:
+            return
+        try:
+            _, _, entries = RIPPacket.parse(packet_data)
+            interval = next(entry.metric / 1000 for entry in entries
+                            if entry.is_parameter and
+                            entry.id == Parameters.HELLO_INTERVAL)
+        except (PacketParseError, StopIteration):
+            self._ingress_counters['malformed'] += 1
+            return
+
+        if self._liveness.heard(router_id, interval) and \
+                self._interface is not None:
+            self._logger.info(f"Peer {router_id} is sending hellos again.")
+            self._send_requests([router_id])
+
+    def _poll_timeout(self):
+        """
+            Time to wait for incoming packets before the next timer is due.
+
+            :returns: Timeout in milliseconds, at most POLL_TIMEOUT.
+        """
+        if self._stagger_updates:
+            next_update = min(self._next_peer_update.values(),
+                              default=self._next_periodic_update)
+        else:
+            next_update = self._next_periodic_update
+        # Don't wait while there is a backlog of packets to process
+        if self._backlog:
+            return 0
+
+        next_timer = min(next_update, self._next_table_print)
+        if self._hello_interval:
+            next_timer = min(next_timer, self._next_hello,
+                             self._liveness.next_deadline() or next_timer)
+        return max(0, min(POLL_TIMEOUT,
+                          math.ceil((next_timer - time.time()) * 1000)))
 
     def _process_incoming_data(self):
         """
             Process incoming data from the interface, adding entries to the
             routing table if required.
         """
-        incoming_data = self._interface.poll_incoming_ports()
+        # Time spent waiting for packets is not counted as work
+        self._monitor.iteration_finished()
+        incoming_data = self._interface.poll_incoming_ports(
+            self._poll_timeout())
+        self._monitor.iteration_started()
 
-        # If no data, return
-        if not incoming_data:
+        # Screen new packets into the backlog
+        for packet in incoming_data:
+            self._accept_packet(packet[0])
+
+        # Process a bounded batch, so timers still run under overload
+        for _ in range(min(len(self._backlog), INGRESS_BATCH)):
+            source_router_id, packet_data = self._backlog.pop()
+            self._process_packet(source_router_id, packet_data)
+
+    def _accept_packet(self, packet_data):
+        """
+            Cheaply screen a received packet from its header alone, before
+            it is fully parsed. Packets from unknown routers and packets
+            over the sender's rate limit are dropped; the rest are queued.
+        """
+        if len(packet_data) < HEADER_LENGTH:
+            self._ingress_counters['malformed'] += 1
+            self._logger.error("Failed to parse incoming packet: " +
+                               "Unable to read packet header.")
             return
 
-        self._logger.debug("Incoming packet received.")
-        # Process incoming packets
-        for packet in incoming_data:
-            packet_data = packet[0]
+        source_router_id = int.from_bytes(packet_data[2:4], 'big')
+        if source_router_id not in self._peer_info:
+            self._ingress_counters['unknown_peer'] += 1
+            self._logger.debug("Dropped packet from unknown router " +
+                               f"{source_router_id}.")
+            return
 
-            # Attempt to parse the packet
-            try:
-                parse_result = RIPPacket.parse(packet_data)
-            except (PacketVersionError, PacketCommandError, PacketParseError) \
-                    as e:
-                self._logger.error(f"Failed to parse incoming packet: {e}.")
-                self._logger.debug("Packet data: %s", packet_data)
-                continue  # Drop the packet and continue
-
-            # Unpack the packet
-            _command, source_router_id, entries = parse_result
-            self._logger.debug(f"Parsed packet: {parse_result}")
-
-            # Add entries to the routing table
-            for entry in entries:
-                # Ignore the entry if it is for this router
-                if entry.id == self._id:
-                    continue
-
-                # Calculate the metric of this entry
-                new_metric = min(entry.metric +
-                                 self._peer_info[source_router_id]['metric'],
-                                 16)
-
-                if entry.id not in self._table.routes.keys():
-                    if new_metric < 16:
-                        # New route, not in table yet and it's valid
-                        self._table.add_route(destination_id=entry.id,
-                                              next_hop_id=source_router_id,
-                                              metric=new_metric)
-
-                elif (self._table.routes[entry.id].next_hop_id ==
-                      source_router_id):
-                    # This is an update from the same next hop — must always
-                    # accept changes
-
-                    if new_metric >= 16:
-                        # If the metric is already 16, and this is another
-                        # metric 16, ignore this as to not restart garbage
-                        # collection timer
-                        if self._table.routes[entry.id].metric == 16:
-                            continue
-
-                        # Otherwise, set the timeout of the entry to now, to
-                        # trigger the garbage collection timer
-                        timeout = time.time() - self._timeout
-                        self._table.routes[entry.id].timeout = timeout
-
-                    else:
-                        # If this route doesn't have metric 16, use normal
-                        # timeout val
-                        self._table.routes[entry.id].timeout = time.time()
-
-                    self._table.routes[entry.id].metric = new_metric
-
-                elif new_metric < self._table.routes[entry.id].metric:
-                    # Better route (lower metric) from a different next hop
-                    self._table.add_route(destination_id=entry.id,
-                                          next_hop_id=source_router_id,
-                                          metric=new_metric)
+        # Hellos only show the peer is alive, so are handled here, ahead of
+        # the rate limit and backlog, and never delayed by load
+        if packet_data[0] == PacketCommands.HELLO:
+            self._receive_hello(source_router_id, packet_data)
+            return
+
+        if self._rate_limit:
+            bucket = self._rate_limiters.get(source_router_id)
+            if bucket is None:
+                bucket = TokenBucket(self._rate_limit, self._rate_limit_burst)
+                self._rate_limiters[source_router_id] = bucket
+            if not bucket.consume():
+                self._ingress_counters['rate_limited'] += 1
+                self._logger.debug("Dropped packet from router " +
+                                   f"{source_router_id}, over rate limit.")
+                return
+
+        self._backlog.push(source_router_id, packet_data)
+
+    def _process_packet(self, source_router_id, packet_data):
+        """
+            Parse a packet from the backlog, and apply it to the routing
+            table.
+        """
+        # The peer may have been removed by a reload since it was queued
+        if source_router_id not in self._peer_info:
+            return
+        self._ingress_counters['processed'] += 1
+
+        # A peer heard from again after its routes would have timed out
+        # may have restarted, so ask it for its whole table
+        now = time.time()
+        last_heard = self._peer_last_heard.get(source_router_id)
+        self._peer_last_heard[source_router_id] = now
+        if last_heard is not None and \
+                now - last_heard >= self._table.peer_timeout(source_router_id):
+            self._send_requests([source_router_id])
+
+        # Fast path: a response identical to one already applied, with no
+        # table changes since, only refreshes the routes it carries
+        cache = self._payload_cache.setdefault(source_router_id, {})
+        digest = hashlib.blake2b(packet_data, digest_size=16).digest()
+        if digest in cache:
+            self._ingress_counters['fast_path'] += 1
+            self._table.refresh_routes(source_router_id, cache[digest])
+            return
+
+        # Attempt to parse the packet
+        try:
+            parse_result = RIPPacket.parse(packet_data)
+        except (PacketVersionError, PacketCommandError, PacketParseError) \
+                as e:
+            self._ingress_counters['malformed'] += 1
+            self._logger.error(f"Failed to parse incoming packet: {e}.")
+            self._logger.debug("Packet data: %s", packet_data)
+            return  # Drop the packet
+
+        # Unpack the packet
+        _command, source_router_id, entries = parse_result
+        self._logger.debug("Parsed packet: %s", parse_result)
+
+        if _command == PacketCommands.REQUEST:
+            self._answer_request(source_router_id, entries)
+            return
+
+        # Apply the peer's parameters, and add entries to the routing table
+        self._apply_parameters(source_router_id, entries)
+        cacheable = self._table.process_response(
+            source_router_id,
+            self._peer_info[source_router_id]['metric'],
+            entries)
+
+        # Remember the payload, unless applying it changed the table, or
+        # its outcome depended on the time, as it may differ when repeated
+        if _command == PacketCommands.RESPONSE and cacheable and \
+                source_router_id in self._payload_cache:
+            cache = self._payload_cache[source_router_id]
+            if len(cache) >= PAYLOAD_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[digest] = [entry.destination for entry in entries
+                             if not entry.is_parameter]
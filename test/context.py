@@ -16,3 +16,14 @@ from ripd._configloader import ConfigLoader
 from ripd.ripd import RIPDaemon
 from ripd._interface import Interface
 from ripd._table import *
+from ripd._events import *
+from ripd._snapshot import *
+from ripd._oracle import *
+from ripd._transport import *
+from ripd._ingress import *
+from ripd._trie import *
+from ripd._faults import *
+from ripd._liveness import *
+from ripd._control import *
+from ripd._monitor import *
+from ripd._mirror import *
@@ -0,0 +1,169 @@
+"""
+    Control socket integration tests, against a running router.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from test.context import (
+    RIPDaemon,
+    RIPPacket,
+    RIPEntry,
+    PacketCommands,
+    InProcessHub,
+    InProcessTransport
+)
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', '1.ini')
+
+
+class ControlServerTestSuite(unittest.TestCase):
+    """
+        Control socket test suite, as router 1 of the example network, with
+        router 2 played by the test.
+    """
+    def setUp(self):
+        logger = logging.getLogger(__name__)
+        hub = InProcessHub()
+        self.peer = InProcessTransport(logger, hub=hub)
+        self.peer.bind(8281)  # Router 2
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.router = RIPDaemon(CONFIG, log_level=logging.WARNING,
+                                transport=InProcessTransport(logger, hub=hub))
+        self.router._control_socket = os.path.join(self.directory.name,
+                                                   'ripd.sock')
+        self.thread = threading.Thread(target=self.router.start, daemon=True)
+        self.thread.start()
+
+        # Advertise a router ID and a prefix through router 2
+        self.peer.send(RIPPacket.construct(
+            PacketCommands.RESPONSE, 2,
+            [RIPEntry(id=5, metric=3),
+             RIPEntry(id=0x0A010000, metric=2, mask=0xFFFF0000)]), 8182)
+        deadline = time.time() + 5
+        while len(self.router._table.routes) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.settimeout(5)
+        self.connection.connect(self.router._control_socket)
+        self.file = self.connection.makefile('rwb')
+
+    def tearDown(self):
+        self.file.close()
+        self.connection.close()
+        self.router._run = False
+        self.thread.join(timeout=5)
+        self.peer.close()
+        self.directory.cleanup()
+
+    def request(self, command, **arguments):
+        """
+            :returns: List of the response lines to a request.
+        """
+        self.file.write(json.dumps(dict(arguments, command=command))
+                        .encode() + b'\n')
+        self.file.flush()
+        lines = []
+        while True:
+            lines.append(json.loads(self.file.readline()))
+            if 'ok' in lines[-1]:
+                return lines
+
+    def test_route(self):
+        """
+            Routes are found by router ID or prefix.
+        """
+        [response] = self.request('route', destination=5)
+        self.assertTrue(response['ok'])
+        self.assertEqual(response['route']['next_hop'], 2)
+        self.assertEqual(response['route']['metric'], 4)
+
+        [response] = self.request('route', destination='10.1.0.0/16')
+        self.assertEqual(response['route']['destination'], '10.1.0.0/16')
+        self.assertEqual(response['route']['metric'], 3)
+
+        [response] = self.request('route', destination='10.2.0.0/16')
+        self.assertIsNone(response['route'])
+
+        [response] = self.request('route', destination='10.2.0.0/99')
+        self.assertFalse(response['ok'])
+
+    def test_lookup(self):
+        """
+            Lookups find the longest prefix match for an address.
+        """
+        [response] = self.request('lookup', address='10.1.2.3')
+        self.assertEqual(response['route']['destination'], '10.1.0.0/16')
+        [response] = self.request('lookup', address='10.2.2.3')
+        self.assertIsNone(response['route'])
+
+    def test_unexpected_error(self):
+        """
+            Unexpected errors are answered, and do not close the
+            connection.
+        """
+        def fail(address):
+            raise RuntimeError("dictionary changed size during iteration")
+        self.router._table.lookup = fail
+
+        with self.assertLogs('ripd.ripd', logging.ERROR):
+            [response] = self.request('lookup', address='10.1.2.3')
+        self.assertEqual(response, {'ok': False, 'error': 'Internal error'})
+        [response] = self.request('route', destination=5)
+        self.assertTrue(response['ok'])
+
+    def test_dump(self):
+        """
+            Dumps stream every route, or a page of them in destination
+            order.
+        """
+        *routes, end = self.request('dump')
+        self.assertEqual(end, {'ok': True, 'count': 2})
+        self.assertEqual(sorted(str(route['destination'])
+                                for route in routes),
+                         ['10.1.0.0/16', '5'])
+
+        *routes, end = self.request('dump', offset=0, limit=1)
+        self.assertEqual(end['count'], 1)
+        self.assertEqual(routes[0]['destination'], 5)
+
+        [response] = self.request('dump', offset=-1)
+        self.assertFalse(response['ok'])
+
+    def test_commands(self):
+        """
+            Commands are run by the daemon, and errors do not close the
+            connection.
+        """
+        self.peer.poll(0)
+        [response] = self.request('update')
+        self.assertTrue(response['ok'])
+        self.assertTrue(self.peer.poll(0))
+
+        [response] = self.request('clear')
+        self.assertTrue(response['ok'])
+        self.assertEqual(self.router._table.routes, {})
+
+        [response] = self.request('reboot')
+        self.assertFalse(response['ok'])
+        [response] = self.request('metrics')
+        self.assertEqual(response['metrics']['router_id'], 1)
+
+        [response] = self.request('stop')
+        self.assertTrue(response['ok'])
+        self.thread.join(timeout=5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.router._control_socket))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+    Route event publisher unit tests.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import asyncio
+import logging
+import time
+import unittest
+
+from test.context import (
+    RouteEvent,
+    RouteEventPublisher,
+    RouteEventTypes
+)
+
+
+class RouteEventPublisherTestSuite(unittest.TestCase):
+    """
+        Route event publisher test suite.
+    """
+    def setUp(self):
+        self.publisher = RouteEventPublisher(logging.getLogger(__name__))
+
+    def _event(self, destination_id=1):
+        return RouteEvent(RouteEventTypes.ADDED, destination_id, 2, 1)
+
+    def test_callback(self):
+        """
+            Subscribed callbacks receive events until unsubscribed.
+        """
+        received = []
+        callback = self.publisher.subscribe(received.append)
+        self.publisher.publish(self._event())
+        self.publisher.unsubscribe(callback)
+        self.publisher.publish(self._event())
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0].type, RouteEventTypes.ADDED)
+
+    def test_failing_callback(self):
+        """
+            A failing subscriber must not stop delivery to the others.
+        """
+        def fail(event):
+            raise ValueError
+
+        received = []
+        self.publisher.subscribe(fail)
+        self.publisher.subscribe(received.append)
+        self.publisher.publish(self._event())
+        self.assertEqual(len(received), 1)
+
+    def test_bounded_queue(self):
+        """
+            A full queue discards its oldest events.
+        """
+        events = self.publisher.subscribe_queue(maxsize=2)
+        for destination_id in range(3):
+            self.publisher.publish(self._event(destination_id))
+
+        self.assertEqual(events.dropped, 1)
+        self.assertEqual(events.get_nowait().destination_id, 1)
+        self.assertEqual(events.get_nowait().destination_id, 2)
+        self.assertIsNone(events.get_nowait())
+
+    def test_async_iterator(self):
+        """
+            Events can be consumed with async for.
+        """
+        async def consume():
+            events = self.publisher.subscribe_async()
+            self.publisher.publish(self._event(5))
+            async for event in events:
+                return event
+
+        event = asyncio.run(consume())
+        self.assertEqual(event.destination_id, 5)
+
+    def test_wait_for_quiet(self):
+        """
+            Waiting for quiet times out while events are still recent.
+        """
+        self.publisher.publish(self._event())
+        self.assertFalse(self.publisher.wait_for_quiet(10, timeout=0.05))
+        self.publisher.last_event_time = time.time() - 10
+        self.assertTrue(self.publisher.wait_for_quiet(1, timeout=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
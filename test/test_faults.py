@@ -0,0 +1,155 @@
+"""
+    Fault injection unit tests.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import logging
+import time
+import unittest
+
+from test.context import (
+    Scenario,
+    ScenarioError,
+    FaultAction,
+    FaultInjector,
+    InProcessHub,
+    InProcessTransport,
+    Topology
+)
+
+
+class ScenarioTestSuite(unittest.TestCase):
+    """
+        Scenario parsing test suite.
+    """
+    def test_parse(self):
+        """
+            Parse every kind of action, in time order.
+        """
+        actions = Scenario.parse("""
+            # Comment
+            at 5: down 1-2
+            at 0: loss 1>2 20%   # One direction
+            at 0: delay 2-3 50ms jitter 10ms
+            at 12.5: partition 1,2 / 3
+            at 20: heal
+        """)
+
+        self.assertEqual([action.action for action in actions],
+                         ['loss', 'delay', 'down', 'partition', 'heal'])
+        self.assertEqual(actions[0].links, [(1, 2)])
+        self.assertAlmostEqual(actions[0].value, 0.2)
+        self.assertEqual(actions[1].links, [(2, 3), (3, 2)])
+        self.assertAlmostEqual(actions[1].value, 0.05)
+        self.assertAlmostEqual(actions[1].jitter, 0.01)
+        self.assertEqual(actions[3].at, 12.5)
+        self.assertEqual(actions[3].groups, [{1, 2}, {3}])
+
+    def test_invalid(self):
+        """
+            Invalid scenarios report the offending line.
+        """
+        for text in ["at 1: explode 1-2", "down 1-2", "at 1: loss 1-2",
+                     "at 1: loss 1-2 120%", "at 1: delay 1-2 fast",
+                     "at 1: partition 1,2"]:
+            with self.assertRaises(ScenarioError, msg=text) as error:
+                Scenario.parse(f"\n{text}")
+            self.assertIn("Line 2", str(error.exception))
+
+
+class FaultInjectorTestSuite(unittest.TestCase):
+    """
+        Fault injector test suite.
+    """
+    def setUp(self):
+        logger = logging.getLogger(__name__)
+        self.hub = InProcessHub()
+        self.injector = FaultInjector(logger, {2001: 2, 3001: 3}, seed=1)
+        self.sender = self.injector.wrap(
+            InProcessTransport(logger, hub=self.hub), 1)
+        self.receiver = InProcessTransport(logger, hub=self.hub)
+        self.receiver.bind(2001)
+
+    def tearDown(self):
+        self.injector.stop()
+
+    def received(self, timeout=0):
+        return len(self.receiver.poll(timeout))
+
+    def test_down_and_partition(self):
+        """
+            Packets are dropped on a down link and across a partition.
+        """
+        self.sender.send(b'packet', 2001)
+        self.assertEqual(self.received(), 1)
+
+        self.injector.apply(FaultAction(0, 'down', [(1, 2)]))
+        self.sender.send(b'packet', 2001)
+        self.assertEqual(self.received(), 0)
+        self.injector.apply(FaultAction(0, 'up', [(1, 2)]))
+
+        self.injector.apply(FaultAction(0, 'partition', groups=[{1}, {2}]))
+        self.sender.send(b'packet', 2001)
+        self.assertEqual(self.received(), 0)
+        self.injector.apply(FaultAction(0, 'heal'))
+        self.sender.send(b'packet', 2001)
+        self.assertEqual(self.received(), 1)
+        self.assertEqual(self.injector.counters['dropped'], 2)
+
+    def test_loss(self):
+        """
+            A lossy link drops about the given fraction of packets.
+        """
+        self.injector.apply(FaultAction(0, 'loss', [(1, 2)], 0.5))
+        for _ in range(1000):
+            self.sender.send(b'packet', 2001)
+        self.assertGreater(self.received(), 400)
+        self.assertGreater(self.injector.counters['dropped'], 400)
+
+    def test_delay(self):
+        """
+            Delayed packets arrive after the delay.
+        """
+        self.injector.apply(FaultAction(0, 'delay', [(1, 2)], 0.05))
+        sent = time.time()
+        self.sender.send(b'packet', 2001)
+        self.assertEqual(self.received(), 0)
+        self.assertEqual(self.received(1000), 1)
+        self.assertGreaterEqual(time.time() - sent, 0.04)
+
+    def test_delay_after_close(self):
+        """
+            Packets still delayed when the sender closes are discarded.
+        """
+        self.injector.apply(FaultAction(0, 'delay', [(1, 2)], 0.05))
+        self.sender.send(b'packet', 2001)
+        self.sender.close()
+        self.assertEqual(self.received(0.2), 0)
+        self.assertEqual(self.injector.counters['send_errors'], 0)
+
+    def test_play(self):
+        """
+            A scenario played at speed applies its actions in time.
+        """
+        injector = FaultInjector(logging.getLogger(__name__), {}, speed=100)
+        injector.play(Scenario.parse("at 0: down 1-2\nat 5: up 1-2"))
+        self.assertTrue(injector.wait(1))
+
+    def test_impaired_topology(self):
+        """
+            Down and partitioned links are left out of the topology.
+        """
+        topology = Topology()
+        for router_id, peers in {1: [2, 3], 2: [1, 3], 3: [1, 2]}.items():
+            topology.add_router(router_id, [], {
+                peer_id: {'port': 0, 'metric': 1} for peer_id in peers})
+
+        self.injector.apply(FaultAction(0, 'down', [(1, 2)]))
+        self.injector.apply(FaultAction(0, 'partition',
+                                        groups=[{1, 2}, {3}]))
+        impaired = self.injector.impaired_topology(topology)
+        self.assertEqual(impaired.links, {1: {}, 2: {}, 3: {}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+    Ingress rate limiting and backlog unit tests.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import unittest
+
+from test.context import (
+    TokenBucket,
+    IngressQueue,
+    RIPPacket,
+    RIPEntry,
+    PacketCommands
+)
+
+
+def packet(router_id, first_id, metric=1):
+    return RIPPacket.construct(PacketCommands.RESPONSE, router_id,
+                               [RIPEntry(id=first_id, metric=metric)])
+
+
+class TokenBucketTestSuite(unittest.TestCase):
+    """
+        Token bucket test suite.
+    """
+    def test_burst_then_rate(self):
+        """
+            A burst is allowed, then packets at the refill rate.
+        """
+        bucket = TokenBucket(rate=10, burst=3)
+        now = bucket._updated
+        self.assertEqual([bucket.consume(now) for _ in range(4)],
+                         [True, True, True, False])
+        self.assertTrue(bucket.consume(now + 0.15))
+        self.assertFalse(bucket.consume(now + 0.15))
+
+
+class IngressQueueTestSuite(unittest.TestCase):
+    """
+        Ingress backlog test suite.
+    """
+    def test_sheds_superseded_packets(self):
+        """
+            A full backlog sheds the oldest packet that a newer packet from
+            the same peer supersedes.
+        """
+        backlog = IngressQueue(maxsize=3)
+        backlog.push(1, packet(1, 5, metric=1))
+        backlog.push(2, packet(2, 5))
+        backlog.push(1, packet(1, 5, metric=2))
+        backlog.push(3, packet(3, 5))
+
+        self.assertEqual(backlog.shed, 1)
+        self.assertEqual([backlog.pop()[0] for _ in range(len(backlog))],
+                         [2, 1, 3])
+
+    def test_sheds_oldest(self):
+        """
+            Without superseded packets, the oldest packet is shed.
+        """
+        backlog = IngressQueue(maxsize=2)
+        backlog.push(1, packet(1, 5))
+        backlog.push(1, packet(1, 6))  # A different part of the update
+        backlog.push(2, packet(2, 5))
+
+        self.assertEqual(backlog.shed, 1)
+        self.assertEqual(RIPPacket.parse(backlog.pop()[1])[2][0].id, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -81,6 +81,73 @@ class InterfaceTestSuite(unittest.TestCase):
         interface2.close_sockets()
         interface3.close_sockets()
 
+    def test_bind_and_unbind_port(self):
+        """
+            Bind an extra port on a running interface, then unbind it.
+        """
+        interface1 = Interface(self.logger,
+                               INTERFACE1_INCOMING_PORTS,
+                               BIND)
+        interface2 = Interface(self.logger,
+                               INTERFACE2_INCOMING_PORTS,
+                               BIND)
+
+        try:
+            interface2.bind_port(8089)
+            interface1.unicast(b'Hello!', 8089)
+            data = []
+            while data == []:
+                data = interface2.poll_incoming_ports()
+            self.assertEqual(data[0][0], b'Hello!')
+
+            # Once unbound, the port is free to bind again
+            interface2.unbind_port(8089)
+            interface1.bind_port(8089)
+        finally:
+            interface1.close_sockets()
+            interface2.close_sockets()
+
+    def test_unreachable_peer(self):
+        """
+            Sending to a closed port is counted, and does not stop the
+            router.
+        """
+        interface1 = Interface(self.logger,
+                               INTERFACE1_INCOMING_PORTS,
+                               BIND)
+        try:
+            # The second send reports the ICMP error from the first
+            self.assertTrue(interface1.unicast(b'Hello!', 8089))
+            self.assertFalse(interface1.unicast(b'Hello!', 8089))
+            self.assertEqual(interface1.counters['unreachable'], 1)
+        finally:
+            interface1.close_sockets()
+
+    def test_batched_send(self):
+        """
+            Queued packets are all sent by a single flush.
+        """
+        interface1 = Interface(self.logger,
+                               INTERFACE1_INCOMING_PORTS,
+                               BIND)
+        interface2 = Interface(self.logger,
+                               INTERFACE2_INCOMING_PORTS,
+                               BIND)
+
+        try:
+            for port in INTERFACE2_INCOMING_PORTS:
+                interface1.queue(b'Hello!', port)
+            self.assertEqual(interface1.flush(), 0)
+            self.assertEqual(interface1.counters['sent'], 3)
+
+            data = []
+            while len(data) < 3:
+                data += interface2.poll_incoming_ports()
+            self.assertEqual([packet[0] for packet in data], [b'Hello!'] * 3)
+        finally:
+            interface1.close_sockets()
+            interface2.close_sockets()
+
 
 if __name__ == '__main__':
     unittest.main()
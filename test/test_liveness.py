@@ -0,0 +1,48 @@
+"""
+    Neighbour liveness detection unit tests.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import unittest
+
+from test.context import NeighbourLiveness
+
+
+class NeighbourLivenessTestSuite(unittest.TestCase):
+    """
+        Neighbour liveness test suite.
+    """
+    def setUp(self):
+        self.liveness = NeighbourLiveness(multiplier=3)
+
+    def test_peer_down_after_missed_hellos(self):
+        """
+            A peer is declared down once, after multiplier of its own hello
+            intervals pass without a hello.
+        """
+        self.assertFalse(self.liveness.heard(2, 0.1, now=0))
+        self.assertFalse(self.liveness.heard(2, 0.1, now=0.1))
+        self.assertAlmostEqual(self.liveness.next_deadline(), 0.4)
+
+        self.assertEqual(self.liveness.expired(now=0.35), [])
+        self.assertEqual(self.liveness.expired(now=0.4), [2])
+        self.assertEqual(self.liveness.expired(now=1), [])
+        self.assertEqual(self.liveness.down, {2})
+        self.assertIsNone(self.liveness.next_deadline())
+
+        # A hello brings the peer back up
+        self.assertTrue(self.liveness.heard(2, 0.1, now=2))
+        self.assertEqual(self.liveness.down, set())
+
+    def test_untracked_peers(self):
+        """
+            Peers that never sent a hello, or were forgotten, are never
+            declared down.
+        """
+        self.liveness.heard(2, 0.1, now=0)
+        self.liveness.forget(2)
+        self.assertEqual(self.liveness.expired(now=10), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+    Routing table mirror unit tests.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+
+from test.context import (
+    TableMirror,
+    TableMirrorReader,
+    MirrorError,
+    RouteTable,
+    Prefix
+)
+
+
+class TableMirrorTestSuite(unittest.TestCase):
+    """
+        Routing table mirror test suite.
+    """
+    def setUp(self):
+        self.logger = logging.getLogger(__name__)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'table.mirror')
+        self.table = RouteTable(self.logger, 1, timeout=6,
+                                garbage_collection_time=3)
+        self.table.add_route(2, 2, 1)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_mirror(self):
+        """
+            Readers see the table as of the last flush, including routes
+            added, changed and removed.
+        """
+        mirror = TableMirror(self.logger, self.path, self.table, 1)
+        reader = TableMirrorReader(self.path)
+        snapshot = reader.read()
+        self.assertEqual(snapshot.router_id, 1)
+        self.assertEqual(list(snapshot.routes), [2])
+
+        prefix = Prefix(0x0A010000, 16)
+        self.table.add_route(5, 2, 3)
+        self.table.add_route(prefix, 2, 2)
+        self.assertEqual(len(reader.read().routes), 1)  # Not yet flushed
+        self.assertEqual(mirror.flush(), 2)
+        self.assertEqual(mirror.flush(), 0)
+        routes = reader.read().routes
+        self.assertEqual(routes[prefix].metric, 2)
+        self.assertEqual((routes[5].next_hop, routes[5].metric), (2, 3))
+
+        # Removed routes free their record for the next new route
+        self.table.update_route(5, 16)
+        self.table.remove_route(prefix)
+        mirror.flush()
+        routes = reader.read().routes
+        self.assertEqual(routes[5].metric, 16)
+        self.assertNotIn(prefix, routes)
+        self.table.add_route(6, 2, 4)
+        mirror.flush()
+        self.assertEqual(sorted(reader.read().routes), [2, 5, 6])
+
+        mirror.close()
+        self.assertRaises(MirrorError, reader.read)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_growth(self):
+        """
+            A full mirror is replaced by a larger one, which readers
+            follow.
+        """
+        mirror = TableMirror(self.logger, self.path, self.table, 1,
+                             capacity=2)
+        reader = TableMirrorReader(self.path)
+        for destination in range(3, 10):
+            self.table.add_route(destination, 2, 3)
+            mirror.flush()
+        self.assertEqual(sorted(reader.read().routes), list(range(2, 10)))
+        mirror.close()
+        reader.close()
+
+    def test_write_in_progress(self):
+        """
+            Readers wait out a write, and give up if it never finishes.
+        """
+        mirror = TableMirror(self.logger, self.path, self.table, 1)
+        reader = TableMirrorReader(self.path)
+        sequence = reader.read().sequence
+        mirror._begin_write()
+        self.assertRaises(MirrorError, reader.read, timeout=0.05)
+        mirror._end_write(0)
+        self.assertEqual(reader.read().sequence, sequence + 2)
+        mirror.close()
+        reader.close()
+
+    def test_invalid(self):
+        """
+            Missing and unrecognised files are refused.
+        """
+        self.assertRaises(MirrorError, TableMirrorReader, self.path)
+        with open(self.path, 'wb') as mirror:
+            mirror.write(bytes(64))
+        self.assertRaises(MirrorError, TableMirrorReader, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
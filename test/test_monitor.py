@@ -0,0 +1,108 @@
+"""
+    Main loop monitor unit tests.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import logging
+import unittest
+
+from test.context import LoopMonitor, RouteTable
+
+STALL_HISTORY = 10
+
+
+class LoopMonitorTestSuite(unittest.TestCase):
+    """
+        Loop monitor test suite.
+    """
+    def setUp(self):
+        self.logger = logging.getLogger(__name__)
+        self.monitor = LoopMonitor(self.logger, slip_warning=0.5)
+
+    def test_timer_slippage(self):
+        """
+            Slippage is measured from the scheduled time, and firings
+            beyond the threshold are counted and logged once per interval.
+        """
+        self.assertAlmostEqual(self.monitor.fired('update', 10, now=10.1), 0.1)
+        self.assertEqual(self.monitor.fired('update', 20, now=19.9), 0)
+        with self.assertLogs(self.logger, logging.WARNING) as logs:
+            self.monitor.fired('update', 30, now=31)
+            self.monitor.fired('update', 32, now=33)
+        self.assertEqual(len(logs.output), 1)
+
+        stats = self.monitor.get_stats()['timers']['update']
+        self.assertEqual((stats['fired'], stats['late']), (4, 2))
+        self.assertAlmostEqual(stats['max_slip'], 1)
+        self.assertAlmostEqual(stats['mean_slip'], 2.1 / 4)
+
+    def test_no_warnings(self):
+        """
+            A threshold of 0 counts no firing as late.
+        """
+        self.monitor.set_slip_warning(0)
+        self.monitor.fired('update', 0, now=100)
+        stats = self.monitor.get_stats()['timers']['update']
+        self.assertEqual(stats['late'], 0)
+
+    def test_stalls(self):
+        """
+            Iterations are timed between polls, and the longest are kept
+            with the timers that fired during them.
+        """
+        self.monitor.iteration_finished(now=1)  # Before the first poll
+        for i in range(STALL_HISTORY + 5):
+            self.monitor.iteration_started(now=i)
+            if i == 3:
+                self.monitor.fired('hello', 0, now=0)
+            self.monitor.iteration_finished(now=i + (i % 7) / 100)
+
+        stats = self.monitor.get_stats()
+        self.assertEqual(stats['iterations'], STALL_HISTORY + 5)
+        self.assertAlmostEqual(stats['max_iteration'], 0.06)
+        self.assertEqual(len(stats['stalls']), STALL_HISTORY)
+        durations = [stall['duration'] for stall in stats['stalls']]
+        self.assertEqual(durations, sorted(durations, reverse=True))
+        [hello] = [stall for stall in stats['stalls'] if stall['timers']]
+        self.assertEqual(hello['timers'], ['hello'])
+        self.assertAlmostEqual(hello['duration'], 0.03)
+
+    def test_route_timers(self):
+        """
+            The routing table reports how late route timeouts and garbage
+            collection fire.
+        """
+        table = RouteTable(self.logger, 1, timeout=6,
+                           garbage_collection_time=3)
+        table.set_monitor(self.monitor)
+        table.add_route(5, 2, 3)
+        table.routes[5].timeout -= 6.2
+        table.check_for_timeouts()
+        table.routes[5].timeout -= 3
+        table.check_for_timeouts()
+
+        timers = self.monitor.get_stats()['timers']
+        self.assertAlmostEqual(timers['route_timeout']['last_slip'], 0.2,
+                               places=2)
+        self.assertAlmostEqual(timers['garbage_collection']['last_slip'],
+                               0.2, places=2)
+        self.assertNotIn(5, table.routes)
+
+    def test_restored_route_timers(self):
+        """
+            Routes restored from a snapshot time out on schedule, rather
+            than reporting the router's downtime as slippage.
+        """
+        table = RouteTable(self.logger, 1, timeout=6,
+                           garbage_collection_time=3)
+        table.set_monitor(self.monitor)
+        table.restore_route(5, 2, 3, grace=0)
+        table.check_for_timeouts()
+
+        timers = self.monitor.get_stats()['timers']
+        self.assertLess(timers['route_timeout']['last_slip'], 0.1)
+        self.assertEqual(timers['route_timeout']['late'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+    Shortest path oracle unit tests.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import glob
+import logging
+import os
+import tempfile
+import unittest
+
+from test.context import (
+    Topology,
+    ShortestPathOracle,
+    ConvergenceDetector,
+    RouteTable,
+    Prefix
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ShortestPathOracleTestSuite(unittest.TestCase):
+    """
+        Shortest path oracle test suite.
+    """
+    def setUp(self):
+        self.logger = logging.getLogger(__name__)
+        config_dir = os.path.join(os.path.dirname(__file__), '..', 'config')
+        self.topology = Topology.from_config_files(
+            self.logger, sorted(glob.glob(os.path.join(config_dir, '*.ini'))))
+        self.oracle = ShortestPathOracle(self.topology, 'dijkstra')
+
+    def test_example_network(self):
+        """
+            Check a few converged metrics of the example network.
+        """
+        self.assertEqual(self.oracle.expected_metric(1, 4), 8)
+        self.assertEqual(self.oracle.expected_metric(7, 3), 10)
+        self.assertEqual(self.oracle.tables[1][4][1], {2, 6})  # Tie
+
+    def test_metric_cap(self):
+        """
+            Destinations 16 or more away are unreachable.
+        """
+        topology = Topology()
+        for router_id in range(1, 4):
+            peers = {peer_id: {'port': 0, 'metric': 8}
+                     for peer_id in (router_id - 1, router_id + 1)
+                     if 1 <= peer_id <= 3}
+            topology.add_router(router_id, [], peers)
+
+        oracle = ShortestPathOracle(topology, 'dijkstra')
+        self.assertEqual(oracle.expected_metric(1, 2), 8)
+        self.assertEqual(oracle.expected_metric(1, 3), 16)
+        self.assertNotIn(3, oracle.tables[1])
+
+    def test_advertisement_poisoning(self):
+        """
+            Routes through the receiving peer are advertised at 16.
+        """
+        advertisement = self.oracle.expected_advertisement(1, 2)
+        self.assertEqual(advertisement[1], 0)
+        self.assertEqual(advertisement[3], 16)  # Via router 2
+        self.assertEqual(advertisement[5], 6)   # Via router 6
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_methods_agree(self):
+        """
+            Dijkstra and Floyd-Warshall give the same tables.
+        """
+        topology = Topology.generate(50, degree=3, seed=1)
+        self.assertEqual(
+            ShortestPathOracle(topology, 'dijkstra').tables,
+            ShortestPathOracle(topology, 'floyd-warshall').tables)
+
+    def test_generated_configs(self):
+        """
+            Generated configuration files describe the generated topology.
+        """
+        topology = Topology.generate(10, degree=3, seed=2)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = topology.write_configs(directory)
+            loaded = Topology.from_config_files(self.logger,
+                                                paths.values())
+        self.assertEqual(loaded.links, topology.links)
+        self.assertEqual(loaded.peer_ports, topology.peer_ports)
+
+    def test_networks(self):
+        """
+            Attached networks are reached through the nearest router they
+            are attached to.
+        """
+        network = Prefix(0x0A010000, 16)
+        topology = self.topology.subset([1, 2, 3])
+        topology.networks[1] = topology.networks[3] = [network]
+        oracle = ShortestPathOracle(topology, 'dijkstra')
+
+        self.assertNotIn(network, oracle.tables[1])
+        self.assertEqual(oracle.tables[2][network],
+                         (min(topology.links[2][1], topology.links[2][3]),
+                          {1}))
+        self.assertEqual(oracle.expected_advertisement(1, 2)[network], 0)
+
+    def test_convergence_detector(self):
+        """
+            The detector reports convergence once the tables match.
+        """
+        topology = self.topology.subset([1, 2])
+        oracle = ShortestPathOracle(topology, 'dijkstra')
+        tables = {1: RouteTable(self.logger, 1), 2: RouteTable(self.logger, 2)}
+        detector = ConvergenceDetector(oracle, tables)
+        self.assertFalse(detector.wait(0))
+
+        tables[1].add_route(destination_id=2, next_hop_id=2, metric=1)
+        self.assertFalse(detector.wait(0))
+        tables[2].add_route(destination_id=1, next_hop_id=1, metric=1)
+        self.assertTrue(detector.wait(0))
+        self.assertEqual(detector.divergences(), [])
+
+        # Once closed, the detector no longer follows the tables
+        detector.close()
+        tables[2].remove_route(1)
+        self.assertTrue(detector.wait(0))
+        self.assertEqual(len(detector.divergences()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
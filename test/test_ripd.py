@@ -0,0 +1,263 @@
+"""
+    RIP Daemon packet handling unit tests. The daemon is not started; packets
+    are handed straight to its handlers.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import logging
+import os
+import threading
+import time
+import unittest
+
+from test.context import (
+    RIPDaemon,
+    RIPPacket,
+    RIPEntry,
+    PacketCommands,
+    Parameters,
+    InProcessHub,
+    InProcessTransport
+)
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', '1.ini')
+
+
+class RecordingInterface:
+    """
+        Stands in for the interface, recording the packets sent.
+    """
+    def __init__(self):
+        self.sent = []
+
+    def queue(self, packet, port):
+        self.sent.append((port, RIPPacket.parse(packet)))
+
+    def flush(self):
+        return 0
+
+    def get_stats(self):
+        return {}
+
+
+class RIPDaemonTestSuite(unittest.TestCase):
+    """
+        RIP Daemon test suite, as router 1 of the example network.
+    """
+    def setUp(self):
+        self.router = RIPDaemon(CONFIG, log_level=logging.WARNING)
+        self.router._interface = RecordingInterface()
+
+    def response(self, router_id, entries):
+        return RIPPacket.construct(PacketCommands.RESPONSE, router_id,
+                                   [RIPEntry(id=destination_id, metric=metric)
+                                    for destination_id, metric in entries])
+
+    def test_unknown_peer(self):
+        """
+            Packets from routers that are not peers are dropped before
+            parsing.
+        """
+        self.router._accept_packet(self.response(9, [(5, 1)]))
+        self.assertEqual(len(self.router._backlog), 0)
+        self.assertEqual(self.router.get_metrics()['ingress']['unknown_peer'],
+                         1)
+
+    def test_fast_path(self):
+        """
+            A repeated response only refreshes routes, until the table
+            changes.
+        """
+        packet = self.response(2, [(2, 0), (5, 3)])
+        self.router._process_packet(2, packet)
+        self.router._process_packet(2, packet)
+        self.assertEqual(self.router._table.get_entry(5).metric, 4)
+        self.assertEqual(self.router.get_metrics()['ingress']['fast_path'],
+                         0)  # The first response changed the table
+
+        self.router._process_packet(2, packet)
+        self.assertEqual(self.router.get_metrics()['ingress']['fast_path'],
+                         1)
+
+        # Once the route times out, the same response is applied in full
+        self.router._table.invalidate_next_hop(2)
+        self.router._process_packet(2, packet)
+        self.assertEqual(self.router._table.get_entry(5).metric, 4)
+
+    def test_fast_path_hold_down(self):
+        """
+            A better route ignored while held down is installed when the
+            same response is repeated after the hold-down expires.
+        """
+        self.router._table.set_loop_prevention('split_horizon', 0.3)
+        self.router._process_packet(2, self.response(2, [(2, 0), (5, 3)]))
+        self.router._process_packet(2, self.response(2, [(2, 0), (5, 16)]))
+
+        packet = self.response(6, [(6, 0), (5, 1)])
+        self.router._process_packet(6, packet)
+        self.router._process_packet(6, packet)
+        self.assertEqual(self.router._table.get_entry(5).next_hop_id, 2)
+
+        time.sleep(0.35)
+        self.router._process_packet(6, packet)
+        entry = self.router._table.get_entry(5)
+        self.assertEqual((entry.next_hop_id, entry.metric), (6, 6))
+        self.assertEqual(self.router.get_metrics()['ingress']['fast_path'],
+                         0)
+
+    def test_adaptive_update_interval(self):
+        """
+            The update interval grows while the table is stable, up to the
+            ceiling, and is advertised so peers time routes out later.
+        """
+        self.router._max_periodic_update_time = 20
+        events = self.router._table.events
+        events.last_event_time = time.time() - 100
+        self.assertEqual(self.router._adaptive_update_time(), 20)
+        events.last_event_time = time.time()
+        self.assertEqual(self.router._adaptive_update_time(), 2)
+
+        # The advertised interval is rounded up to whole base intervals,
+        # so it stays the same from one update to the next
+        events.last_event_time = time.time() - 100
+        parameter, = self.router._update_parameters(2)
+        self.assertEqual(parameter.id, Parameters.UPDATE_INTERVAL)
+        self.assertEqual(parameter.metric, 20000)
+        events.last_event_time = time.time() - 7
+        self.assertEqual(self.router._update_parameters(2)[0].metric, 4000)
+        self.router._periodic_update_jitter = 0.15
+        self.assertEqual(self.router._update_parameters(2)[0].metric, 6000)
+        packets = [self.router._table.get_packets(
+            2, parameters=self.router._update_parameters(2))
+            for _ in range(2)]
+        self.assertEqual(packets[0], packets[1])
+        events.last_event_time = time.time()
+
+        # A change to the table brings the next update forward
+        self.router._process_packet(2, self.response(2, [(5, 3)]))
+        self.assertLessEqual(self.router._next_periodic_update,
+                             time.time() + 2)
+
+    def test_peer_update_interval(self):
+        """
+            Routes through a peer advertising a longer update interval time
+            out proportionally later, until it stops advertising one.
+        """
+        packet = RIPPacket.construct(
+            PacketCommands.RESPONSE, 2,
+            [RIPEntry.parameter(Parameters.UPDATE_INTERVAL, 10000),
+             RIPEntry(id=5, metric=3)])
+        self.router._process_packet(2, packet)
+        entry = self.router._table.get_entry(5)
+        self.assertEqual(entry.metric, 4)
+        self.assertEqual(self.router._table._timeout_of(entry), 30)
+
+        self.router._process_packet(2, self.response(2, [(5, 3)]))
+        self.assertEqual(self.router._table._timeout_of(entry), 6)
+
+    def test_whole_table_request(self):
+        """
+            A request for the whole table is answered straight away, with
+            an update to the requesting peer alone.
+        """
+        self.router._process_packet(2, self.response(2, [(5, 3)]))
+        self.router._process_packet(6, RIPPacket.request(6))
+
+        (port, (command, router_id, entries)), = \
+            self.router._interface.sent
+        self.assertEqual(port, 8681)
+        self.assertEqual(command, PacketCommands.RESPONSE)
+        self.assertEqual(router_id, 1)
+        self.assertEqual({entry.id: entry.metric for entry in entries},
+                         {1: 0, 5: 4})
+
+    def test_specific_request(self):
+        """
+            A request for particular destinations is answered with their
+            metrics, without poisoned reverse.
+        """
+        self.router._process_packet(2, self.response(2, [(5, 3)]))
+        self.router._process_packet(2, RIPPacket.request(
+            2, [RIPEntry(id=5, metric=16), RIPEntry(id=9, metric=16)]))
+
+        (port, (_, _, entries)), = self.router._interface.sent
+        self.assertEqual(port, 8281)
+        self.assertEqual([(entry.id, entry.metric) for entry in entries],
+                         [(5, 4), (9, 16)])
+
+    def test_peer_reappears(self):
+        """
+            A peer heard from again after a timeout is asked for its table.
+        """
+        self.router._process_packet(2, self.response(2, [(5, 3)]))
+        self.assertEqual(self.router._interface.sent, [])
+
+        self.router._peer_last_heard[2] -= 10
+        self.router._process_packet(2, self.response(2, [(5, 3)]))
+        (port, (command, _, entries)), = self.router._interface.sent
+        self.assertEqual(port, 8281)
+        self.assertEqual(command, PacketCommands.REQUEST)
+        self.assertTrue(entries[0].is_whole_table)
+
+    def test_graceful_stop(self):
+        """
+            Stopping the daemon withdraws its routes from every peer, while
+            clearing _run exits without telling them.
+        """
+        logger = logging.getLogger(__name__)
+        hub = InProcessHub()
+        peer = InProcessTransport(logger, hub=hub)
+        peer.bind(8281)  # Router 2
+
+        for graceful in (False, True):
+            router = RIPDaemon(CONFIG, log_level=logging.WARNING,
+                               transport=InProcessTransport(logger, hub=hub))
+            thread = threading.Thread(target=router.start, daemon=True)
+            thread.start()
+            time.sleep(0.2)
+            peer.poll(0)  # Discard the request and first update
+
+            if graceful:
+                router.stop()
+            else:
+                router._run = False
+            thread.join(timeout=5)
+
+            entries = [RIPPacket.parse(data)[2]
+                       for data, _ in peer.poll(0)]
+            self.assertEqual(bool(entries), graceful)
+            if graceful:
+                self.assertEqual([(entry.id, entry.metric)
+                                  for entry in entries[0]], [(1, 16)])
+        peer.close()
+
+    def test_hellos(self):
+        """
+            A peer that stops sending hellos has its routes invalidated, and
+            is asked for its table when it comes back.
+        """
+        self.router._hello_interval = 0.05
+        self.router._process_packet(2, self.response(2, [(5, 3)]))
+        self.router._accept_packet(RIPPacket.hello(2, 0.05))
+        self.assertEqual(len(self.router._backlog), 0)
+
+        # The first hello starts tracking the peer
+        sent = self.router._interface.sent
+        self.assertEqual(sent, [])
+
+        self.router._check_liveness()
+        self.assertEqual(self.router._table.get_entry(5).metric, 4)
+        time.sleep(0.2)
+        self.router._check_liveness()
+        self.assertEqual(self.router._table.get_entry(5).metric, 16)
+        self.assertEqual(self.router.get_metrics()['down_peers'], [2])
+
+        sent.clear()
+        self.router._accept_packet(RIPPacket.hello(2, 0.05))
+        self.assertEqual([(port, command) for port, (command, _, _) in sent],
+                         [(8281, PacketCommands.REQUEST)])
+        self.assertEqual(self.router.get_metrics()['down_peers'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+    Routing table snapshot unit tests.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import logging
+import os
+import tempfile
+import time
+import unittest
+
+from test.context import (
+    RouteTable,
+    RIPPacket,
+    TableSnapshot,
+    SnapshotError,
+    Prefix,
+    HEADER,
+    RECORD_V1,
+    SNAPSHOT_MAGIC
+)
+
+
+class TableSnapshotTestSuite(unittest.TestCase):
+    """
+        Routing table snapshot test suite.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'table.snapshot')
+        self.table = RouteTable(logging.getLogger(__name__), router_id=1)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """
+            Save a table, then load it back.
+        """
+        timeout = time.time()
+        self.table.add_route(destination_id=3, next_hop_id=2, metric=4,
+                             timeout=timeout)
+        self.table.add_route(destination_id=4, next_hop_id=2, metric=16,
+                             garbage_collection_timer=True)
+        TableSnapshot.save(self.path, 1, self.table.routes.values())
+
+        records = TableSnapshot.load(self.path, 1)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0], (3, 2, 4, 0, timeout))
+        self.assertEqual(records[1][3], 1)  # Garbage collection flag
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+    def test_prefixes(self):
+        """
+            Prefix destinations keep their prefix length.
+        """
+        self.table.add_route(destination_id=Prefix(0x0A010000, 16),
+                             next_hop_id=2, metric=4)
+        TableSnapshot.save(self.path, 1, self.table.routes.values())
+        self.assertEqual(TableSnapshot.load(self.path, 1)[0][0],
+                         Prefix(0x0A010000, 16))
+
+    def test_version_1(self):
+        """
+            Snapshots from before prefixes were supported still load.
+        """
+        with open(self.path, 'wb') as snapshot:
+            snapshot.write(HEADER.pack(SNAPSHOT_MAGIC, 1, 1, 1, time.time()))
+            snapshot.write(RECORD_V1.pack(3, 2, 4, 0, 10.0))
+        self.assertEqual(TableSnapshot.load(self.path, 1),
+                         [(3, 2, 4, 0, 10.0)])
+
+    def test_wrong_router(self):
+        """
+            A snapshot must not be loaded by a different router.
+        """
+        TableSnapshot.save(self.path, 1, [])
+        self.assertRaises(SnapshotError, TableSnapshot.load, self.path, 2)
+
+    def test_corrupt_snapshot(self):
+        """
+            A truncated snapshot is rejected.
+        """
+        self.table.add_route(destination_id=3, next_hop_id=2, metric=4)
+        TableSnapshot.save(self.path, 1, self.table.routes.values())
+        with open(self.path, 'r+b') as snapshot:
+            snapshot.truncate(os.path.getsize(self.path) - 1)
+        self.assertRaises(SnapshotError, TableSnapshot.load, self.path, 1)
+
+    def test_restored_routes_revalidate(self):
+        """
+            Restored routes are not advertised until an update from their
+            next hop confirms them.
+        """
+        self.table.restore_route(3, 2, 4, grace=2)
+        self.assertTrue(self.table.get_entry(3).revalidate)
+        self.assertEqual(self.advertised(), [1])
+        self.assertEqual(self.table.get_metric(3), 16)
+
+        self.table.update_route(3, 4)
+        self.assertFalse(self.table.get_entry(3).revalidate)
+        self.assertEqual(self.advertised(), [1, 3])
+
+    def test_restored_routes_grace(self):
+        """
+            Unconfirmed restored routes time out after the grace period,
+            however old they were.
+        """
+        self.table.restore_route(3, 2, 4, grace=2)
+        self.assertFalse(self.table.check_for_timeouts())
+        self.table.get_entry(3).timeout -= 2
+        self.table.check_for_timeouts()
+        self.assertEqual(self.table.get_entry(3).metric, 16)
+
+    def advertised(self):
+        """
+            :returns: Destinations advertised to router 2.
+        """
+        return [entry.destination for packet in self.table.get_packets(2)
+                for entry in RIPPacket.parse(packet)[2]]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,7 +11,10 @@ from test.context import (
     RIPEntry,
     PacketParseError,
     PacketCommandError,
-    PacketVersionError
+    PacketVersionError,
+    Prefix,
+    Parameters,
+    parse_destination
 )
 
 HEADER_LENGTH = 4
@@ -50,6 +53,23 @@ class RIPEntryTestSuite(unittest.TestCase):
             (1).to_bytes(4, byteorder='big')
         )  # Metric should be 1, big endian
 
+    def test_prefix(self):
+        """
+            Test a prefix entry carries its subnet mask, and a host entry
+            carries a mask of 0.
+        """
+        destination = parse_destination('10.1.0.0/16')
+        self.assertEqual(destination, Prefix(0x0A010000, 16))
+        self.assertEqual(parse_destination('10.1.2.3/32'), 0x0A010203)
+        self.assertRaises(ValueError, parse_destination, '10.1.0/16')
+
+        entry = RIPEntry.for_destination(destination, 2)
+        packet = entry.as_packet()
+        self.assertEqual(packet[4:8], bytes([10, 1, 0, 0]))
+        self.assertEqual(packet[8:12], bytes([255, 255, 0, 0]))
+        self.assertEqual(RIPEntry.for_destination(5, 2).as_packet()[8:12],
+                         bytes(4))
+
 
 class RIPPacketTestSuite(unittest.TestCase):
     """
@@ -96,6 +116,65 @@ class RIPPacketTestSuite(unittest.TestCase):
         self.assertEqual(entries[1].id, entry2.id)
         self.assertEqual(entries[1].metric, entry2.metric)
 
+    def test_prefix_parsing(self):
+        """
+            Prefix entries parse back into prefixes, and invalid subnet masks
+            are rejected.
+        """
+        packet = RIPPacket.construct(
+            router_id=1, command=PacketCommands.RESPONSE,
+            entries=[RIPEntry.for_destination(Prefix(0x0A010000, 16), 1),
+                     RIPEntry(id=3, metric=1)])
+
+        _, _, entries = RIPPacket.parse(packet)
+        self.assertEqual(entries[0].destination, Prefix(0x0A010000, 16))
+        self.assertEqual(entries[1].destination, 3)
+
+        packet[12:16] = bytes([255, 0, 255, 0])  # Non-contiguous mask
+        self.assertRaises(PacketParseError, RIPPacket.parse, packet)
+
+    def test_parameter_parsing(self):
+        """
+            Parameter entries parse back with their address family, and are
+            not mistaken for routes.
+        """
+        packet = RIPPacket.construct(
+            router_id=1, command=PacketCommands.RESPONSE,
+            entries=[RIPEntry.parameter(Parameters.UPDATE_INTERVAL, 30000),
+                     RIPEntry(id=3, metric=1)])
+
+        _, _, entries = RIPPacket.parse(packet)
+        self.assertTrue(entries[0].is_parameter)
+        self.assertEqual(entries[0].id, Parameters.UPDATE_INTERVAL)
+        self.assertEqual(entries[0].metric, 30000)
+        self.assertFalse(entries[1].is_parameter)
+
+    def test_request_parsing(self):
+        """
+            Requests parse back with their entries, and a request for the
+            whole table is recognised.
+        """
+        command, router_id, entries = RIPPacket.parse(RIPPacket.request(4))
+        self.assertEqual(command, PacketCommands.REQUEST)
+        self.assertEqual(router_id, 4)
+        self.assertEqual(len(entries), 1)
+        self.assertTrue(entries[0].is_whole_table)
+
+        _, _, entries = RIPPacket.parse(
+            RIPPacket.request(4, [RIPEntry(id=3, metric=16)]))
+        self.assertEqual(entries[0].destination, 3)
+        self.assertFalse(entries[0].is_whole_table)
+
+    def test_hello_parsing(self):
+        """
+            Hellos parse back with the sender's hello interval.
+        """
+        command, router_id, entries = RIPPacket.parse(RIPPacket.hello(4, 0.05))
+        self.assertEqual(command, PacketCommands.HELLO)
+        self.assertEqual(router_id, 4)
+        self.assertEqual([(entry.id, entry.metric) for entry in entries],
+                         [(Parameters.HELLO_INTERVAL, 50)])
+
     def test_parse_invalid_packet(self):
         """
             Test the parsing of an invalid packet.
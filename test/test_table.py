@@ -1,3 +1,4 @@
+import random
 import unittest
 import time
 import logging
@@ -5,7 +6,13 @@ from test.context import (
     RouteEntry,
     RouteTable,
     RIPEntry,
-    RIPPacket
+    RIPPacket,
+    RouteEventTypes,
+    Prefix,
+    PrefixTrie,
+    Parameters,
+    parse_destination,
+    mask_of_length
 )
 
 
@@ -93,6 +100,36 @@ class TestRouteTable(unittest.TestCase):
         self.assertEqual(entries[2].id, 2)
         self.assertEqual(entries[2].metric, 2)
 
+    def test_get_packets(self):
+        """
+            Test that large tables are split into packets of at most 25
+            entries.
+        """
+        for destination_id in range(1, 31):
+            self.table.add_route(destination_id=destination_id,
+                                 next_hop_id=2, metric=1)
+
+        packets = self.table.get_packets(destination_router_id=3)
+        entries = [RIPPacket.parse(packet)[2] for packet in packets]
+        self.assertEqual([len(e) for e in entries], [25, 6])  # 30 + self
+        self.assertEqual(entries[0][0].id, 0)
+
+    def test_get_packets_with_parameters(self):
+        """
+            Test that parameters are carried in every packet, in place of
+            routes.
+        """
+        for destination_id in range(1, 31):
+            self.table.add_route(destination_id=destination_id,
+                                 next_hop_id=2, metric=1)
+
+        parameter = RIPEntry.parameter(Parameters.UPDATE_INTERVAL, 1000)
+        packets = self.table.get_packets(destination_router_id=3,
+                                         parameters=[parameter])
+        entries = [RIPPacket.parse(packet)[2] for packet in packets]
+        self.assertEqual([len(e) for e in entries], [25, 8])
+        self.assertTrue(all(e[0].is_parameter for e in entries))
+
     def test_poison_reverse(self):
         """
             Ensure that we poison routes that have this router
@@ -108,6 +145,407 @@ class TestRouteTable(unittest.TestCase):
         # Ensure the new entry has a metric of 16
         self.assertEqual(entries[-1].metric, 16)
 
+    def test_process_response(self):
+        """
+            Test applying a response: new routes are added with the link
+            metric, and worse routes from other peers are ignored.
+        """
+        self.table.process_response(1, 2, [RIPEntry(id=5, metric=1),
+                                           RIPEntry(id=0, metric=1)])
+        self.table.process_response(2, 1, [RIPEntry(id=5, metric=3)])
+
+        entry = self.table.get_entry(5)
+        self.assertEqual(entry.next_hop_id, 1)
+        self.assertEqual(entry.metric, 3)
+        self.assertIsNone(self.table.get_entry(0))  # Never route to self
+
+    def test_events(self):
+        """
+            Test that table changes publish the matching route events.
+        """
+        events = self.table.events.subscribe_queue()
+        self.table.process_response(1, 1, [RIPEntry(id=5, metric=4)])
+        self.table.process_response(2, 1, [RIPEntry(id=5, metric=1)])
+        self.table.process_response(2, 1, [RIPEntry(id=5, metric=2)])
+        self.table.process_response(2, 1, [RIPEntry(id=5, metric=2)])
+        self.table.remove_route(5)
+
+        types = [events.get_nowait().type for _ in range(len(events))]
+        self.assertEqual(types, [RouteEventTypes.ADDED,
+                                 RouteEventTypes.NEXT_HOP_CHANGED,
+                                 RouteEventTypes.METRIC_CHANGED,
+                                 RouteEventTypes.REMOVED])
+
+    def test_timeout_events(self):
+        """
+            Test that timeouts and garbage collection publish events.
+        """
+        events = self.table.events.subscribe_queue()
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=1,
+                             timeout=time.time() - 31)
+        self.assertTrue(self.table.check_for_timeouts())
+        self.table.routes[5].timeout = time.time() - 151
+        self.table.check_for_timeouts()
+
+        types = [events.get_nowait().type for _ in range(len(events))]
+        self.assertEqual(types, [RouteEventTypes.ADDED,
+                                 RouteEventTypes.TIMED_OUT,
+                                 RouteEventTypes.GARBAGE_COLLECTED])
+        self.assertIsNone(self.table.get_entry(5))
+
+    def test_peer_timeout(self):
+        """
+            Test that routes through a peer with a lengthened timeout
+            outlive the normal timeout.
+        """
+        self.table.set_peer_timeout(1, 90)
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=1,
+                             timeout=time.time() - 31)
+        self.table.add_route(destination_id=6, next_hop_id=2, metric=1,
+                             timeout=time.time() - 31)
+        self.table.check_for_timeouts()
+        self.assertEqual(self.table.get_entry(5).metric, 1)
+        self.assertEqual(self.table.get_entry(6).metric, 16)
+
+        # The route is held for garbage collection after its own timeout
+        self.table.update_route(5, 16)
+        self.table.routes[5].timeout -= 119
+        self.table.check_for_timeouts()
+        self.assertIsNotNone(self.table.get_entry(5))
+
+        self.table.set_peer_timeout(1, None)
+        self.table.check_for_timeouts()
+        self.assertIsNone(self.table.get_entry(5))
+
+    def test_get_withdrawal_packets(self):
+        """
+            Test that a graceful shutdown withdraws every route, this router
+            and its networks.
+        """
+        self.table.set_networks([Prefix(0x0A000000, 8)])
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=3)
+
+        packet, = self.table.get_withdrawal_packets()
+        _, _, entries = RIPPacket.parse(packet)
+        self.assertEqual({entry.destination: entry.metric
+                          for entry in entries},
+                         {0: 16, Prefix(0x0A000000, 8): 16, 5: 16})
+
+    def test_get_metric(self):
+        """
+            Test the metric answered for a requested destination.
+        """
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=3)
+        self.assertEqual(self.table.get_metric(0), 0)
+        self.assertEqual(self.table.get_metric(5), 3)
+        self.assertEqual(self.table.get_metric(6), 16)
+
+    def test_refresh_routes(self):
+        """
+            Test that a bulk refresh only touches valid routes through the
+            given next hop.
+        """
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=3,
+                             timeout=0)
+        self.table.add_route(destination_id=6, next_hop_id=2, metric=3,
+                             timeout=0)
+        self.table.refresh_routes(1, [5, 6, 7])
+
+        self.assertGreater(self.table.get_entry(5).timeout, 0)
+        self.assertEqual(self.table.get_entry(6).timeout, 0)
+
+    def test_lookup(self):
+        """
+            Test longest prefix match lookups only return valid routes.
+        """
+        network = parse_destination('10.1.0.0/16')
+        host = parse_destination('10.1.2.3')
+        self.table.add_route(destination_id=network, next_hop_id=1, metric=2)
+        self.table.add_route(destination_id=host, next_hop_id=2, metric=5)
+
+        self.assertEqual(self.table.lookup(host).next_hop_id, 2)
+        self.assertEqual(self.table.lookup(host + 1).next_hop_id, 1)
+        self.assertIsNone(self.table.lookup(parse_destination('10.2.0.1')))
+
+        # Unreachable and removed routes are not used for forwarding
+        self.table.update_route(host, 16)
+        self.assertEqual(self.table.lookup(host).next_hop_id, 1)
+        self.table.remove_route(network)
+        self.assertIsNone(self.table.lookup(host))
+        self.table.update_route(host, 4)
+        self.assertEqual(self.table.lookup(host).next_hop_id, 2)
+
+    def test_networks(self):
+        """
+            Test attached networks are advertised with metric 0, and
+            prefixes are learned from responses.
+        """
+        network = Prefix(0x0A010000, 16)
+        table = RouteTable(logging.getLogger(__name__), router_id=1,
+                           networks=[network])
+        _, _, entries = RIPPacket.parse(table.get_packet(2))
+        self.assertEqual([(entry.destination, entry.metric)
+                          for entry in entries], [(1, 0), (network, 0)])
+
+        # Advertisements of the attached network are ignored
+        self.table.process_response(1, 1, entries)
+        table.process_response(2, 1, [RIPEntry.for_destination(network, 0)])
+        self.assertEqual(self.table.get_entry(network).metric, 1)
+        self.assertIsNone(table.get_entry(network))
+
+    def test_summarise(self):
+        """
+            Test siblings with the same metric merge, recursively, and that
+            routes covered by a parent with the same metric are dropped.
+        """
+        metrics = {(0x0A010000, 24): 2, (0x0A010100, 24): 2,
+                   (0x0A010200, 23): 2,  # Merges into 10.1.0.0/22
+                   (0x0A020000, 24): 3, (0x0A020100, 24): 4,  # Differ
+                   (0x0A030000, 16): 5, (0x0A030400, 24): 5,  # Covered
+                   (4, 32): 1, (5, 32): 1}  # Router IDs 4 and 5
+        self.assertEqual(RouteTable.summarise(metrics),
+                         {(0x0A010000, 22): 2, (0x0A020000, 24): 3,
+                          (0x0A020100, 24): 4, (0x0A030000, 16): 5,
+                          (4, 31): 1})
+
+    def test_summarise_lossless(self):
+        """
+            Test a longest prefix match on random summarised routes gives the
+            same metric as on the original routes.
+        """
+        rng = random.Random(1)
+        metrics = {}
+        for _ in range(300):
+            length = rng.randint(20, 32)
+            address = (0x0A000000 | rng.getrandbits(12) << 8) \
+                & mask_of_length(length)
+            metrics[(address, length)] = rng.randint(1, 2)
+        summarised = RouteTable.summarise(metrics)
+        self.assertLess(len(summarised), len(metrics))
+
+        original, summary = PrefixTrie(), PrefixTrie()
+        for trie, routes in ((original, metrics), (summary, summarised)):
+            for (address, length), metric in routes.items():
+                trie.insert(address, length, metric)
+        for _ in range(2000):
+            address = 0x0A000000 | rng.getrandbits(20)
+            self.assertEqual(summary.lookup(address),
+                             original.lookup(address))
+
+    def test_summarised_packets(self):
+        """
+            Test summarised updates, and that a summary that no longer
+            applies is advertised with metric 16.
+        """
+        table = RouteTable(logging.getLogger(__name__), router_id=1)
+        table.add_route(destination_id=2, next_hop_id=2, metric=1)
+        table.add_route(destination_id=3, next_hop_id=2, metric=1)
+
+        def advertised(summarise=True):
+            _, _, entries = RIPPacket.parse(
+                table.get_packets(5, summarise=summarise)[0])
+            return {entry.destination: entry.metric for entry in entries}
+
+        self.assertEqual(advertised(), {1: 0, Prefix(2, 31): 1})
+        self.assertEqual(advertised(summarise=False), {1: 0, 2: 1, 3: 1})
+
+        table.update_route(3, 4)
+        self.assertEqual(advertised(), {1: 0, 2: 1, 3: 4,
+                                        Prefix(2, 31): 16})
+
+    def test_flap_damping(self):
+        """
+            Test a flapping route is suppressed, advertised as unreachable
+            and not used for forwarding, then reused once it settles.
+        """
+        self.table.set_damping(penalty=1000, half_life=30, suppress=2000,
+                               reuse=750)
+        events = []
+        self.table.events.subscribe(lambda event: events.append(event.type))
+
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=2)
+        self.table.update_route(5, 16)
+        self.table.update_route(5, 2)
+        self.assertFalse(self.table.get_entry(5).suppressed)
+        for _ in range(2):
+            self.table.update_route(5, 16)
+            self.table.update_route(5, 2)
+
+        entry = self.table.get_entry(5)
+        self.assertTrue(entry.suppressed)
+        self.assertIn(RouteEventTypes.SUPPRESSED, events)
+        self.assertIsNone(self.table.lookup(5))
+        _, _, entries = RIPPacket.parse(self.table.get_packet(2))
+        self.assertEqual(entries[1].metric, 16)
+
+        # Three half-lives later the penalty has decayed below reuse
+        entry.penalty_time -= 90
+        self.assertTrue(self.table.check_for_timeouts())
+        self.assertFalse(entry.suppressed)
+        self.assertEqual(events[-1], RouteEventTypes.REUSED)
+        self.assertEqual(self.table.lookup(5), entry)
+
+    def test_flap_history(self):
+        """
+            Test a route keeps its penalty when it is removed and relearned.
+        """
+        self.table.set_damping(penalty=1000, suppress=2000, reuse=750)
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=2)
+        self.table.update_route(5, 16)
+        self.table.remove_route(5)
+        self.table.add_route(destination_id=5, next_hop_id=2, metric=3)
+        self.assertAlmostEqual(self.table.get_entry(5).penalty, 1000,
+                               delta=1)
+
+        self.table.disable_damping()
+        self.assertEqual(self.table.get_entry(5).penalty, 0)
+
+    def test_suppressed_routes(self):
+        """
+            Test only suppressed routes are checked for reuse, including a
+            suppressed route that is removed and relearned.
+        """
+        self.table.set_damping(penalty=1000, half_life=30, suppress=2000,
+                               reuse=750)
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=2)
+        self.table.add_route(destination_id=6, next_hop_id=1, metric=2)
+        self.table.update_route(6, 16)
+        for _ in range(3):
+            self.table.update_route(5, 16)
+            self.table.update_route(5, 2)
+        self.assertEqual(self.table._suppressed, {5})
+
+        self.table.remove_route(5)
+        self.assertEqual(self.table._suppressed, set())
+        self.table.add_route(destination_id=5, next_hop_id=2, metric=3)
+        self.assertEqual(self.table._suppressed, {5})
+
+        self.table.get_entry(5).penalty_time -= 90
+        self.table.check_for_timeouts()
+        self.assertFalse(self.table.get_entry(5).suppressed)
+        self.assertEqual(self.table._suppressed, set())
+
+    def test_loop_prevention_modes(self):
+        """
+            Test routes through the receiving peer are poisoned, left out,
+            or advertised unchanged, depending on the mode.
+        """
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=3)
+        self.table.add_route(destination_id=6, next_hop_id=2, metric=4)
+
+        def advertised():
+            _, _, entries = RIPPacket.parse(self.table.get_packet(1))
+            return {entry.id: entry.metric for entry in entries}
+
+        self.assertEqual(advertised(), {0: 0, 5: 16, 6: 4})
+        self.table.set_loop_prevention('split_horizon')
+        self.assertEqual(advertised(), {0: 0, 6: 4})
+        self.table.set_loop_prevention('none')
+        self.assertEqual(advertised(), {0: 0, 5: 3, 6: 4})
+        self.assertRaises(ValueError, self.table.set_loop_prevention,
+                          'reverse')
+
+    def test_hold_down(self):
+        """
+            Test a route that became unreachable ignores other next hops
+            until the hold-down expires, but not its own next hop.
+        """
+        self.table.set_loop_prevention('poisoned_reverse', hold_down=30)
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=3)
+        self.table.update_route(5, 16)
+
+        self.table.process_response(2, 1, [RIPEntry(id=5, metric=1)])
+        self.assertEqual(self.table.get_entry(5).metric, 16)
+        self.table.process_response(1, 1, [RIPEntry(id=5, metric=4)])
+        self.assertEqual(self.table.get_entry(5).metric, 5)
+
+        self.table.update_route(5, 16)
+        self.table.get_entry(5).hold_down_until = 0
+        self.table.process_response(2, 1, [RIPEntry(id=5, metric=1)])
+        self.assertEqual(self.table.get_entry(5).next_hop_id, 2)
+
+    def test_process_response_cacheable(self):
+        """
+            Test responses are only cacheable when their outcome does not
+            depend on the time.
+        """
+        self.table.set_loop_prevention('poisoned_reverse', hold_down=30)
+        self.assertTrue(self.table.process_response(
+            1, 1, [RIPEntry(id=5, metric=3)]))
+        self.assertTrue(self.table.process_response(
+            1, 1, [RIPEntry(id=5, metric=15)]))
+
+        # Ignored while held down, but accepted once it expires
+        self.assertFalse(self.table.process_response(
+            2, 1, [RIPEntry(id=6, metric=1), RIPEntry(id=5, metric=1)]))
+        self.table.get_entry(5).hold_down_until = 0
+        self.assertTrue(self.table.process_response(
+            2, 1, [RIPEntry(id=6, metric=1), RIPEntry(id=5, metric=1)]))
+
+    def test_hold_down_restored(self):
+        """
+            Test a route restored by its own next hop during the hold-down
+            accepts a better route from another next hop.
+        """
+        self.table.set_loop_prevention('poisoned_reverse', hold_down=60)
+        self.table.process_response(2, 1, [RIPEntry(id=5, metric=3)])
+        self.table.process_response(2, 1, [RIPEntry(id=5, metric=16)])
+        self.table.process_response(2, 1, [RIPEntry(id=5, metric=3)])
+        self.assertEqual(self.table.get_entry(5).metric, 4)
+
+        self.table.process_response(3, 1, [RIPEntry(id=5, metric=1)])
+        entry = self.table.get_entry(5)
+        self.assertEqual((entry.next_hop_id, entry.metric), (3, 2))
+
+    def test_adjust_next_hop_metric(self):
+        """
+            Test re-deriving routes after a link metric change.
+        """
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=3)
+        self.table.add_route(destination_id=6, next_hop_id=1, metric=14)
+        self.table.add_route(destination_id=7, next_hop_id=2, metric=3)
+
+        self.assertEqual(self.table.adjust_next_hop_metric(1, 2), 2)
+        self.assertEqual(self.table.get_entry(5).metric, 5)
+        self.assertEqual(self.table.get_entry(6).metric, 16)
+        self.assertEqual(self.table.get_entry(7).metric, 3)
+
+    def test_next_hop_index(self):
+        """
+            Test the index of routes by next hop follows new next hops and
+            removed routes.
+        """
+        def via(next_hop_id):
+            return sorted(entry.destination_id
+                          for entry in self.table.routes_via(next_hop_id))
+
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=3)
+        self.table.add_route(destination_id=6, next_hop_id=1, metric=3)
+        self.table.add_route(destination_id=7, next_hop_id=2, metric=3)
+        self.assertEqual(via(1), [5, 6])
+
+        self.table.process_response(2, 1, [RIPEntry(id=6, metric=1)])
+        self.table.update_route(5, 16)
+        self.assertEqual(via(1), [5])
+        self.assertEqual(via(2), [6, 7])
+
+        self.table.remove_route(5)
+        self.assertEqual(via(1), [])
+        self.table.remove_all()
+        self.assertEqual(self.table._by_next_hop, {})
+
+    def test_invalidate_next_hop(self):
+        """
+            Test invalidating every route through a removed peer.
+        """
+        self.table.add_route(destination_id=5, next_hop_id=1, metric=3)
+        self.table.add_route(destination_id=7, next_hop_id=2, metric=3)
+
+        self.assertEqual(self.table.invalidate_next_hop(1), 1)
+        self.assertEqual(self.table.get_entry(5).metric, 16)
+        self.assertEqual(self.table.get_entry(7).metric, 3)
+        self.assertTrue(self.table.check_for_timeouts())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,157 @@
+"""
+    Transport unit tests.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import gc
+import logging
+import unittest
+import warnings
+
+from test.context import (
+    InProcessHub,
+    InProcessTransport,
+    SharedMemoryTransport,
+    Transport,
+    UdpTransport,
+    RECEIVE_SIZE
+)
+
+PORT = 8090
+OTHER_PORT = 8091
+
+
+class TransportTests:
+    """
+        Tests shared by every transport. Subclasses set create().
+    """
+    def setUp(self):
+        self.logger = logging.getLogger(__name__)
+        self.receiver = self.create()
+        self.sender = self.create()
+        self.receiver.bind(PORT)
+
+    def tearDown(self):
+        self.receiver.close()
+        self.sender.close()
+
+    def test_send_and_receive(self):
+        """
+            Packets arrive in order on the bound port.
+        """
+        self.sender.send(b'Hello', PORT)
+        self.sender.send(bytearray(b'World'), PORT)
+
+        received = []
+        while len(received) < 2:
+            received += self.receiver.poll(100)
+        self.assertEqual([data for data, _ in received],
+                         [b'Hello', b'World'])
+
+    def test_unbound_port(self):
+        """
+            Packets to unbound ports are dropped silently.
+        """
+        self.sender.send(b'Hello', OTHER_PORT)
+        self.receiver.unbind(PORT)
+        self.sender.send(b'Hello', PORT)
+        self.assertEqual(self.receiver.poll(10), [])
+
+    def test_double_bind(self):
+        """
+            A port can only be bound once.
+        """
+        self.assertRaises(OSError, self.sender.bind, PORT)
+
+
+class TransportTestSuite(unittest.TestCase):
+    def test_abstract(self):
+        """
+            Transports must implement every abstract method.
+        """
+        class Incomplete(Transport):
+            def bind(self, port, receive_buffer=None):
+                pass
+
+        self.assertRaises(TypeError, Transport)
+        self.assertRaises(TypeError, Incomplete)
+
+
+class UdpTransportTestSuite(TransportTests, unittest.TestCase):
+    def create(self):
+        return UdpTransport(self.logger)
+
+    def test_truncated_datagram(self):
+        """
+            Datagrams larger than a RIP packet are dropped and counted.
+        """
+        self.sender.send(bytes(RECEIVE_SIZE + 1), PORT)
+        self.sender.send(b'Hello', PORT)
+
+        received = []
+        while self.receiver.port_stats()[PORT]['received'] < 2:
+            received += self.receiver.poll(100)
+        self.assertEqual([data for data, _ in received], [b'Hello'])
+        self.assertEqual(self.receiver.port_stats()[PORT]['truncated'], 1)
+
+    def test_connect_failure(self):
+        """
+            An outgoing socket that fails to connect is closed, not leaked.
+        """
+        sender = UdpTransport(self.logger, bind_address='256.0.0.1')
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', ResourceWarning)
+            for _ in range(3):
+                self.assertRaises(OSError, sender.send, b'Hello', PORT)
+            gc.collect()
+        self.assertEqual(sender._outgoing_sockets, {})
+        self.assertFalse([warning for warning in caught
+                          if issubclass(warning.category, ResourceWarning)])
+
+    def test_receive_buffer(self):
+        """
+            The receive buffer can be sized per port.
+        """
+        self.receiver.bind(OTHER_PORT, receive_buffer=65536)
+        stats = self.receiver.port_stats()
+        self.assertGreaterEqual(stats[OTHER_PORT]['receive_buffer'], 65536)
+
+
+class InProcessTransportTestSuite(TransportTests, unittest.TestCase):
+    hub = InProcessHub()
+
+    def create(self):
+        return InProcessTransport(self.logger, hub=self.hub)
+
+
+class SharedMemoryTransportTestSuite(TransportTests, unittest.TestCase):
+    def create(self):
+        return SharedMemoryTransport(self.logger, capacity=64)
+
+    def test_ring_wraps(self):
+        """
+            Records wrap around the end of a small ring, and a full ring
+            drops packets instead of overwriting unread ones.
+        """
+        for i in range(10):
+            self.sender.send(bytes([i]) * 20, PORT)
+            self.sender.send(bytes([i]) * 20, PORT)
+            self.sender.send(bytes([i]) * 20, PORT)  # Does not fit
+            received = self.receiver.poll(10)
+            self.assertEqual([data for data, _ in received],
+                             [bytes([i]) * 20] * 2)
+
+    def test_rebind(self):
+        """
+            Senders follow a port to its new ring after a rebind.
+        """
+        self.sender.send(b'Hello', PORT)
+        self.receiver.unbind(PORT)
+        self.receiver.bind(PORT)
+        self.sender.send(b'World', PORT)
+        self.assertEqual([data for data, _ in self.receiver.poll(10)],
+                         [b'World'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+    Prefix trie unit tests.
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import random
+import unittest
+
+from test.context import PrefixTrie, parse_destination, destination_prefix
+
+
+def prefix(text):
+    """
+        (address, length) of a prefix in CIDR notation.
+    """
+    return destination_prefix(parse_destination(text))
+
+
+class PrefixTrieTestSuite(unittest.TestCase):
+    """
+        Prefix trie test suite.
+    """
+    def setUp(self):
+        self.trie = PrefixTrie()
+        for name in ['10.0.0.0/8', '10.1.0.0/16', '10.1.2.0/24',
+                     '10.1.2.3/32', '192.168.0.0/16']:
+            self.trie.insert(*prefix(name), name)
+
+    def test_longest_prefix_match(self):
+        """
+            The most specific prefix containing an address wins.
+        """
+        address = prefix('10.1.2.3')[0]
+        self.assertEqual(self.trie.lookup(address), '10.1.2.3/32')
+        self.assertEqual(self.trie.lookup(address + 1), '10.1.2.0/24')
+        self.assertEqual(self.trie.lookup(prefix('10.1.9.9')[0]),
+                         '10.1.0.0/16')
+        self.assertEqual(self.trie.lookup(prefix('10.9.9.9')[0]),
+                         '10.0.0.0/8')
+        self.assertIsNone(self.trie.lookup(prefix('11.0.0.1')[0]))
+
+    def test_remove(self):
+        """
+            Removing a prefix falls back to the next most specific prefix,
+            and leaves the other prefixes in place.
+        """
+        self.assertTrue(self.trie.remove(*prefix('10.1.2.0/24')))
+        self.assertFalse(self.trie.remove(*prefix('10.1.2.0/24')))
+        self.assertFalse(self.trie.remove(*prefix('10.1.3.0/24')))
+        self.assertEqual(len(self.trie), 4)
+        self.assertEqual(self.trie.lookup(prefix('10.1.2.4')[0]),
+                         '10.1.0.0/16')
+        self.assertEqual(self.trie.lookup(prefix('10.1.2.3')[0]),
+                         '10.1.2.3/32')
+        self.assertNotIn(prefix('10.1.2.0/24'), self.trie)
+        self.assertIn(prefix('10.1.0.0/16'), self.trie)
+
+    def test_matches_linear_scan(self):
+        """
+            Random prefixes and lookups agree with a linear scan.
+        """
+        rng = random.Random(1)
+        trie = PrefixTrie()
+        prefixes = {}
+        for _ in range(500):
+            length = rng.randint(1, 32)
+            address = rng.getrandbits(32) & (((1 << length) - 1)
+                                             << (32 - length))
+            prefixes[(address, length)] = (address, length)
+            trie.insert(address, length, (address, length))
+        for key in rng.sample(sorted(prefixes), 200):
+            del prefixes[key]
+            trie.remove(*key)
+
+        self.assertEqual(len(trie), len(prefixes))
+        self.assertEqual(dict(trie.items()), prefixes)
+        for _ in range(2000):
+            address = rng.getrandbits(32)
+            matches = [key for key in prefixes
+                       if address >> (32 - key[1]) == key[0] >> (32 - key[1])]
+            expected = max(matches, key=lambda key: key[1], default=None)
+            self.assertEqual(trie.lookup(address), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
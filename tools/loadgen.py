@@ -0,0 +1,281 @@
+"""
+    RIPDaemon - synthetic load generator. Pretends to be every peer of a
+    target router, sending it responses with many routes at a fixed packet
+    rate while the routes churn, then measures how many packets the target
+    kept up with, its CPU usage, and whether its routing table is correct.
+
+    The target runs in this process by default, so its table can be
+    checked; it then shares the interpreter lock with the generator. Pass
+    --pid to load a router running in its own process instead (CPU usage is
+    then read for that process, and the table is not checked).
+
+    Usage:
+        python3 -m tools.loadgen config/1.ini --routes 500 --rates 200,1000
+        python3 -m tools.loadgen config/1.ini --pid 1234 --rates 5000
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from tabulate import tabulate
+from ripd.ripd import RIPDaemon
+from ripd._configloader import ConfigLoader
+from ripd._structures import (RIPPacket, RIPEntry, PacketCommands, Prefix,
+                              MAX_ENTRIES)
+from ripd._transport import create_transport
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Load a RIP router with synthetic responses.")
+    parser.add_argument('config', help="Configuration file of the target.")
+    parser.add_argument('--routes', type=int, default=250,
+                        help="Routes advertised by every peer.")
+    parser.add_argument('--rates', default='100,500,1000,2000',
+                        help="Comma separated packet rates to step through, "
+                             "in packets per second.")
+    parser.add_argument('--duration', type=float, default=5,
+                        help="Seconds to hold each rate.")
+    parser.add_argument('--churn', type=float, default=0.1,
+                        help="Fraction of a peer's routes changed after each "
+                             "full update it sends.")
+    parser.add_argument('--withdraw', type=float, default=0.2,
+                        help="Fraction of changes that withdraw a route.")
+    parser.add_argument('--transport', default='udp',
+                        choices=['udp', 'inprocess', 'shm'])
+    parser.add_argument('--pid', type=int,
+                        help="Load a router already running in the process "
+                             "with this ID.")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed.")
+    return parser.parse_args()
+
+
+class LoadGenerator:
+    """
+        The routes advertised by a set of simulated peers. Peer p advertises
+        destination i, the prefix 10.x.y.0/24 numbered i, with its own
+        metric, and metrics churn as updates are sent.
+    """
+    def __init__(self, peers: dict, routes: int, churn: float,
+                 withdraw: float, seed=None):
+        """
+            :param peers: Dictionary of peer ID to the target's link metric
+                          to that peer.
+        """
+        self._random = random.Random(seed)
+        self._peers = peers
+        self._churn = churn
+        self._withdraw = withdraw
+        self.destinations = [Prefix(0x0A000000 + (i << 8), 24)
+                             for i in range(routes)]
+        self.metrics = {peer_id: [self._random.randint(1, 14)
+                                  for _ in range(routes)]
+                        for peer_id in peers}
+
+    def packets(self, peer_id):
+        """
+            :returns: List of packets holding a full update from a peer.
+        """
+        entries = [RIPEntry.for_destination(destination, metric)
+                   for destination, metric
+                   in zip(self.destinations, self.metrics[peer_id])]
+        return [bytes(RIPPacket.construct(PacketCommands.RESPONSE, peer_id,
+                                          entries[i:i + MAX_ENTRIES]))
+                for i in range(0, len(entries), MAX_ENTRIES)]
+
+    def churn(self, peer_id):
+        """
+            Change the metrics of a random fraction of a peer's routes.
+        """
+        metrics = self.metrics[peer_id]
+        for i in self._random.sample(range(len(metrics)),
+                                     int(len(metrics) * self._churn)):
+            metrics[i] = 16 if self._random.random() < self._withdraw \
+                else self._random.randint(1, 14)
+
+    def expected(self):
+        """
+            Routes the target should hold once it has every peer's current
+            update.
+
+            :returns: Dictionary of destination to (metric, set of next
+                      hops).
+        """
+        expected = {}
+        for i, destination in enumerate(self.destinations):
+            metrics = {peer_id: min(self.metrics[peer_id][i] + link, 16)
+                       for peer_id, link in self._peers.items()}
+            best = min(metrics.values())
+            expected[destination] = (best, {peer_id for peer_id, metric
+                                            in metrics.items()
+                                            if metric == best})
+        return expected
+
+
+def cpu_seconds(pid, tid=None):
+    """
+        CPU time used by a process, or one of its threads, on Linux.
+
+        :returns: Seconds of user and system time, or None if unavailable.
+    """
+    path = f"/proc/{pid}/stat" if tid is None \
+        else f"/proc/{pid}/task/{tid}/stat"
+    try:
+        with open(path) as stat:
+            fields = stat.read().rsplit(')', 1)[1].split()
+    except OSError:
+        return None
+    # utime and stime are the 14th and 15th fields, counting the name
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def send_at_rate(generator, transport, ports, rate, duration):
+    """
+        Send full updates from each peer in turn at a fixed packet rate,
+        churning each peer's routes after its update.
+
+        :returns: Number of packets sent.
+    """
+    peers = list(generator.metrics)
+    queue = []
+    sent = 0
+    start = time.perf_counter()
+    next_send = start
+
+    while time.perf_counter() - start < duration:
+        if not queue:
+            peer_id = peers[0]
+            queue = generator.packets(peer_id)
+            generator.churn(peer_id)
+            peers.append(peers.pop(0))
+
+        # Sleep until the next packet is due, without trying to catch up
+        # more than a short burst after falling behind
+        now = time.perf_counter()
+        if next_send > now:
+            time.sleep(next_send - now)
+        next_send = max(next_send, now - 0.1) + 1 / rate
+
+        transport.send(queue.pop(0), ports[sent % len(ports)])
+        sent += 1
+    return sent
+
+
+def wait_until_idle(router, quiet=0.5, limit=30):
+    """
+        Wait until the target has processed no packets for quiet seconds.
+    """
+    deadline = time.time() + limit
+    processed = None
+    while time.time() < deadline:
+        count = router.get_ingress_metrics()['processed']
+        if count == processed:
+            return
+        processed = count
+        time.sleep(quiet)
+
+
+def check_table(generator, table):
+    """
+        Compare the target's routing table with the expected routes.
+
+        :returns: Number of destinations with the wrong metric or next hop.
+    """
+    wrong = 0
+    for destination, (metric, next_hops) in generator.expected().items():
+        entry = table.routes.get(destination)
+        actual = 16 if entry is None else entry.metric
+        if actual != metric or (metric < 16 and
+                                entry.next_hop_id not in next_hops):
+            wrong += 1
+    return wrong
+
+
+def main():
+    args = parse_args()
+    logger = logging.getLogger(__name__)
+    config_loader = ConfigLoader(logger, args.config)
+    router_info = config_loader.get_router_info()
+    peers = {peer_id: info['metric']
+             for peer_id, info in config_loader.get_peer_info().items()}
+    if not peers:
+        sys.exit("The target has no peers to impersonate.")
+
+    generator = LoadGenerator(peers, args.routes, args.churn, args.withdraw,
+                              args.seed)
+    ports = router_info['incoming_ports']
+
+    # Start the target, unless it is already running
+    router = thread = None
+    pid, tid = args.pid, None
+    if pid is None:
+        router = RIPDaemon(args.config, log_level=logging.WARNING,
+                           transport=args.transport)
+        thread = threading.Thread(target=router.start, daemon=True)
+        thread.start()
+        time.sleep(0.5)
+        pid, tid = os.getpid(), thread.native_id
+
+    transport = create_transport(args.transport, logger)
+    rows = []
+    try:
+        for rate in [float(rate) for rate in args.rates.split(',')]:
+            metrics = router.get_ingress_metrics() if router else None
+            cpu = cpu_seconds(pid, tid)
+            start = time.perf_counter()
+            sent = send_at_rate(generator, transport, ports, rate,
+                                args.duration)
+            elapsed = time.perf_counter() - start
+
+            row = [f"{rate:.0f}", f"{sent / elapsed:.0f}"]
+            used = cpu_seconds(pid, tid)
+            if router is not None:
+                after = router.get_ingress_metrics()
+                processed = after['processed'] - metrics['processed']
+                row += [f"{processed / elapsed:.0f}",
+                        after['shed'] - metrics['shed'],
+                        after['rate_limited'] - metrics['rate_limited'],
+                        after['backlog']]
+            else:
+                row += ['-'] * 4
+            row.append('-' if cpu is None or used is None
+                       else f"{100 * (used - cpu) / elapsed:.0f}%")
+            rows.append(row)
+
+        # Once the target has drained its socket buffers, two quiet rounds
+        # of full updates let the table settle on the final routes,
+        # whatever order they arrive in
+        wrong = None
+        if router is not None:
+            wait_until_idle(router)
+            for _ in range(2):
+                for peer_id in generator.metrics:
+                    for i, packet in enumerate(generator.packets(peer_id)):
+                        transport.send(packet, ports[i % len(ports)])
+                wait_until_idle(router)
+            wrong = check_table(generator, router._table)
+    finally:
+        transport.close()
+        if router is not None:
+            router._run = False
+            thread.join(timeout=5)
+
+    print(f"{len(peers)} peers, {args.routes} routes each, "
+          f"{args.churn:.0%} churn per update.")
+    print(tabulate(rows, headers=['Offered pps', 'Sent pps', 'Processed pps',
+                                  'Shed', 'Rate limited', 'Backlog',
+                                  'Target CPU']))
+    if wrong is not None:
+        print(f"Routing table: {wrong} of {args.routes} destinations wrong.")
+        sys.exit(1 if wrong else 0)
+
+
+if __name__ == '__main__':
+    main()
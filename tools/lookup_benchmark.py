@@ -0,0 +1,106 @@
+"""
+    RIPDaemon - longest prefix match benchmark. Compares lookups in the
+    routing table's prefix trie with a linear scan over the same prefixes.
+
+    Usage:
+        python3 -m tools.lookup_benchmark
+        python3 -m tools.lookup_benchmark --prefixes 100000 --lookups 1000000
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import argparse
+import random
+import time
+from tabulate import tabulate
+from ripd._structures import mask_of_length
+from ripd._trie import PrefixTrie
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark longest prefix match lookups.")
+    parser.add_argument('--prefixes', type=int, default=10000,
+                        help="Number of random prefixes in the table.")
+    parser.add_argument('--lookups', type=int, default=200000,
+                        help="Number of trie lookups to time.")
+    parser.add_argument('--linear-lookups', type=int, default=2000,
+                        help="Number of linear scan lookups to time.")
+    parser.add_argument('--seed', type=int, default=1,
+                        help="Random seed.")
+    return parser.parse_args()
+
+
+def random_prefixes(rng, count):
+    """
+        Random prefixes, mostly /16 to /24 as in real routing tables.
+
+        :returns: List of (address, length) tuples.
+    """
+    prefixes = set()
+    while len(prefixes) < count:
+        length = min(32, max(8, int(rng.gauss(22, 3))))
+        prefixes.add((rng.getrandbits(32) & mask_of_length(length), length))
+    return list(prefixes)
+
+
+def linear_lookup(prefixes, address):
+    """
+        Baseline: scan the prefixes, longest first, for the first match.
+    """
+    for prefix, mask, value in prefixes:
+        if address & mask == prefix:
+            return value
+    return None
+
+
+def time_lookups(lookup, addresses):
+    """
+        :returns: Results of looking up every address, and lookups per
+                  second.
+    """
+    start = time.perf_counter()
+    results = [lookup(address) for address in addresses]
+    return results, len(addresses) / (time.perf_counter() - start)
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    prefixes = random_prefixes(rng, args.prefixes)
+
+    trie = PrefixTrie()
+    start = time.perf_counter()
+    for address, length in prefixes:
+        trie.insert(address, length, (address, length))
+    build_time = time.perf_counter() - start
+
+    linear = sorted(((address, mask_of_length(length), (address, length))
+                     for address, length in prefixes),
+                    key=lambda prefix: -prefix[2][1])
+
+    # Half the addresses fall inside a prefix, the rest are random
+    def address():
+        if rng.random() < 0.5:
+            prefix, length = rng.choice(prefixes)
+            return prefix | rng.getrandbits(32 - length) if length < 32 \
+                else prefix
+        return rng.getrandbits(32)
+    addresses = [address() for _ in range(args.lookups)]
+
+    trie_results, trie_rate = time_lookups(trie.lookup, addresses)
+    sample = addresses[:args.linear_lookups]
+    linear_results, linear_rate = time_lookups(
+        lambda address: linear_lookup(linear, address), sample)
+
+    assert trie_results[:len(sample)] == linear_results, \
+        "Trie and linear scan disagree"
+
+    print(f"{args.prefixes} prefixes, trie built in {build_time:.3f}s")
+    print(tabulate([['Trie', f"{trie_rate:,.0f}", len(addresses)],
+                    ['Linear scan', f"{linear_rate:,.0f}", len(sample)]],
+                   headers=['Method', 'Lookups / second', 'Lookups']))
+    print(f"Speedup: {trie_rate / linear_rate:,.0f}x")
+
+
+if __name__ == '__main__':
+    main()
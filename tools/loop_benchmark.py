@@ -0,0 +1,217 @@
+"""
+    RIPDaemon - loop prevention benchmark. Simulates generated topologies
+    under each loop prevention mode, fails a router, and measures how long
+    the network takes to reconverge, how long routes to the failed router
+    count to infinity, and how many packets and bytes the routers send.
+
+    Usage:
+        python3 -m tools.loop_benchmark
+        python3 -m tools.loop_benchmark --routers 20 --trials 3 --hold-down 4
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import tempfile
+import threading
+import time
+from tabulate import tabulate
+from ripd.ripd import RIPDaemon
+from ripd._oracle import Topology, ShortestPathOracle, ConvergenceDetector
+from ripd._transport import InProcessHub, InProcessTransport
+
+MODES = ['none', 'split_horizon', 'poisoned_reverse']
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare convergence under each loop prevention mode.")
+    parser.add_argument('--routers', type=int, default=10,
+                        help="Routers in each generated topology.")
+    parser.add_argument('--degree', type=int, default=3,
+                        help="Average peers per router.")
+    parser.add_argument('--trials', type=int, default=1,
+                        help="Topologies to simulate for each mode.")
+    parser.add_argument('--seed', type=int, default=1,
+                        help="Random seed of the first topology.")
+    parser.add_argument('--hold-down', type=float, default=0,
+                        help="Also run poisoned reverse with this hold-down "
+                             "time, in seconds.")
+    parser.add_argument('--timeout', type=int, default=3,
+                        help="Route timeout of the simulated routers.")
+    parser.add_argument('--jitter', type=float, default=0.5,
+                        help="Periodic update jitter of the simulated "
+                             "routers, which also staggers their updates. "
+                             "Without it, every neighbour of the failed "
+                             "router times out at once.")
+    parser.add_argument('--limit', type=float, default=60,
+                        help="Seconds to wait for each convergence.")
+    return parser.parse_args()
+
+
+class CountingTransport(InProcessTransport):
+    """
+        In-process transport that counts the packets and bytes it sends.
+    """
+    def __init__(self, logger, hub):
+        super().__init__(logger, hub=hub)
+        self.packets = 0
+        self.bytes = 0
+
+    def send(self, packet, port):
+        self.packets += 1
+        self.bytes += len(packet)
+        super().send(packet, port)
+
+
+def wait_until_stable(detector, tables, settle, limit):
+    """
+        Wait until the tables have converged and stayed unchanged for settle
+        seconds, so a transient match during count to infinity is not
+        mistaken for convergence.
+
+        :returns: True if the tables converged within limit seconds.
+    """
+    deadline = time.time() + limit
+    while time.time() < deadline:
+        last_change = max(table.events.last_event_time or 0
+                          for table in tables.values())
+        if detector.converged_at is not None and \
+                time.time() - last_change >= settle:
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def run(topology, mode, hold_down, failed_id, args):
+    """
+        Simulate a topology, wait for it to converge, then stop one router
+        and measure the network recovering.
+
+        :returns: Dictionary of measurements, or None if the network did not
+                  converge.
+    """
+    logger = logging.getLogger(__name__)
+    hub = InProcessHub()
+    settle = 3  # Periodic updates with no changes before calling it stable
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = topology.write_configs(
+            directory, periodic_update_time=1, timeout=args.timeout,
+            garbage_collection_time=args.timeout,
+            loop_prevention=mode, hold_down=hold_down,
+            periodic_update_jitter=args.jitter,
+            stagger_updates=args.jitter > 0)
+        transports = {router_id: CountingTransport(logger, hub)
+                      for router_id in paths}
+        routers = {router_id: RIPDaemon(path, log_level=logging.WARNING,
+                                        transport=transports[router_id])
+                   for router_id, path in paths.items()}
+
+    threads = {router_id: threading.Thread(target=router.start, daemon=True)
+               for router_id, router in routers.items()}
+    tables = {router_id: router._table
+              for router_id, router in routers.items()}
+    for thread in threads.values():
+        thread.start()
+
+    try:
+        detector = ConvergenceDetector(ShortestPathOracle(topology), tables)
+        stable = wait_until_stable(detector, tables, settle, args.limit)
+        detector.close()
+        if not stable:
+            return None
+
+        # Steady state traffic over one settle period
+        sent = sum(transport.bytes for transport in transports.values())
+        time.sleep(settle)
+        steady = (sum(transport.bytes for transport in transports.values())
+                  - sent) / settle
+
+        # Watch routes to the failed router going unreachable
+        del tables[failed_id]
+        invalidated = []
+
+        def on_event(event):
+            if event.destination_id == failed_id and event.metric >= 16 \
+                    and event.old_metric is not None \
+                    and event.old_metric < 16:
+                invalidated.append(event.timestamp)
+
+        for table in tables.values():
+            table.events.subscribe(on_event)
+
+        # Fail the router abruptly, as if it had crashed
+        routers[failed_id]._run = False
+        threads[failed_id].join()
+        failed_at = time.time()
+        packets = sum(transport.packets for transport in transports.values())
+        sent = sum(transport.bytes for transport in transports.values())
+
+        detector = ConvergenceDetector(
+            ShortestPathOracle(topology.subset(list(tables))), tables)
+        stable = wait_until_stable(detector, tables, settle, args.limit)
+        detector.close()
+        if not stable:
+            return None
+
+        return {
+            'reconvergence': detector.converged_at - failed_at,
+            'count_to_infinity': max(invalidated) - min(invalidated)
+            if invalidated else 0,
+            'packets': sum(transport.packets for transport
+                           in transports.values()) - packets,
+            'bytes': sum(transport.bytes for transport
+                         in transports.values()) - sent,
+            'steady': steady,
+        }
+    finally:
+        for router in routers.values():
+            router._run = False
+        for thread in threads.values():
+            thread.join(timeout=5)
+
+
+def main():
+    args = parse_args()
+    configurations = [(mode, 0) for mode in MODES]
+    if args.hold_down:
+        configurations.append(('poisoned_reverse', args.hold_down))
+
+    results = {configuration: [] for configuration in configurations}
+    for trial in range(args.trials):
+        seed = args.seed + trial
+        topology = Topology.generate(args.routers, args.degree, seed=seed)
+        failed_id = random.Random(seed).choice(sorted(topology.links))
+        for mode, hold_down in configurations:
+            print(f"Topology {seed}: {mode}, hold-down {hold_down}s, "
+                  f"failing router {failed_id}.")
+            result = run(topology, mode, hold_down, failed_id, args)
+            if result is None:
+                print("  Did not converge.")
+            else:
+                results[(mode, hold_down)].append(result)
+
+    rows = []
+    for (mode, hold_down), trials in results.items():
+        if not trials:
+            rows.append([mode, hold_down] + ['-'] * 5)
+            continue
+
+        def mean(key):
+            return statistics.mean(trial[key] for trial in trials)
+        rows.append([mode, hold_down, f"{mean('reconvergence'):.2f}",
+                     f"{mean('count_to_infinity'):.2f}",
+                     f"{mean('packets'):.0f}", f"{mean('bytes'):.0f}",
+                     f"{mean('steady'):.0f}"])
+
+    print(tabulate(rows, headers=['Mode', 'Hold-down (s)',
+                                  'Reconvergence (s)',
+                                  'Count to infinity (s)', 'Packets',
+                                  'Bytes', 'Steady bytes / s']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+    RIPDaemon - reference shortest path oracle. Prints the converged routing
+    tables for a set of configuration files or a generated topology, and can
+    simulate the network to measure convergence.
+
+    Usage:
+        python3 -m tools.oracle config/*.ini
+        python3 -m tools.oracle --generate 100 --write /tmp/topology
+        python3 -m tools.oracle config/*.ini --simulate
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import argparse
+import logging
+import sys
+import threading
+from tabulate import tabulate
+from ripd.ripd import RIPDaemon
+from ripd._oracle import Topology, ShortestPathOracle, ConvergenceDetector
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compute the converged RIP routing tables of a network.")
+    parser.add_argument('configs', nargs='*',
+                        help="Router configuration files.")
+    parser.add_argument('--generate', type=int, metavar='ROUTERS',
+                        help="Generate a random topology instead.")
+    parser.add_argument('--degree', type=int, default=3,
+                        help="Average peers per generated router.")
+    parser.add_argument('--seed', type=int, help="Topology random seed.")
+    parser.add_argument('--write', metavar='DIRECTORY',
+                        help="Write the generated configuration files.")
+    parser.add_argument('--method', default='auto',
+                        choices=['auto', 'dijkstra', 'floyd-warshall'])
+    parser.add_argument('--simulate', action='store_true',
+                        help="Run the routers in this process and report "
+                             "when they converge.")
+    parser.add_argument('--transport', choices=['udp', 'inprocess', 'shm'],
+                        help="Transport between simulated routers, "
+                             "overriding the configuration files.")
+    parser.add_argument('--timeout', type=float, default=120,
+                        help="Seconds to wait for convergence.")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Do not print the expected tables.")
+    return parser.parse_args()
+
+
+def simulate(paths, oracle, timeout, transport=None):
+    """
+        Start every router in a thread, and wait for the tables to converge.
+
+        :returns: True if the tables converged within the timeout.
+    """
+    routers = {router_id: RIPDaemon(path, log_level=logging.WARNING,
+                                    transport=transport)
+               for router_id, path in paths.items()}
+    detector = ConvergenceDetector(
+        oracle, {router_id: router._table
+                 for router_id, router in routers.items()})
+    threads = [threading.Thread(target=router.start, daemon=True)
+               for router in routers.values()]
+
+    for thread in threads:
+        thread.start()
+
+    try:
+        converged = detector.wait(timeout)
+    finally:
+        for router in routers.values():
+            router._run = False
+        for thread in threads:
+            thread.join(timeout=5)
+
+    if converged:
+        print(f"Converged after {detector.convergence_time:.3f} seconds.")
+    else:
+        print(f"Did not converge within {timeout} seconds:")
+        for divergence in detector.divergences():
+            print(f"  {divergence}")
+    return converged
+
+
+def main():
+    args = parse_args()
+    logger = logging.getLogger(__name__)
+
+    if args.generate:
+        topology = Topology.generate(args.generate, args.degree,
+                                     seed=args.seed)
+        paths = topology.write_configs(args.write) if args.write else {}
+    else:
+        topology = Topology.from_config_files(logger, args.configs)
+        paths = {router_id: path for router_id, path
+                 in zip(topology.links, args.configs)}
+
+    oracle = ShortestPathOracle(topology, args.method)
+
+    if not args.quiet:
+        for router_id, table in sorted(oracle.tables.items()):
+            rows = [[destination_id, metric, ', '.join(map(str, hops))]
+                    for destination_id, (metric, hops)
+                    in sorted(table.items())]
+            print(f"Router {router_id}:")
+            print(tabulate(rows, headers=["Destination", "Metric",
+                                          "Next Hops"],
+                           tablefmt="fancy_grid"))
+
+    if args.simulate:
+        if not paths:
+            sys.exit("Simulating a generated topology requires --write.")
+        converged = simulate(paths, oracle, args.timeout, args.transport)
+        sys.exit(0 if converged else 1)
+
+
+if __name__ == "__main__":
+    main()
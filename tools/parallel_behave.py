@@ -0,0 +1,114 @@
+"""
+    RIPDaemon - parallel integration test runner. Runs each behave scenario
+    in its own behave process, several at once, giving every worker its own
+    port offset (RIPD_PORT_OFFSET) so the routers of concurrent scenarios
+    never bind the same ports.
+
+    Usage:
+        python3 -m tools.parallel_behave
+        python3 -m tools.parallel_behave --workers 4 --transport inprocess
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import argparse
+import glob
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from tabulate import tabulate
+
+SCENARIO_KEYWORDS = ('Scenario:', 'Scenario Outline:', 'Scenario Template:')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Run the behave scenarios in parallel.")
+    parser.add_argument('features', nargs='*',
+                        help="Feature files, by default features/*.feature.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Scenarios to run at once.")
+    parser.add_argument('--port-offset', type=int, default=1000,
+                        help="Port offset between workers.")
+    parser.add_argument('--transport', default='udp',
+                        choices=['udp', 'inprocess', 'shm'])
+    return parser.parse_args()
+
+
+def find_scenarios(paths):
+    """
+        :returns: List of scenarios, as behave "file:line" locations.
+    """
+    scenarios = []
+    for path in paths:
+        with open(path) as feature:
+            for number, line in enumerate(feature, 1):
+                if line.strip().startswith(SCENARIO_KEYWORDS):
+                    scenarios.append(f"{path}:{number}")
+    return scenarios
+
+
+def worker(offset, transport, scenarios, results):
+    """
+        Run scenarios from the queue until it is empty.
+
+        :param results: Dictionary to store each scenario's (passed,
+                        seconds, output) in.
+    """
+    environment = dict(os.environ, RIPD_PORT_OFFSET=str(offset),
+                       RIPD_TRANSPORT=transport)
+    while True:
+        try:
+            scenario = scenarios.get_nowait()
+        except queue.Empty:
+            return
+        start = time.time()
+        process = subprocess.run(
+            [sys.executable, '-m', 'behave', '--no-color', scenario],
+            env=environment, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, universal_newlines=True)
+        results[scenario] = (process.returncode == 0, time.time() - start,
+                             process.stdout)
+
+
+def main():
+    args = parse_args()
+    scenarios = find_scenarios(args.features or
+                               sorted(glob.glob('features/*.feature')))
+    pending = queue.Queue()
+    for scenario in scenarios:
+        pending.put(scenario)
+
+    # Worker i shifts every port by (i + 1) offsets, leaving the configured
+    # ports free for a serial run
+    results = {}
+    start = time.time()
+    threads = [threading.Thread(target=worker,
+                                args=((i + 1) * args.port_offset,
+                                      args.transport, pending, results))
+               for i in range(max(1, min(args.workers, len(scenarios))))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+
+    failed = [scenario for scenario in scenarios if not results[scenario][0]]
+    for scenario in failed:
+        print(f"{scenario} failed:\n{results[scenario][2]}")
+
+    print(tabulate([[scenario, 'passed' if results[scenario][0]
+                     else 'failed', f"{results[scenario][1]:.1f}"]
+                    for scenario in scenarios],
+                   headers=['Scenario', 'Result', 'Seconds']))
+    serial = sum(result[1] for result in results.values())
+    print(f"{len(scenarios) - len(failed)} of {len(scenarios)} scenarios "
+          f"passed with {len(threads)} workers in {elapsed:.1f}s "
+          f"({serial:.1f}s of scenarios).")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
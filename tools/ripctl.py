@@ -0,0 +1,120 @@
+"""
+    RIPDaemon - control socket client. Queries and commands a running router
+    through the socket set by its control_socket setting.
+
+    Usage:
+        python3 -m tools.ripctl SOCKET route 10.1.0.0/16
+        python3 -m tools.ripctl SOCKET lookup 10.1.2.3
+        python3 -m tools.ripctl SOCKET dump --offset 0 --limit 50
+        python3 -m tools.ripctl SOCKET metrics | update | clear | stop
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import argparse
+import json
+import socket
+import sys
+from tabulate import tabulate
+
+
+class ControlClient:
+    """
+        Connection to a router's control socket.
+    """
+    def __init__(self, path: str, timeout: float = 10):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(path)
+        self._file = self._socket.makefile('rwb')
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def request(self, command: str, **arguments):
+        """
+            Send a request, and read its response.
+
+            :returns: The response object.
+        """
+        self._send(command, arguments)
+        return self._receive()
+
+    def dump(self, offset: int = 0, limit: int = None):
+        """
+            Stream routes from the routing table.
+
+            :returns: Generator of route objects.
+            :raises: RuntimeError if the router refuses the request.
+        """
+        arguments = {'offset': offset}
+        if limit is not None:
+            arguments['limit'] = limit
+        self._send('dump', arguments)
+        while True:
+            response = self._receive()
+            if 'ok' in response:
+                if not response['ok']:
+                    raise RuntimeError(response['error'])
+                return
+            yield response
+
+    def _send(self, command, arguments):
+        request = dict(arguments, command=command)
+        self._file.write(json.dumps(request).encode() + b'\n')
+        self._file.flush()
+
+    def _receive(self):
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Control socket closed")
+        return json.loads(line)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Query or command a running router.")
+    parser.add_argument('socket', help="Path of the router's control socket.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('route', help="Show the route to a destination.") \
+        .add_argument('destination',
+                      help="Router ID, or prefix in CIDR notation.")
+    commands.add_parser('lookup', help="Longest prefix match an address.") \
+        .add_argument('address', help="IPv4 address.")
+    dump = commands.add_parser('dump', help="Show the routing table.")
+    dump.add_argument('--offset', type=int, default=0,
+                      help="Routes to skip, in destination order.")
+    dump.add_argument('--limit', type=int, default=None,
+                      help="Most routes to show.")
+    commands.add_parser('metrics', help="Show operational metrics.")
+    commands.add_parser('update', help="Send a triggered update.")
+    commands.add_parser('clear', help="Clear the routing table.")
+    commands.add_parser('stop', help="Stop the router gracefully.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    client = ControlClient(args.socket)
+    try:
+        if args.command == 'dump':
+            routes = list(client.dump(args.offset, args.limit))
+            print(tabulate(routes, headers='keys'))
+            return
+
+        arguments = {}
+        if args.command == 'route':
+            arguments['destination'] = args.destination
+        elif args.command == 'lookup':
+            arguments['address'] = args.address
+        response = client.request(args.command, **arguments)
+        if not response.pop('ok'):
+            sys.exit(f"Error: {response['error']}")
+        if response:
+            print(json.dumps(response, indent=2))
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
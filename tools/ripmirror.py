@@ -0,0 +1,57 @@
+"""
+    RIPDaemon - routing table mirror reader. Prints the routing table of a
+    running router from the file set by its mirror_file setting, without
+    communicating with the router.
+
+    Usage:
+        python3 -m tools.ripmirror MIRROR
+        python3 -m tools.ripmirror MIRROR --watch 1
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import argparse
+import time
+from tabulate import tabulate
+from ripd._mirror import TableMirrorReader, MirrorError
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Print a router's table from its mirror file.")
+    parser.add_argument('mirror', help="Path of the router's mirror file.")
+    parser.add_argument('--watch', type=float, default=None,
+                        help="Reprint every this many seconds.")
+    return parser.parse_args()
+
+
+def format_snapshot(snapshot):
+    """
+        :returns: The routes of a MirrorSnapshot as a table.
+    """
+    rows = [[str(route.destination), route.next_hop, route.metric,
+             route.garbage_collection, route.suppressed]
+            for route in snapshot.routes.values()]
+    return f"Router {snapshot.router_id}, sequence {snapshot.sequence}\n" + \
+        tabulate(sorted(rows, key=lambda row: row[0]),
+                 headers=['Destination', 'Next Hop', 'Metric',
+                          'Garbage Collection', 'Suppressed'])
+
+
+def main():
+    args = parse_args()
+    try:
+        reader = TableMirrorReader(args.mirror)
+        while True:
+            print(format_snapshot(reader.read()))
+            if args.watch is None:
+                break
+            time.sleep(args.watch)
+            print()
+    except MirrorError as e:
+        raise SystemExit(f"Error: {e}")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+    RIPDaemon - fault scenario runner. Runs a network in this process, plays
+    a fault scenario against it, and checks the routing tables converge to
+    the shortest paths of whatever the scenario left standing.
+
+    Usage:
+        python3 -m tools.scenario config/scenarios/example.scenario \\
+            config/*.ini
+        python3 -m tools.scenario my.scenario --generate 50 --speed 20
+    MIT License. Copyright © 2025 Connor Varney, Kahu Jones
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import threading
+import time
+from ripd.ripd import RIPDaemon
+from ripd._faults import Scenario, FaultInjector, ScenarioError
+from ripd._oracle import Topology, ShortestPathOracle, ConvergenceDetector
+from ripd._transport import create_transport
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Play a fault scenario against a simulated network.")
+    parser.add_argument('scenario', help="Scenario file.")
+    parser.add_argument('configs', nargs='*',
+                        help="Router configuration files.")
+    parser.add_argument('--generate', type=int, metavar='ROUTERS',
+                        help="Generate a random topology instead.")
+    parser.add_argument('--degree', type=int, default=3,
+                        help="Average peers per generated router.")
+    parser.add_argument('--seed', type=int, help="Random seed.")
+    parser.add_argument('--speed', type=float, default=10,
+                        help="Run this many times faster than real time, "
+                             "by shortening the router timers, scenario "
+                             "times and delays.")
+    parser.add_argument('--periodic-update-time', type=float, default=2,
+                        help="Router periodic update time, before speeding "
+                             "up.")
+    parser.add_argument('--timeout', type=float, default=6,
+                        help="Router route timeout, before speeding up.")
+    parser.add_argument('--garbage-collection-time', type=float, default=3,
+                        help="Router garbage collection time, before "
+                             "speeding up.")
+    parser.add_argument('--transport', default='inprocess',
+                        choices=['udp', 'inprocess', 'shm'])
+    parser.add_argument('--limit', type=float, default=120,
+                        help="Scenario seconds to wait for the network to "
+                             "converge after the scenario ends.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logger = logging.getLogger(__name__)
+
+    try:
+        actions = Scenario.load(args.scenario)
+    except (OSError, ScenarioError) as e:
+        sys.exit(f"Failed to load scenario: {e}")
+
+    if args.generate:
+        topology = Topology.generate(args.generate, args.degree,
+                                     seed=args.seed)
+    else:
+        topology = Topology.from_config_files(logger, args.configs)
+
+    port_owners = {port: router_id
+                   for router_id, ports in topology.ports.items()
+                   for port in ports}
+    injector = FaultInjector(logger, port_owners, args.speed, args.seed)
+
+    # Routers run with their timers shortened by the speed up
+    with tempfile.TemporaryDirectory() as directory:
+        paths = topology.write_configs(
+            directory,
+            periodic_update_time=args.periodic_update_time / args.speed,
+            timeout=args.timeout / args.speed,
+            garbage_collection_time=args.garbage_collection_time /
+            args.speed)
+        routers = {
+            router_id: RIPDaemon(
+                path, log_level=logging.WARNING,
+                transport=injector.wrap(
+                    create_transport(args.transport, logger), router_id))
+            for router_id, path in paths.items()}
+
+    tables = {router_id: router._table
+              for router_id, router in routers.items()}
+    threads = [threading.Thread(target=router.start, daemon=True)
+               for router in routers.values()]
+    for thread in threads:
+        thread.start()
+
+    try:
+        detector = ConvergenceDetector(ShortestPathOracle(topology), tables)
+        converged = detector.wait(args.limit / args.speed)
+        detector.close()
+        if not converged:
+            sys.exit("The network did not converge before the scenario.")
+        print(f"Converged after {detector.convergence_time * args.speed:.2f}"
+              " scenario seconds, starting the scenario.")
+
+        started = time.time()
+        injector.play(actions)
+        injector.wait()
+        ended = time.time()
+        print(f"Scenario finished after "
+              f"{(ended - started) * args.speed:.2f} scenario seconds.")
+
+        # The network should settle on the shortest paths of the links the
+        # scenario left up
+        detector = ConvergenceDetector(
+            ShortestPathOracle(injector.impaired_topology(topology)), tables)
+        converged = detector.wait(args.limit / args.speed)
+        detector.close()
+    finally:
+        injector.stop()
+        for router in routers.values():
+            router._run = False
+        for thread in threads:
+            thread.join(timeout=5)
+
+    print("Packets: " + ", ".join(f"{count} {counter}" for counter, count
+                                  in injector.counters.items()))
+    if converged:
+        settled = max(detector.converged_at - ended, 0) * args.speed
+        print(f"Converged {settled:.2f} scenario seconds after the "
+              "scenario ended.")
+    else:
+        print(f"Did not converge within {args.limit} scenario seconds:")
+        for divergence in detector.divergences():
+            print(f"  {divergence}")
+    sys.exit(0 if converged else 1)
+
+
+if __name__ == '__main__':
+    main()